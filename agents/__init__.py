@@ -10,6 +10,7 @@ from .ai_bots.mcts_bot import MCTSBot
 from .ai_bots.rl_bot import RLBot
 from .ai_bots.behavior_tree_bot import BehaviorTreeBot
 from .ai_bots.snake_ai import SnakeAI, SmartSnakeAI
+from .ai_bots.snake_search_bot import SnakeSearchBot
 
 __all__ = [
     'BaseAgent',
@@ -20,5 +21,6 @@ __all__ = [
     'RLBot',
     'BehaviorTreeBot',
     'SnakeAI',
-    'SmartSnakeAI'
+    'SmartSnakeAI',
+    'SnakeSearchBot'
 ] 
\ No newline at end of file
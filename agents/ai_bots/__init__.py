@@ -9,6 +9,8 @@ from .rl_bot import RLBot
 from .behavior_tree_bot import BehaviorTreeBot
 from .random_pingpong_ai import RandomPingPongAI
 from .rule_based_pingpong_ai import RuleBasedPingPongAI
+from .predictive_pingpong_ai import PredictivePingPongAI
+from .pingpong_search_ai import PingPongSearchAI
 
 __all__ = [
     'RandomBot',
@@ -17,5 +19,7 @@ __all__ = [
     'RLBot',
     'BehaviorTreeBot',
     'RandomPingPongAI',
-    'RuleBasedPingPongAI'
+    'RuleBasedPingPongAI',
+    'PredictivePingPongAI',
+    'PingPongSearchAI'
 ] 
\ No newline at end of file
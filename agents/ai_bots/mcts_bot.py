@@ -4,6 +4,8 @@ import numpy as np
 import math
 import random
 import time
+from games.gomoku import zobrist
+from utils.opening_book import load_opening_book
 
 # Zobrist哈希表初始化（全局）
 ZOBRIST_SIZE = 15
@@ -171,6 +173,18 @@ class GomokuBoard:
         self.size = size
         self.board = np.zeros((size, size), dtype=int)
         self.last_move = None
+        # 与 GomokuGame 相同：8 个对称变体的 Zobrist 键随落子增量更新
+        self._zobrist, self._sym_perms, _ = zobrist.get_tables(size)
+        self._sym_keys = np.zeros(zobrist.NUM_SYMMETRIES, dtype=np.uint64)
+
+    def set_board(self, board):
+        """整体替换棋盘（复制）并重算对称键；直接给 board 赋值会使键失效"""
+        self.board = np.array(board, dtype=int)
+        self._sym_keys = zobrist.board_symmetry_keys(self.board)
+
+    def canonical_key(self):
+        """(规范键, 变换编号)，对称局面得到相同的键"""
+        return zobrist.canonical_from_keys(self._sym_keys)
 
     def is_valid(self, x, y):
         return 0 <= x < self.size and 0 <= y < self.size and self.board[x, y] == 0
@@ -178,6 +192,7 @@ class GomokuBoard:
     def place(self, x, y, player):
         if self.is_valid(x, y):
             self.board[x, y] = player
+            self._sym_keys ^= self._zobrist[self._sym_perms[:, x * self.size + y], player]
             self.last_move = (x, y, player)
             return True
         return False
@@ -198,6 +213,7 @@ class GomokuBoard:
     def clone(self):
         new_board = GomokuBoard(self.size)
         new_board.board = self.board.copy()
+        new_board._sym_keys = self._sym_keys.copy()
         new_board.last_move = self.last_move
         return new_board
 
@@ -251,13 +267,16 @@ class MCTSNode:
 
 # ================= Minimax-MCTS混合五子棋AI类 =================
 class MCTSBot:
-    def __init__(self, name="MCTSBot", player_id=1, simulation_count=100, max_depth=4, C=1.4):
+    def __init__(self, name="MCTSBot", player_id=1, simulation_count=100, max_depth=4, C=1.4,
+                 opening_book=None):
         self.name = name
         self.player_id = player_id
         self.simulation_count = simulation_count
         self.max_depth = max_depth
         self.C = C
         self._eval_cache = {}
+        # 开局库：路径或 OpeningBook，命中时不再搜索
+        self.opening_book = load_opening_book(opening_book)
 
     def get_action(self, *args, **kwargs):
         import time
@@ -272,9 +291,13 @@ class MCTSBot:
             observation, env = args
             board_state = env.game.get_state()['board']
             board = GomokuBoard(size=board_state.shape[0])
-            board.board = board_state.copy()
+            board.set_board(board_state)
         else:
             raise ValueError("get_action参数错误，需传入GomokuBoard或(observation, env)")
+        if self.opening_book is not None:
+            book_move = self.opening_book.probe(board.board)
+            if book_move is not None:
+                return book_move
         # 检查对手是否有活三或半活四，且自己没有半活三或四连
         def find_threat_point():
             my_id = self.player_id
@@ -478,7 +501,8 @@ class MCTSBot:
         return h
 
     def _evaluate(self, board):
-        key = board.board.tobytes()
+        # 评估函数对 8 种对称变换不变，用规范键让对称局面共享缓存
+        key, _ = board.canonical_key()
         if key in self._eval_cache:
             return self._eval_cache[key]
         my_id = self.player_id
@@ -2,16 +2,24 @@ import math
 import functools
 import numpy as np
 from agents.base_agent import BaseAgent
+from utils.opening_book import load_opening_book
 
 
 class MinimaxBot(BaseAgent):
-    def __init__(self, name="GomokuMinimax", player_id=1, max_depth=2):
+    def __init__(self, name="GomokuMinimax", player_id=1, max_depth=2, opening_book=None):
         super().__init__(name, player_id)
         self.max_depth = max_depth
+        # 开局库：路径或 OpeningBook，命中时不再搜索
+        self.opening_book = load_opening_book(opening_book)
 
     # ----------------------------------------------------------
 
     def get_action(self, obs, env):
+        if self.opening_book is not None:
+            book_move = self.opening_book.probe(env.game)
+            if book_move is not None:
+                return book_move
+
         board = env.game.board
         total_stones = np.count_nonzero(board)
         board_size = env.game.board_size
@@ -0,0 +1,146 @@
+from agents.base_agent import BaseAgent
+from agents.ai_bots.predictive_pingpong_ai import HOME_Y, PredictivePingPongAI
+from games.pingpong.physics import (MAX_POWER, PADDLE_HALF_HEIGHT, PADDLE_REACH, PADDLE_STEP,
+                                    PingPongState, VELOCITY_DIVISOR, step)
+from games.pingpong.trajectory import predict_intercept
+
+WIN = 1000.0
+HIT_OFFSETS = (0.0, -0.04, 0.04, -0.07, 0.07, -0.09, 0.09)  # 击球点相对预测落点的偏移
+
+
+class PingPongSearchAI(BaseAgent):
+    """
+    前瞻搜索乒乓球 AI
+    球将在 window 个 tick 内到达己方接触线时，枚举一组击球方案（击球点偏移 × 是否蓄力 ×
+    是否旋转 × 触球瞬间的上下键），在一个复用的 PingPongState 上用 physics.step 逐 tick 推演到
+    击球为止（每个方案开始前 load 根状态，不做 deepcopy），再用轨迹预测估计对方挡板能否及时
+    赶到落点（对方按最快速度移动）。推演的总 tick 数受 tick_budget 限制，保证 GUI 中 60 FPS。
+    来球较远或球飞离时交给 PredictivePingPongAI 跟踪 / 回中。
+    """
+
+    def __init__(self, name="PingPongSearchAI", player_id=2, window=24, tick_budget=1500):
+        """
+        Args:
+            window: 距离触球多少 tick 以内开始搜索（蓄满力约需 7 tick）
+            tick_budget: 每次搜索最多推演的 tick 数
+        """
+        super().__init__(name, player_id)
+        self.window = window
+        self.tick_budget = tick_budget
+        self.tracker = PredictivePingPongAI(name, player_id, aim=0.0)
+        self.side = 'left' if player_id == 1 else 'right'
+        self.plan = None          # (目标高度, 蓄力, 旋转, 触球时的上下键)
+        self.expected = None      # 执行方案时下一 tick 预期的球状态，不符则重新搜索
+        self.scratch = PingPongState()
+        self.last_ticks = 0       # 最近一次搜索推演的 tick 数
+
+    def reset(self):
+        super().reset()
+        self.plan = None
+        self.expected = None
+
+    def get_action(self, observation, env):
+        state = env.game.physics
+        ball = (state.ball_x, state.ball_y, state.ball_vx, state.ball_vy)
+        if self.plan is None or ball != self.expected:
+            intercept = predict_intercept(state, self.player_id)
+            if intercept is None or intercept[0] > self.window:
+                self.plan = None
+                return self.tracker.get_action(observation, env)
+            self.plan = self.search(state, intercept[1])
+        action = self._plan_action(state, self.plan)
+        # 来球不受对方影响，按计划执行时下一 tick 的球状态是确定的
+        self.scratch.load(state.as_tuple())
+        step(self.scratch, action)
+        if self._moving_away(self.scratch):
+            self.plan = None
+        self.expected = (self.scratch.ball_x, self.scratch.ball_y,
+                         self.scratch.ball_vx, self.scratch.ball_vy)
+        return {key: value for key, value in action.items() if self.side in key}
+
+    # ------------------------------------------------------------------
+    # 搜索
+    # ------------------------------------------------------------------
+    def candidate_plans(self, intercept_y):
+        for offset in HIT_OFFSETS:
+            target = min(1.0, max(0.0, intercept_y + offset))
+            for force in (False, True):
+                yield target, force, False, 0
+                for nudge in (-1, 0, 1):
+                    yield target, force, True, nudge
+
+    def search(self, state, intercept_y):
+        """在 tick 预算内评估候选方案，返回得分最高的一个（默认是不蓄力的正面击球）"""
+        root = state.as_tuple()
+        scratch = self.scratch
+        limit = self.window + 2
+        best_plan, best_value = None, -float('inf')
+        used = 0
+        for plan in self.candidate_plans(intercept_y):
+            if best_plan is not None and used + limit > self.tick_budget:
+                break
+            scratch.load(root)
+            ticks, value = 0, -WIN / 2
+            while ticks < limit:
+                scorer = step(scratch, self._plan_action(scratch, plan))
+                ticks += 1
+                if scorer is not None:
+                    value = WIN if scorer == self.player_id else -WIN
+                    break
+                if self._moving_away(scratch):
+                    value = self.evaluate(scratch, ticks)
+                    break
+            used += ticks
+            if value > best_value:
+                best_plan, best_value = plan, value
+        self.last_ticks = used
+        return best_plan
+
+    def evaluate(self, state, elapsed):
+        """
+        击球后的局面：假设对方在来球期间回到中间、看到击球后全速追球，仍差多远才能接到
+        （正数表示接不到，直接判为好球）；接得到时再扣除风险——对方满力回球时，
+        己方来不及从中间赶到边线的距离
+        """
+        opponent = 3 - self.player_id
+        arrival = predict_intercept(state, opponent)
+        if arrival is None:
+            return 0.0
+        ticks, ball_y = arrival
+        opponent_y = state.left_y if opponent == 1 else state.right_y
+        recover = elapsed * PADDLE_STEP
+        opponent_y = min(HOME_Y, opponent_y + recover) if opponent_y < HOME_Y else max(HOME_Y, opponent_y - recover)
+        margin = abs(min(1.0, max(0.0, ball_y)) - opponent_y) - PADDLE_HALF_HEIGHT - ticks * PADDLE_STEP
+        if margin > 0:
+            return WIN / 2 + margin
+        width = state.right_x - state.left_x - 2 * PADDLE_REACH
+        return_ticks = width * VELOCITY_DIVISOR / (abs(state.ball_vx) * MAX_POWER)
+        exposure = max(0.0, 0.5 - PADDLE_HALF_HEIGHT - return_ticks * PADDLE_STEP)
+        return margin - exposure
+
+    # ------------------------------------------------------------------
+    # 方案 -> 动作（推演与实际执行共用，保证两者一致）
+    # ------------------------------------------------------------------
+    def _plan_action(self, state, plan):
+        target, force, spin, nudge = plan
+        side = self.side
+        if side == 'left':
+            paddle_y = state.left_y
+            contact = state.ball_x + state.ball_vx / VELOCITY_DIVISOR <= state.left_x + PADDLE_REACH
+        else:
+            paddle_y = state.right_y
+            contact = state.ball_x + state.ball_vx / VELOCITY_DIVISOR >= state.right_x - PADDLE_REACH
+        if contact:
+            move_y = nudge
+        else:
+            diff = target - paddle_y
+            move_y = 1 if diff > PADDLE_STEP / 2 else (-1 if diff < -PADDLE_STEP / 2 else 0)
+        return {
+            f"move_{side}_x": 0,
+            f"move_{side}_y": move_y,
+            f"{side}_force": force,
+            f"{side}_spin": spin and contact,
+        }
+
+    def _moving_away(self, state):
+        return state.ball_vx > 0 if self.player_id == 1 else state.ball_vx < 0
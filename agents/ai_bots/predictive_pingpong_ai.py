@@ -0,0 +1,57 @@
+from agents.base_agent import BaseAgent
+from games.pingpong.physics import PADDLE_HALF_HEIGHT, PADDLE_STEP
+from games.pingpong.trajectory import predict_intercept
+
+HOME_Y = 0.5
+
+
+class PredictivePingPongAI(BaseAgent):
+    """
+    预测型乒乓球 AI：用轨迹预测求出球到达己方接触线的高度，直接移动到该点等球；
+    球飞离时回到中间。player_id 1 控制左挡板，2 控制右挡板。
+    """
+
+    def __init__(self, name="PredictivePingPongAI", player_id=2, aim=0.5, use_force=False):
+        """
+        Args:
+            aim: 时间充裕时让击球点偏离挡板中心的比例（相对半高），把球打向远离对方挡板的一侧
+            use_force: 球飞来时按住蓄力键，击球速度更快
+        """
+        super().__init__(name, player_id)
+        self.aim = aim
+        self.use_force = use_force
+        self.target_y = HOME_Y  # 最近一次计算的目标高度（便于调试 / 绘制）
+
+    def get_action(self, observation, env):
+        state = env.game.physics
+        side = 'left' if self.player_id == 1 else 'right'
+        if side == 'left':
+            paddle_y, other_y = state.left_y, state.right_y
+        else:
+            paddle_y, other_y = state.right_y, state.left_y
+
+        intercept = predict_intercept(state, self.player_id)
+        if intercept is None:
+            target = HOME_Y
+        else:
+            ticks, ball_y = intercept
+            target = min(1.0, max(0.0, ball_y))
+            # 来得及的话用挡板边缘击球：击球点低于挡板中心时回球向下，反之向上
+            offset = self.aim * PADDLE_HALF_HEIGHT
+            if offset and abs(target - paddle_y) + offset <= ticks * PADDLE_STEP:
+                target -= offset if other_y < 0.5 else -offset
+                target = min(1.0, max(0.0, target))
+        self.target_y = target
+
+        diff = target - paddle_y
+        move_y = 0
+        if diff > PADDLE_STEP / 2:
+            move_y = 1
+        elif diff < -PADDLE_STEP / 2:
+            move_y = -1
+        return {
+            f"move_{side}_x": 0,
+            f"move_{side}_y": move_y,
+            f"{side}_force": self.use_force and intercept is not None,
+            f"{side}_spin": False,
+        }
@@ -3,8 +3,9 @@
 """
 
 import random
-from heapq import heappush, heappop
 from agents.base_agent import BaseAgent
+from games.snake.pathfinding import PathCache, PathFinder
+from games.snake.snake_game import SNAKE1, SNAKE2, FOOD
 
 # ---------------- 方向常量 ----------------
 UP, DOWN, LEFT, RIGHT = (-1, 0), (1, 0), (0, -1), (0, 1)
@@ -12,12 +13,21 @@ DIRS = [UP, DOWN, LEFT, RIGHT]
 DIR_NAME = {UP: "UP", DOWN: "DOWN", LEFT: "LEFT", RIGHT: "RIGHT"}
 
 
+def _search(agent, game):
+    """每个 agent 持有一个与棋盘大小匹配的 PathFinder，并按当前局面准备好"""
+    search = getattr(agent, '_search', None)
+    if search is None or search.board_size != game.board_size:
+        search = agent._search = PathFinder(game.board_size)
+    return search.prepare(game)
+
+
 # =======================================================================
 # 1. 简单贪心版 SnakeAI  （修复方向 + 障碍物判断）
 # =======================================================================
 class SnakeAI(BaseAgent):
     def __init__(self, name="SnakeAI", player_id=1):
         super().__init__(name, player_id)
+        self._target = None  # 正在追的食物，被吃掉之前不重新挑选
 
     def get_action(self, obs, env):
         valid = env.get_valid_actions()
@@ -31,9 +41,11 @@ class SnakeAI(BaseAgent):
 
         head = snake[0]
         foods = game.foods
-        if foods:
-            food = min(foods, key=lambda f: self._manhattan(head, f))
-            for d in self._toward(head, food):      # 按优先级试探
+        target = self._target
+        if target is None or not self._has_food(game, target):
+            target = self._target = min(foods, key=lambda f: self._manhattan(head, f)) if foods else None
+        if target is not None:
+            for d in self._toward(head, target):    # 按优先级试探
                 if d in valid and self._safe(head, d, game):
                     return d
 
@@ -58,15 +70,17 @@ class SnakeAI(BaseAgent):
             return [(0, 1) if dy > 0 else (0, -1),
                     (1, 0) if dx > 0 else (-1, 0)]
 
+    @staticmethod
+    def _has_food(game, cell):
+        x, y = cell
+        return 0 <= x < game.board_size and 0 <= y < game.board_size and bool(game.grid[x, y] & FOOD)
+
     def _safe(self, head, direction, game):
+        # 下一 tick 到达的格子不能有任何蛇身（尾巴要到再下一 tick 才移开）
         nx, ny = head[0] + direction[0], head[1] + direction[1]
         if nx < 0 or nx >= game.board_size or ny < 0 or ny >= game.board_size:
             return False
-        # 把自己尾巴视为空地（下一回合会移动）
-        my_snake = game.snake1 if self.player_id == 1 else game.snake2
-        other_snake = game.snake2 if self.player_id == 1 else game.snake1
-        obstacles = set(game.snake1[:-1]) | set(game.snake2[:-1])
-        return (nx, ny) not in obstacles
+        return not game.grid[nx, ny] & (SNAKE1 | SNAKE2)
 
 
 # =======================================================================
@@ -75,6 +89,7 @@ class SnakeAI(BaseAgent):
 class SmartSnakeAI(BaseAgent):
     def __init__(self, name="SmartSnakeAI", player_id=1):
         super().__init__(name, player_id)
+        self._path = PathCache()
 
     def get_action(self, obs, env):
         valid = env.get_valid_actions()
@@ -87,78 +102,48 @@ class SmartSnakeAI(BaseAgent):
             return random.choice(valid)
 
         head = snake[0]
+
+        # 0. 上一 tick 规划的路径仍然有效时直接沿用
+        nxt = self._path.next_cell(game, head)
+        if nxt is not None:
+            action = self._to_action(head, nxt)
+            if action in valid:
+                return action
+            self._path.clear()
+
         foods = game.foods
+        search = _search(self, game)
 
-        # 1. 最近食物 + A*
+        # 1. 一次 A* 找到最近的可达食物
         if foods:
-            food = min(foods, key=lambda f: self._manhattan(head, f))
-            path = self._astar(head, food, game)
+            path = search.find_path(head, foods)
             if path and len(path) > 1:
                 action = self._to_action(head, path[1])
                 if action in valid:
+                    self._path.store(path, game)
                     return action
 
         # 2. 最长生存步
-        return self._survival(head, game, valid)
-
-    # ---------- A* ----------
-    def _astar(self, start, goal, game):
-        obstacles = set(game.snake1[:-1]) | set(game.snake2[:-1])
-        g = {start: 0}
-        pq = [(self._manhattan(start, goal), start, [start])]
-
-        while pq:
-            _, cur, path = heappop(pq)
-            if cur == goal:
-                return path
-            for nxt in self._neighbors(cur, game.board_size, obstacles):
-                if nxt in g and g[cur] + 1 >= g.get(nxt, 1e9):
-                    continue
-                g[nxt] = g[cur] + 1
-                heappush(pq, (g[nxt] + self._manhattan(nxt, goal), nxt, path + [nxt]))
-        return None
+        return self._survival(head, search, valid)
 
     # ---------- 生存 BFS ----------
-    def _survival(self, head, game, valid):
-        obstacles = set(game.snake1[:-1]) | set(game.snake2[:-1])
+    def _survival(self, head, flood, valid):
+        """选可达面积最大的方向，面积相同时选能走得更远的"""
         best = random.choice(valid)
-        best_len = -1
+        best_score = (-1, -1)
         for d in valid:
             nxt = (head[0] + d[0], head[1] + d[1])
-            if nxt in obstacles:
-                continue
-            if not (0 <= nxt[0] < game.board_size and 0 <= nxt[1] < game.board_size):
+            if not flood.passable(nxt):
                 continue
-            length = self._max_steps(nxt, obstacles, game.board_size)
-            if length > best_len:
-                best_len, best = length, d
+            score = flood.fill(nxt)
+            if score > best_score:
+                best_score, best = score, d
         return best
 
-    def _max_steps(self, start, obstacles, board_size):
-        q, seen = [start], {start}
-        steps = 0
-        while q:
-            nq = []
-            for p in q:
-                for nb in self._neighbors(p, board_size, obstacles):
-                    if nb not in seen:
-                        seen.add(nb)
-                        nq.append(nb)
-            q = nq
-            steps += 1
-        return steps
-
     # ---------- 工具 ----------
     @staticmethod
     def _manhattan(a, b):
         return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
-    def _neighbors(self, pos, size, obstacles):
-        x, y = pos
-        for dx, dy in DIRS:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < size and 0 <= ny < size and (nx, ny) not in obstacles:
-                yield (nx, ny)
-
     def _to_action(self, cur, nxt):
         return (nxt[0] - cur[0], nxt[1] - cur[1])
\ No newline at end of file
@@ -0,0 +1,155 @@
+"""
+贪吃蛇对抗搜索 AI
+两条蛇同时行动，这里按“偏执”极小极大处理：自己先选方向，对手在已知该选择的
+前提下取最坏应手，然后用 step_joint 同时推进一个 tick。搜索在游戏副本上进行，
+每层用 snapshot/restore 回退；迭代加深直到用完每个 tick 的时间预算（默认取
+tick_speed 对应间隔的一半），超时则返回最后一个完整深度的结果。
+叶子估值：Voronoi 领地差 + 长度差。
+"""
+
+import random
+import time
+
+from agents.base_agent import BaseAgent
+from games.snake.snake_game import SNAKE1, SNAKE2
+from games.snake.voronoi import Voronoi
+
+WIN = 100000.0
+DRAW = -WIN / 2  # 同归于尽只比输棋好，不能为了它放弃仍在进行的对局
+LENGTH_WEIGHT = 2.0
+
+
+class _Timeout(Exception):
+    """本 tick 的搜索时间用完"""
+
+
+class SnakeSearchBot(BaseAgent):
+    def __init__(self, name="SnakeSearchBot", player_id=1, max_depth=12,
+                 time_fraction=0.5, time_limit=None):
+        """
+        Args:
+            max_depth: 最大搜索深度（tick 数）
+            time_fraction: 每步可用时间占 1 / tick_speed 的比例
+            time_limit: 直接指定每步秒数，优先于 time_fraction
+        """
+        super().__init__(name, player_id)
+        self.max_depth = max_depth
+        self.time_fraction = time_fraction
+        self.time_limit = time_limit
+        self._voronoi = None
+        self._deadline = 0.0
+        self.last_depth = 0  # 上一步完成的搜索深度
+        self.nodes = 0
+
+    def get_action(self, obs, env):
+        game = env.game
+        me = self.player_id
+        valid = game.get_valid_actions(me)
+        if not (game.alive1 if me == 1 else game.alive2):
+            return random.choice(valid)
+
+        moves = self._moves(game, me)
+        self.nodes = 0
+        self.last_depth = 0
+        if len(moves) == 1:
+            return moves[0]
+
+        if self._voronoi is None or self._voronoi.board_size != game.board_size:
+            self._voronoi = Voronoi(game.board_size)
+        budget = self.time_limit if self.time_limit is not None else self.time_fraction / game.tick_speed
+        self._deadline = time.perf_counter() + budget
+
+        sim = game.clone()
+        best = moves[0]
+        for depth in range(1, self.max_depth + 1):
+            try:
+                value, best = self._root(sim, moves, depth)
+            except _Timeout:
+                break
+            self.last_depth = depth
+            # 下一轮先搜本轮最佳着法，剪枝更早发生
+            moves.remove(best)
+            moves.insert(0, best)
+            if value > WIN / 2 or value < DRAW:
+                break  # 胜负已定，再加深也不会改变结论
+        return best
+
+    # ------------------------------------------------------------------
+    # 搜索
+    # ------------------------------------------------------------------
+    def _root(self, sim, moves, depth):
+        alpha, best = -float('inf'), moves[0]
+        for move in moves:
+            value = self._min(sim, move, depth, 1, alpha, float('inf'))
+            if value > alpha:
+                alpha, best = value, move
+        return alpha, best
+
+    def _max(self, sim, depth, ply, alpha, beta):
+        for move in self._moves(sim, self.player_id):
+            value = self._min(sim, move, depth, ply, alpha, beta)
+            if value > alpha:
+                alpha = value
+                if alpha >= beta:
+                    break
+        return alpha
+
+    def _min(self, sim, move, depth, ply, alpha, beta):
+        """对手针对我方 move 的最坏应手；depth 为包括本 tick 在内的剩余深度"""
+        me = self.player_id
+        snapshot = sim.snapshot()
+        for reply in self._moves(sim, 3 - me):
+            self.nodes += 1
+            if time.perf_counter() > self._deadline:
+                raise _Timeout()
+            if me == 1:
+                sim.step_joint(move, reply)
+            else:
+                sim.step_joint(reply, move)
+            value = self._terminal_value(sim, ply)
+            if value is None:
+                if depth > 1:
+                    value = self._max(sim, depth - 1, ply + 1, alpha, beta)
+                else:
+                    value = self._evaluate(sim)
+            sim.restore(snapshot)
+            if value < beta:
+                beta = value
+                if alpha >= beta:
+                    break
+        return beta
+
+    def _moves(self, game, player):
+        """不会立即撞墙 / 撞蛇身的方向；全都致命时返回全部，对方已死时为 [None]"""
+        if not (game.alive1 if player == 1 else game.alive2):
+            return [None]
+        valid = game.get_valid_actions(player)
+        n = game.board_size
+        hx, hy = (game.snake1 if player == 1 else game.snake2)[0]
+        safe = []
+        for dx, dy in valid:
+            x, y = hx + dx, hy + dy
+            if 0 <= x < n and 0 <= y < n and not game.grid[x, y] & (SNAKE1 | SNAKE2):
+                safe.append((dx, dy))
+        return safe or valid
+
+    # ------------------------------------------------------------------
+    # 估值
+    # ------------------------------------------------------------------
+    def _terminal_value(self, sim, ply):
+        """有蛇死亡时的分值（越早获胜 / 越晚失败越好），双方都活着时返回 None"""
+        if self.player_id == 1:
+            mine, theirs = sim.alive1, sim.alive2
+        else:
+            mine, theirs = sim.alive2, sim.alive1
+        if mine and theirs:
+            return None
+        if not mine:
+            return DRAW + ply if not theirs else -WIN + ply
+        return WIN - ply
+
+    def _evaluate(self, sim):
+        """Voronoi 领地差 + 长度差（自己视角）"""
+        territory = self._voronoi.evaluate(sim)
+        score = territory.cells1 - territory.cells2 + LENGTH_WEIGHT * (len(sim.snake1) - len(sim.snake2))
+        return score if self.player_id == 1 else -score
@@ -15,8 +15,13 @@ import numpy as np
 # 导入游戏和智能体
 from games.gomoku import GomokuEnv
 from games.snake import SnakeEnv
+from games.pingpong import PingPongEnv
 from agents import RandomBot, MinimaxBot, MCTSBot, RLBot, BehaviorTreeBot
+from agents.ai_bots import RandomPingPongAI, RuleBasedPingPongAI, PredictivePingPongAI, PingPongSearchAI
 from utils.game_utils import evaluate_agents, tournament
+from utils.pingpong_runner import run_matches, print_summary
+from utils.parallel_tournament import Spec, AgentSpec, adaptive_tournament, parallel_tournament, sprt_match
+from utils.sprt import SPRT
 
 
 def create_agent(agent_type: str, player_id: int, name: str = None, **kwargs):
@@ -35,6 +40,11 @@ def create_agent(agent_type: str, player_id: int, name: str = None, **kwargs):
         'rule_based': lambda **k: __import__('examples.simple_ai_examples', fromlist=['RuleBasedGomokuBot']).RuleBasedGomokuBot(**k),
         'greedy_snake': lambda **k: __import__('examples.simple_ai_examples', fromlist=['GreedySnakeBot']).GreedySnakeBot(**k),
         'search_based': lambda **k: __import__('examples.simple_ai_examples', fromlist=['SearchBasedBot']).SearchBasedBot(**k),
+        # 乒乓球AI
+        'pingpong_random': RandomPingPongAI,
+        'pingpong_rule': RuleBasedPingPongAI,
+        'pingpong_predictive': PredictivePingPongAI,
+        'pingpong_search': PingPongSearchAI,
         # 进阶AI类型（需要学生实现）
         # 'q_learning': lambda **k: __import__('examples.advanced_ai_examples', fromlist=['QLearningBot']).QLearningBot(**k),
         # 'llm_bot': lambda **k: __import__('examples.advanced_ai_examples', fromlist=['LLMBot']).LLMBot(**k)
@@ -50,7 +60,8 @@ def create_environment(game_type: str, **kwargs):
     """创建游戏环境"""
     env_map = {
         'gomoku': GomokuEnv,
-        'snake': SnakeEnv
+        'snake': SnakeEnv,
+        'pingpong': PingPongEnv
     }
     
     if game_type not in env_map:
@@ -145,7 +156,7 @@ def benchmark_single_agent(env, agent, num_games=100, opponent_type='random'):
     return stats
 
 
-def compare_agents(env, agent_types, num_games=50, **agent_kwargs):
+def compare_agents(env, agent_types, num_games=50, log_path=None, resume=False, **agent_kwargs):
     """比较多个智能体的性能"""
     print(f"\n=== 智能体比较 (每对 {num_games} 局) ===")
     
@@ -158,11 +169,69 @@ def compare_agents(env, agent_types, num_games=50, **agent_kwargs):
         print(f"创建智能体: {agent.name}")
     
     # 运行锦标赛
-    results = tournament(env, agents, num_games)
+    results = tournament(env, agents, num_games, log_path=log_path, resume=resume)
     
     return results
 
 
+def compare_agents_parallel(game_type, env_kwargs, agent_types, num_games=50, workers=None,
+                            log_path=None, resume=False, **agent_kwargs):
+    """多进程比较：子进程按 create_environment / create_agent 重建环境与智能体"""
+    print(f"\n=== 智能体比较 (每对 {num_games} 局, 多进程) ===")
+    
+    env_spec = Spec('evaluate_ai:create_environment', game_type=game_type, **env_kwargs)
+    agent_specs = [AgentSpec('evaluate_ai:create_agent', f"{agent_type}_{i + 1}",
+                             agent_type=agent_type, **agent_kwargs.get(agent_type, {}))
+                   for i, agent_type in enumerate(agent_types)]
+    
+    return parallel_tournament(env_spec, agent_specs, num_games, workers=workers,
+                               log_path=log_path, resume=resume)
+
+
+def compare_agents_adaptive(game_type, env_kwargs, agent_types, num_games=50, target_stderr=30.0,
+                            workers=None, log_path=None, resume=False, **agent_kwargs):
+    """自适应配对比较：按信息量挑选对阵，直到等级分标准误差达标（最多与每对 num_games 局的循环赛同样多）"""
+    print(f"\n=== 智能体比较 (自适应配对, 目标标准误差 {target_stderr} Elo) ===")
+    
+    env_spec = Spec('evaluate_ai:create_environment', game_type=game_type, **env_kwargs)
+    agent_specs = [AgentSpec('evaluate_ai:create_agent', f"{agent_type}_{i + 1}",
+                             agent_type=agent_type, **agent_kwargs.get(agent_type, {}))
+                   for i, agent_type in enumerate(agent_types)]
+    max_games = num_games * len(agent_specs) * (len(agent_specs) - 1) // 2
+    
+    return adaptive_tournament(env_spec, agent_specs, target_stderr, max_games=max_games,
+                               workers=workers, log_path=log_path, resume=resume)
+
+
+def sprt_compare(args, env, env_kwargs, agent_kwargs):
+    """SPRT 比较两个智能体：检验第一个是否强于第二个，--games 为最多局数"""
+    if len(args.agents) != 2:
+        raise ValueError("--sprt 需要恰好两个智能体")
+    sprt = SPRT(args.elo0, args.elo1, args.alpha, args.beta)
+    print(f"\n=== SPRT: {args.agents[0]} 对 {args.agents[1]} "
+          f"(H0: {args.elo0:+g} Elo, H1: {args.elo1:+g} Elo, 最多 {args.games} 局) ===")
+    
+    if args.workers == 1:
+        agents = [create_agent(agent_type, i + 1, **agent_kwargs.get(agent_type, {}))
+                  for i, agent_type in enumerate(args.agents)]
+        results = evaluate_agents(env, agents[0], agents[1], args.games,
+                                  log_path=args.log, resume=args.resume, sprt=sprt, seed=args.seed)
+    else:
+        env_spec = Spec('evaluate_ai:create_environment', game_type=args.game, **env_kwargs)
+        agent_specs = [AgentSpec('evaluate_ai:create_agent', f"{agent_type}_{i + 1}",
+                                 agent_type=agent_type, **agent_kwargs.get(agent_type, {}))
+                       for i, agent_type in enumerate(args.agents)]
+        results = sprt_match(env_spec, agent_specs[0], agent_specs[1], sprt,
+                             max_pairs=args.games // 2, workers=args.workers or None,
+                             seed=args.seed, log_path=args.log, resume=args.resume)
+    
+    decision = sprt.decision()
+    verdict = {'H1': '接受 H1（更强）', 'H0': '接受 H0（不更强）', None: '未得出结论'}[decision]
+    print(f"SPRT 结果: {verdict}")
+    print(f"  {sprt}")
+    return results
+
+
 def analyze_performance(stats_list, agent_names):
     """分析性能统计"""
     print("\n=== 性能分析 ===")
@@ -245,19 +314,48 @@ def load_results(filename):
     return results
 
 
+def evaluate_pingpong(args, agent_kwargs):
+    """乒乓球评估：实时游戏不走回合制循环，用无界面对战器完整打到 WIN_SCORE"""
+    def make(agent_type, player_id):
+        return create_agent(agent_type, player_id, **agent_kwargs.get(agent_type, {}))
+
+    if args.compare:
+        # 两两对战，列表中靠前的智能体执左挡板
+        pairs = [(a, b) for i, a in enumerate(args.agents) for b in args.agents[i + 1:]]
+    elif args.benchmark:
+        # 与规则AI（只会控制右挡板）对战
+        pairs = [(a, 'pingpong_rule') for a in args.agents]
+    else:
+        print("请指定 --compare 或 --benchmark 模式")
+        return
+
+    results = {}
+    for left_type, right_type in pairs:
+        left, right = make(left_type, 1), make(right_type, 2)
+        print(f"\n=== {left.name} vs {right.name} ===")
+        outcome = run_matches(left, right, args.games, seed=args.seed, max_ticks=args.max_ticks)
+        print_summary(outcome['summary'], left.name, right.name)
+        results[f"{left.name}_vs_{right.name}"] = outcome
+
+    if args.save:
+        save_results({'pingpong_results': results, 'config': vars(args), 'timestamp': time.time()},
+                     args.save)
+
+
 def main():
     """主函数"""
     parser = argparse.ArgumentParser(description="AI性能评估工具")
     
     # 基本参数
     parser.add_argument('--game', type=str, default='gomoku',
-                       choices=['gomoku', 'snake'],
+                       choices=['gomoku', 'snake', 'pingpong'],
                        help='游戏类型')
     parser.add_argument('--agents', type=str, nargs='+',
-                       default=['random', 'minimax'],
+                       default=None,
                        choices=['random', 'minimax', 'mcts', 'rl', 'behavior_tree', 
-                               'improved_random', 'rule_based', 'greedy_snake', 'search_based'],
-                       help='要评估的智能体类型')
+                               'improved_random', 'rule_based', 'greedy_snake', 'search_based',
+                               'pingpong_random', 'pingpong_rule', 'pingpong_predictive', 'pingpong_search'],
+                       help='要评估的智能体类型（默认 random minimax；乒乓球默认 pingpong_predictive pingpong_rule）')
     parser.add_argument('--games', type=int, default=100,
                        help='每个测试的游戏数量')
     parser.add_argument('--compare', action='store_true',
@@ -270,6 +368,10 @@ def main():
                        help='棋盘大小')
     parser.add_argument('--win-length', type=int, default=5,
                        help='获胜长度（五子棋）')
+    parser.add_argument('--max-ticks', type=int, default=36000,
+                       help='单场最多 tick 数，超过判为未完成（乒乓球）')
+    parser.add_argument('--seed', type=int, default=0,
+                       help='随机种子：乒乓球第 i 场使用 seed + i，SPRT 第 k 对的种子由它派生')
     
     # AI参数
     parser.add_argument('--minimax-depth', type=int, default=3,
@@ -286,6 +388,26 @@ def main():
                        help='绘制性能图表')
     parser.add_argument('--no-plot', action='store_true',
                        help='不显示图表')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='比较模式的进程数（0 表示 CPU 核数，1 为单进程）')
+    parser.add_argument('--log', type=str,
+                       help='比较模式下把每局结果追加写入该 JSONL 日志')
+    parser.add_argument('--resume', action='store_true',
+                       help='跳过 --log 日志中已完成的对局')
+    parser.add_argument('--sprt', action='store_true',
+                       help='比较模式下用 SPRT 检验第一个智能体是否强于第二个，得出结论即停止（--games 为最多局数）')
+    parser.add_argument('--elo0', type=float, default=0.0,
+                       help='SPRT 的 H0 Elo 差')
+    parser.add_argument('--elo1', type=float, default=5.0,
+                       help='SPRT 的 H1 Elo 差')
+    parser.add_argument('--alpha', type=float, default=0.05,
+                       help='SPRT 的第一类错误率')
+    parser.add_argument('--beta', type=float, default=0.05,
+                       help='SPRT 的第二类错误率')
+    parser.add_argument('--adaptive', action='store_true',
+                       help='比较模式下按信息量自适应配对，代替完整循环赛（--games 为每对局数的上限折算的总局数）')
+    parser.add_argument('--target-stderr', type=float, default=30.0,
+                       help='自适应配对的目标等级分标准误差（Elo）')
     
     args = parser.parse_args()
     
@@ -297,27 +419,49 @@ def main():
             print("从文件绘制图表功能待实现")
         return
     
-    # 创建游戏环境
-    if args.game == 'gomoku':
-        env = create_environment(args.game, 
-                               board_size=args.board_size, 
-                               win_length=args.win_length)
-    else:
-        env = create_environment(args.game, board_size=args.board_size)
+    if args.agents is None:
+        args.agents = ['pingpong_predictive', 'pingpong_rule'] if args.game == 'pingpong' else ['random', 'minimax']
     
     # 准备AI参数
     agent_kwargs = {
         'minimax': {'max_depth': args.minimax_depth},
-        'mcts': {'simulation_count': args.mcts_simulations}
+        'mcts': {'simulation_count': args.mcts_simulations},
+        'pingpong_predictive': {'use_force': True}
     }
     
+    if args.game == 'pingpong':
+        print(f"游戏类型: {args.game}")
+        print(f"每组对战场数: {args.games}")
+        evaluate_pingpong(args, agent_kwargs)
+        return
+    
+    # 创建游戏环境
+    if args.game == 'gomoku':
+        env_kwargs = {'board_size': args.board_size, 'win_length': args.win_length}
+    else:
+        env_kwargs = {'board_size': args.board_size}
+    env = create_environment(args.game, **env_kwargs)
+    
     print(f"游戏类型: {args.game}")
     print(f"评估智能体: {args.agents}")
     print(f"每个测试游戏数: {args.games}")
     
     if args.compare:
         # 比较模式
-        results = compare_agents(env, args.agents, args.games, **agent_kwargs)
+        if args.sprt:
+            results = sprt_compare(args, env, env_kwargs, agent_kwargs)
+        elif args.adaptive:
+            results = compare_agents_adaptive(args.game, env_kwargs, args.agents, args.games,
+                                              target_stderr=args.target_stderr,
+                                              workers=args.workers or None,
+                                              log_path=args.log, resume=args.resume, **agent_kwargs)
+        elif args.workers == 1:
+            results = compare_agents(env, args.agents, args.games,
+                                     log_path=args.log, resume=args.resume, **agent_kwargs)
+        else:
+            results = compare_agents_parallel(args.game, env_kwargs, args.agents, args.games,
+                                              workers=args.workers or None,
+                                              log_path=args.log, resume=args.resume, **agent_kwargs)
         
         if args.save:
             save_results(results, args.save)
@@ -62,7 +62,8 @@ class RuleBasedGomokuBot(BaseAgent):
     def get_action(self, observation: Any, env: Any) -> Tuple[int, int]:
         """基于规则的决策"""
         valid_actions = env.get_valid_actions()
-        board = observation['board']
+        # reset() 返回棋盘数组，step() 返回含 'board' 的字典
+        board = observation['board'] if isinstance(observation, dict) else observation
         
         # 规则1: 如果能获胜，立即获胜
         winning_move = self._find_winning_move(valid_actions, board, self.player_id)
@@ -132,6 +132,24 @@ class BaseGame(ABC):
         # 子类需要实现具体的克隆逻辑
         raise NotImplementedError("子类必须实现clone方法")
     
+    def snapshot(self) -> Tuple:
+        """
+        获取轻量级状态快照
+        
+        返回不可变的紧凑状态（元组/bytes），供搜索类 Bot 保存与回滚局面，
+        代替 clone() 构造整个新游戏对象。
+        """
+        raise NotImplementedError("子类必须实现snapshot方法")
+    
+    def restore(self, snapshot: Tuple) -> None:
+        """
+        从 snapshot() 的返回值原地恢复状态
+        
+        Args:
+            snapshot: 之前由同一类游戏的 snapshot() 生成的快照
+        """
+        raise NotImplementedError("子类必须实现restore方法")
+    
     def get_action_space(self) -> Any:
         """获取动作空间"""
         # 子类需要实现具体的动作空间定义
@@ -5,6 +5,7 @@
 import numpy as np
 from typing import Dict, List, Tuple, Any, Optional
 from games.base_game import BaseGame
+from games.gomoku import zobrist
 import config
 
 
@@ -27,6 +28,9 @@ class GomokuGame(BaseGame):
         self.game_state = config.GameState.ONGOING
         self.move_count = 0
         self.history: List[Tuple[int, int]] = []  # 只记录坐标
+        # 8 个对称变体的 Zobrist 键，落子/悔棋时增量更新
+        self._zobrist, self._sym_perms, _ = zobrist.get_tables(self.board_size)
+        self._sym_keys = np.zeros(zobrist.NUM_SYMMETRIES, dtype=np.uint64)
         return self.get_state()
 
     def step(self, action: Tuple[int, int]) -> Tuple[Dict[str, Any], float, bool, Dict]:
@@ -35,6 +39,7 @@ class GomokuGame(BaseGame):
             return self.get_state(), -1, True, {"error": "Invalid move"}
 
         self.board[row, col] = self.current_player
+        self._sym_keys ^= self._zobrist[self._sym_perms[:, row * self.board_size + col], self.current_player]
         self.history.append(action)
         self.move_count += 1
         done = self.is_terminal()
@@ -48,6 +53,7 @@ class GomokuGame(BaseGame):
         if not self.history:
             return
         r, c = self.history.pop()
+        self._sym_keys ^= self._zobrist[self._sym_perms[:, r * self.board_size + c], self.board[r, c]]
         self.board[r, c] = 0
         self.move_count -= 1
         self.switch_player()
@@ -108,16 +114,60 @@ class GomokuGame(BaseGame):
         return self.board.copy()
 
     def clone(self) -> "GomokuGame":
-        import copy
-
-        new_game = GomokuGame(self.board_size, self.win_length)
+        # 绕过 __init__（否则会 reset 两次），只复制可变部分
+        new_game = GomokuGame.__new__(GomokuGame)
+        new_game.__dict__.update(self.__dict__)
         new_game.board = self.board.copy()
-        new_game.current_player = self.current_player
-        new_game.game_state = self.game_state
-        new_game.move_count = self.move_count
-        new_game.history = copy.deepcopy(self.history)
+        new_game.history = self.history.copy()  # 坐标元组不可变，浅拷贝即可
+        new_game._sym_keys = self._sym_keys.copy()
         return new_game
 
+    def snapshot(self) -> Tuple:
+        """(棋盘 bytes, 当前玩家, 步数, 游戏状态, 历史元组, 对称键 bytes)"""
+        return (
+            self.board.astype(np.uint8).tobytes(),
+            self.current_player,
+            self.move_count,
+            self.game_state,
+            tuple(self.history),
+            self._sym_keys.tobytes(),
+        )
+
+    def restore(self, snapshot: Tuple) -> None:
+        board_bytes, self.current_player, self.move_count, self.game_state, history, keys = snapshot
+        flat = np.frombuffer(board_bytes, dtype=np.uint8)
+        np.copyto(self.board, flat.reshape(self.board_size, self.board_size))
+        self.history[:] = history
+        np.copyto(self._sym_keys, np.frombuffer(keys, dtype=np.uint64))
+
+    # ------------------------------------------------------------------
+    # Zobrist 哈希与对称规范化
+    # ------------------------------------------------------------------
+    def zobrist_key(self) -> int:
+        """当前棋盘（未变换）的 Zobrist 键"""
+        return int(self._sym_keys[0])
+
+    def symmetry_keys(self) -> np.ndarray:
+        """8 个对称变体的 Zobrist 键"""
+        return self._sym_keys.copy()
+
+    def canonical_key(self) -> Tuple[int, int]:
+        """
+        返回 (规范键, 变换编号)
+
+        规范键是 8 个对称变体中最小的 Zobrist 键，对称局面得到相同的键；
+        用 transform_move / inverse_transform_move 在原棋盘与规范棋盘之间映射坐标。
+        """
+        return zobrist.canonical_from_keys(self._sym_keys)
+
+    def transform_move(self, move: Tuple[int, int], transform: int) -> Tuple[int, int]:
+        """原棋盘坐标 -> 变换后棋盘坐标"""
+        return zobrist.transform_move(move, transform, self.board_size)
+
+    def inverse_transform_move(self, move: Tuple[int, int], transform: int) -> Tuple[int, int]:
+        """变换后棋盘坐标 -> 原棋盘坐标"""
+        return zobrist.inverse_transform_move(move, transform, self.board_size)
+
     # ------------------------------------------------------------------
     # 额外工具
     # ------------------------------------------------------------------
@@ -0,0 +1,80 @@
+"""
+五子棋 Zobrist 哈希与棋盘对称变换
+棋盘有 8 种二面体对称（4 种旋转 × 是否镜像），同一局面的 8 个变体
+取最小的 Zobrist 键作为规范键，置换表/缓存即可共享对称局面。
+"""
+
+from typing import Dict, Tuple
+import numpy as np
+
+NUM_SYMMETRIES = 8
+ZOBRIST_SEED = 20250622
+
+# board_size -> (zobrist, perms, inv_perms)
+_TABLES: Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+
+def _transform_cell(r: int, c: int, t: int, n: int) -> Tuple[int, int]:
+    """先按 t >= 4 左右镜像，再顺时针旋转 t % 4 次"""
+    if t >= 4:
+        c = n - 1 - c
+    for _ in range(t % 4):
+        r, c = c, n - 1 - r
+    return r, c
+
+
+def get_tables(board_size: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    获取指定棋盘大小的哈希表与对称置换表（按大小缓存）
+
+    Returns:
+        zobrist: (N*N, 3) uint64，第 0 列（空位）全为 0
+        perms: (8, N*N) int64，perms[t, i] 为格子 i 在变换 t 下的位置
+        inv_perms: (8, N*N) int64，perms 的逆置换
+    """
+    tables = _TABLES.get(board_size)
+    if tables is None:
+        n = board_size
+        rng = np.random.default_rng(ZOBRIST_SEED + n)
+        zobrist = rng.integers(1, 2**63, size=(n * n, 3), dtype=np.uint64)
+        zobrist[:, 0] = 0
+        perms = np.empty((NUM_SYMMETRIES, n * n), dtype=np.int64)
+        for t in range(NUM_SYMMETRIES):
+            for r in range(n):
+                for c in range(n):
+                    tr, tc = _transform_cell(r, c, t, n)
+                    perms[t, r * n + c] = tr * n + tc
+        inv_perms = np.argsort(perms, axis=1)
+        tables = (zobrist, perms, inv_perms)
+        _TABLES[board_size] = tables
+    return tables
+
+
+def board_symmetry_keys(board: np.ndarray) -> np.ndarray:
+    """从头计算棋盘 8 个对称变体的 Zobrist 键"""
+    zobrist, perms, _ = get_tables(board.shape[0])
+    stones = np.asarray(board, dtype=np.int64).ravel()
+    return np.bitwise_xor.reduce(zobrist[perms, stones], axis=1)
+
+
+def canonical_from_keys(keys: np.ndarray) -> Tuple[int, int]:
+    """从 8 个对称键中取最小者，返回 (规范键, 变换编号)"""
+    t = int(np.argmin(keys))
+    return int(keys[t]), t
+
+
+def board_canonical_key(board: np.ndarray) -> Tuple[int, int]:
+    """棋盘的规范键及对应变换"""
+    return canonical_from_keys(board_symmetry_keys(board))
+
+
+def transform_move(move: Tuple[int, int], t: int, board_size: int) -> Tuple[int, int]:
+    """把原棋盘上的坐标映射到变换 t 之后的棋盘"""
+    _, perms, _ = get_tables(board_size)
+    return divmod(int(perms[t, move[0] * board_size + move[1]]), board_size)
+
+
+def inverse_transform_move(move: Tuple[int, int], t: int, board_size: int) -> Tuple[int, int]:
+    """把变换 t 之后棋盘上的坐标映射回原棋盘"""
+    _, _, inv_perms = get_tables(board_size)
+    return divmod(int(inv_perms[t, move[0] * board_size + move[1]]), board_size)
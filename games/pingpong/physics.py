@@ -0,0 +1,206 @@
+"""
+乒乓球物理核心
+固定时间步长：每次 step 推进一个 tick，TICK_RATE 个 tick 为游戏内 1 秒，与渲染帧率无关。
+全部动态量放在 PingPongState（__slots__）里；挡板移动、积分、碰撞都是只依赖参数、
+返回新值的纯函数，step 只负责把它们按固定顺序组合起来写回状态。
+发球的随机角度来自状态内的 SplitMix64 整数状态，同一种子 + 同一动作序列逐位复现。
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+from games.rng import MASK64, splitmix64
+
+TICK_RATE = 60                 # 每秒 tick 数（与 GUI 的 60 FPS 相同）
+PADDLE_SPEED = 3
+PADDLE_STEP = PADDLE_SPEED / 100  # 挡板每 tick 位移
+VELOCITY_DIVISOR = 100         # 速度单位：每 tick 位移 = 速度 / 100
+BALL_INITIAL_SPEED = 0.25
+WIN_SCORE = 11
+
+LEFT_X_RANGE = (0.0, 0.2)      # 左挡板可移动的横向范围
+RIGHT_X_RANGE = (0.8, 1.0)
+PADDLE_REACH = 0.02            # 球心与挡板的横向接触距离
+PADDLE_HALF_HEIGHT = 0.1
+
+MAX_CHARGE = 20                # 最多蓄力 tick 数
+CHARGE_GAIN = 0.3              # 每 tick 蓄力增加的击球倍数
+MAX_POWER = 3.0
+OFFSET_GAIN = 2                # 击球点偏离挡板中心对 vy 的影响
+SPIN_TICKS = 50                # 旋转持续 tick 数
+SPIN_ACCEL = 0.08              # 旋转期间每 tick 对 vy 的改变
+SPIN_KICK = 0.3                # 旋转击球时 vy 的瞬时改变
+SERVE_SPREAD = 0.0             # 发球 vy 在 [-SERVE_SPREAD, SERVE_SPREAD) 内均匀随机；默认 0 即原版的水平发球
+
+class PingPongState:
+    """乒乓球全部动态状态"""
+
+    __slots__ = ('ball_x', 'ball_y', 'ball_vx', 'ball_vy',
+                 'left_x', 'left_y', 'right_x', 'right_y',
+                 'spin_timer', 'spin_direction', 'left_charge', 'right_charge',
+                 'score_left', 'score_right', 'last_scorer', 'serve_dir',
+                 'rng_state', 'serve_spread', 'tick')
+
+    def __init__(self, seed: int = 0, serve_spread: float = SERVE_SPREAD):
+        self.left_x, self.left_y = 0.05, 0.5
+        self.right_x, self.right_y = 0.95, 0.5
+        self.spin_timer = 0
+        self.spin_direction = 0
+        self.left_charge = 0
+        self.right_charge = 0
+        self.score_left = 0
+        self.score_right = 0
+        self.last_scorer = None
+        self.rng_state = seed & MASK64
+        self.serve_spread = serve_spread
+        self.tick = 0
+        # 开局向右发球，之后每得一分交替
+        self.serve_dir = 1
+        self.rng_state, self.ball_x, self.ball_y, self.ball_vx, self.ball_vy = serve(
+            self.rng_state, 1, serve_spread)
+
+    def as_tuple(self) -> Tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def load(self, values: Tuple):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def copy(self) -> 'PingPongState':
+        new = PingPongState.__new__(PingPongState)
+        new.load(self.as_tuple())
+        return new
+
+
+# ----------------------------------------------------------------------
+# 纯函数
+# ----------------------------------------------------------------------
+def serve(rng_state: int, direction: int, spread: float) -> Tuple[int, float, float, float, float]:
+    """球回到中心，按 direction 发出；返回 (新 rng 状态, x, y, vx, vy)"""
+    vy = 0.0
+    if spread:
+        rng_state, r = splitmix64(rng_state)
+        vy = spread * ((r >> 11) * (2.0 / (1 << 53)) - 1.0)
+    return rng_state, 0.5, 0.5, direction * BALL_INITIAL_SPEED, vy
+
+
+def move_paddle(x: float, y: float, move_x: int, move_y: int,
+                x_range: Tuple[float, float]) -> Tuple[float, float]:
+    """按输入移动挡板一个 tick，横向限制在 x_range 内，纵向限制在 [0, 1]"""
+    if move_x == 1:
+        x = min(x_range[1], x + PADDLE_STEP)
+    elif move_x == -1:
+        x = max(x_range[0], x - PADDLE_STEP)
+    if move_y == 1:
+        y = min(1.0, y + PADDLE_STEP)
+    elif move_y == -1:
+        y = max(0.0, y - PADDLE_STEP)
+    return x, y
+
+
+def apply_spin(vy: float, spin_timer: int, spin_direction: int) -> Tuple[float, int, int]:
+    """旋转期间 vy 持续偏转（香蕉球）；返回 (vy, spin_timer, spin_direction)"""
+    if spin_timer > 0:
+        vy += SPIN_ACCEL * spin_direction
+        spin_timer -= 1
+        if spin_timer == 0:
+            spin_direction = 0
+    return vy, spin_timer, spin_direction
+
+
+def integrate(x: float, y: float, vx: float, vy: float) -> Tuple[float, float, float]:
+    """球前进一个 tick，碰到上下边界时 vy 反向；返回 (x, y, vy)"""
+    x += vx / VELOCITY_DIVISOR
+    y += vy / VELOCITY_DIVISOR
+    if y <= 0 or y >= 1:
+        vy = -vy
+    return x, y, vy
+
+
+def paddle_return(ball_y: float, vx: float, vy: float, paddle_y: float, charge: int,
+                  spin: bool, move_y: int, direction: int,
+                  spin_timer: int, spin_direction: int) -> Tuple[float, float, int, int]:
+    """
+    挡板击球：蓄力决定倍数，击球点偏离中心与旋转改变 vy
+
+    Args:
+        direction: 击球后 vx 的符号（左挡板 1，右挡板 -1）
+
+    Returns:
+        (vx, vy, spin_timer, spin_direction)
+    """
+    mult = min(1.0 + CHARGE_GAIN * charge, MAX_POWER)
+    vx = direction * abs(vx) * mult
+    spin_effect = 0.0
+    if spin:
+        spin_effect = SPIN_KICK * (move_y if move_y != 0 else 1)
+        spin_timer = SPIN_TICKS
+        spin_direction = -move_y if move_y != 0 else 1  # 没动默认向上
+    vy = vy * mult + (ball_y - paddle_y) * OFFSET_GAIN + spin_effect
+    return vx, vy, spin_timer, spin_direction
+
+
+# ----------------------------------------------------------------------
+# 组合
+# ----------------------------------------------------------------------
+def step(state: PingPongState, action: Dict[str, Any]) -> Optional[int]:
+    """
+    推进一个 tick
+
+    Args:
+        action: 与 PingPongGame.step 相同的动作字典，缺省键视为不动
+
+    Returns:
+        本 tick 得分的一方（1 左 / 2 右），没有得分为 None
+    """
+    get = action.get
+    move_left_y = get("move_left_y", 0)
+    move_right_y = get("move_right_y", 0)
+    # 蓄力：按住累积，松开保留，击球后清零
+    if get("left_force", False):
+        state.left_charge = min(state.left_charge + 1, MAX_CHARGE)
+    if get("right_force", False):
+        state.right_charge = min(state.right_charge + 1, MAX_CHARGE)
+
+    state.left_x, state.left_y = move_paddle(state.left_x, state.left_y,
+                                             get("move_left_x", 0), move_left_y, LEFT_X_RANGE)
+    state.right_x, state.right_y = move_paddle(state.right_x, state.right_y,
+                                               get("move_right_x", 0), move_right_y, RIGHT_X_RANGE)
+
+    state.ball_vy, state.spin_timer, state.spin_direction = apply_spin(
+        state.ball_vy, state.spin_timer, state.spin_direction)
+    state.ball_x, state.ball_y, state.ball_vy = integrate(
+        state.ball_x, state.ball_y, state.ball_vx, state.ball_vy)
+    state.tick += 1
+
+    scorer = None
+    if state.ball_x <= state.left_x + PADDLE_REACH:
+        if abs(state.ball_y - state.left_y) < PADDLE_HALF_HEIGHT:
+            state.ball_vx, state.ball_vy, state.spin_timer, state.spin_direction = paddle_return(
+                state.ball_y, state.ball_vx, state.ball_vy, state.left_y, state.left_charge,
+                get("left_spin", False), move_left_y, 1, state.spin_timer, state.spin_direction)
+            state.left_charge = 0
+        else:
+            scorer = 2
+    elif state.ball_x >= state.right_x - PADDLE_REACH:
+        if abs(state.ball_y - state.right_y) < PADDLE_HALF_HEIGHT:
+            state.ball_vx, state.ball_vy, state.spin_timer, state.spin_direction = paddle_return(
+                state.ball_y, state.ball_vx, state.ball_vy, state.right_y, state.right_charge,
+                get("right_spin", False), move_right_y, -1, state.spin_timer, state.spin_direction)
+            state.right_charge = 0
+        else:
+            scorer = 1
+
+    if scorer is not None:
+        if scorer == 1:
+            state.score_left += 1
+        else:
+            state.score_right += 1
+        state.last_scorer = scorer
+        state.rng_state, state.ball_x, state.ball_y, state.ball_vx, state.ball_vy = serve(
+            state.rng_state, state.serve_dir, state.serve_spread)
+        state.serve_dir = -state.serve_dir
+    return scorer
+
+
+def is_over(state: PingPongState) -> bool:
+    return state.score_left >= WIN_SCORE or state.score_right >= WIN_SCORE
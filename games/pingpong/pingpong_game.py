@@ -1,141 +1,81 @@
+from typing import Optional
+import random
+
 from games.base_game import BaseGame
-import sys
+from games.pingpong.physics import PingPongState, WIN_SCORE, SERVE_SPREAD, is_over, step as advance
+
+
+def _physics_field(name):
+    """把旧的属性名映射到 PingPongState 的字段"""
+    return property(lambda self: getattr(self.physics, name),
+                    lambda self, value: setattr(self.physics, name, value))
 
-PADDLE_SPEED = 3
-BALL_INITIAL_SPEED = 0.25  # 初始速度更慢（降为原来一半）
-WIN_SCORE = 11
 
 class PingPongGame(BaseGame):
+    score_left = _physics_field('score_left')
+    score_right = _physics_field('score_right')
+    ball_vx = _physics_field('ball_vx')
+    ball_vy = _physics_field('ball_vy')
+    left_paddle_x = _physics_field('left_x')
+    left_paddle_y = _physics_field('left_y')
+    right_paddle_x = _physics_field('right_x')
+    right_paddle_y = _physics_field('right_y')
+    last_scorer = _physics_field('last_scorer')
+    serve_dir = _physics_field('serve_dir')
+    spin_timer = _physics_field('spin_timer')
+    spin_direction = _physics_field('spin_direction')
+    left_force_charge = _physics_field('left_charge')
+    right_force_charge = _physics_field('right_charge')
+
     def __init__(self, **kwargs):
+        """
+        Args:
+            seed: 发球随机数种子（None 时从全局 random 取）
+            serve_spread: 发球 vy 的随机范围，默认 0 即总是水平发球
+        """
+        self.serve_spread = kwargs.get('serve_spread', SERVE_SPREAD)
+        self.physics = None
         super().__init__(kwargs)
+        # BaseGame.__init__ 已经 reset 过一次，重新播种使 seed 对应最终开局的发球
+        self.seed(kwargs.get('seed'))
         self.reset()
-        self.spin_timer = 0
-        self.spin_direction = 0
-        self.left_force_charge = 0  # 新增：左挡板蓄力
-        self.right_force_charge = 0  # 新增：右挡板蓄力
+
+    def seed(self, seed: Optional[int] = None):
+        """重新设置发球随机数种子（在下一次 reset 时生效）"""
+        self._next_seed = random.getrandbits(64) if seed is None else seed
+
+    @property
+    def ball_pos(self):
+        return [self.physics.ball_x, self.physics.ball_y]
+
+    @ball_pos.setter
+    def ball_pos(self, pos):
+        self.physics.ball_x, self.physics.ball_y = pos
 
     def reset(self):
-        self.score_left = 0
-        self.score_right = 0
-        self.ball_pos = [0.5, 0.5]  # x, y
-        self.ball_vx = BALL_INITIAL_SPEED
-        self.ball_vy = 0.0
-        self.left_paddle_x = 0.05
-        self.left_paddle_y = 0.5
-        self.right_paddle_x = 0.95
-        self.right_paddle_y = 0.5
-        self.last_scorer = None
-        self.serve_dir = 1  # 1=右发球，-1=左发球
-        self.left_force = False
-        self.right_force = False
-        self.spin_timer = 0
-        self.spin_direction = 0
-        self.left_force_charge = 0  # 新增
-        self.right_force_charge = 0  # 新增
-        #print(f"[DEBUG] reset: score_left={self.score_left}, score_right={self.score_right}")
+        # 未重新播种时延续上一局的随机数序列
+        seed = getattr(self, '_next_seed', None)
+        if seed is None:
+            seed = self.physics.rng_state if self.physics is not None else random.getrandbits(64)
+        self._next_seed = None
+        self.physics = PingPongState(seed, self.serve_spread)
         return self.get_state()
 
     def step(self, action):
-        #print(f"[DEBUG] step: before, score_left={self.score_left}, score_right={self.score_right}, action={action}")
+        """推进一个固定时间步（1 / TICK_RATE 秒），动作字典中缺省的键视为不动"""
         reward = 0
         done = False
         info = {}
-        # 记录本帧是否用力/旋转
-        left_force = action.get("left_force", False)
-        right_force = action.get("right_force", False)
-        left_spin = action.get("left_spin", False)
-        right_spin = action.get("right_spin", False)
-        move_left_x = action.get("move_left_x", 0)
-        move_left_y = action.get("move_left_y", 0)
-        move_right_x = action.get("move_right_x", 0)
-        move_right_y = action.get("move_right_y", 0)
-        # 蓄力逻辑
-        if left_force:
-            self.left_force_charge = min(self.left_force_charge + 1, 20)  # 最多蓄20帧
-        else:
-            pass  # 松开不清零，击球后才清零
-        if right_force:
-            self.right_force_charge = min(self.right_force_charge + 1, 20)
-        else:
-            pass
-        # 左挡板移动
-        if move_left_x == 1:
-            self.left_paddle_x = min(0.2, self.left_paddle_x + PADDLE_SPEED/100)
-        elif move_left_x == -1:
-            self.left_paddle_x = max(0.0, self.left_paddle_x - PADDLE_SPEED/100)
-        if move_left_y == 1:
-            self.left_paddle_y = min(1.0, self.left_paddle_y + PADDLE_SPEED/100)
-        elif move_left_y == -1:
-            self.left_paddle_y = max(0.0, self.left_paddle_y - PADDLE_SPEED/100)
-        # 右挡板移动
-        if move_right_x == 1:
-            self.right_paddle_x = min(1.0, self.right_paddle_x + PADDLE_SPEED/100)
-        elif move_right_x == -1:
-            self.right_paddle_x = max(0.8, self.right_paddle_x - PADDLE_SPEED/100)
-        if move_right_y == 1:
-            self.right_paddle_y = min(1.0, self.right_paddle_y + PADDLE_SPEED/100)
-        elif move_right_y == -1:
-            self.right_paddle_y = max(0.0, self.right_paddle_y - PADDLE_SPEED/100)
-        # 香蕉球曲线spin效果
-        if self.spin_timer > 0:
-            self.ball_vy += 0.08 * self.spin_direction  # 持续弯曲更明显
-            self.spin_timer -= 1
-            if self.spin_timer == 0:
-                self.spin_direction = 0
-        # 球运动
-        self.ball_pos[0] += self.ball_vx/100
-        self.ball_pos[1] += self.ball_vy/100
-        # 碰撞检测（上下边界）
-        if self.ball_pos[1] <= 0 or self.ball_pos[1] >= 1:
-            self.ball_vy = -self.ball_vy
-        # 左挡板碰撞
-        if self.ball_pos[0] <= self.left_paddle_x + 0.02:
-            if abs(self.ball_pos[1] - self.left_paddle_y) < 0.1:
-                # 蓄力倍数：1.0~3.0
-                mult = 1.0 + 0.3 * self.left_force_charge
-                mult = min(mult, 3.0)
-                self.ball_vx = abs(self.ball_vx) * mult
-                # 旋转：香蕉球，持续影响vy
-                spin_effect = 0.0
-                if left_spin:
-                    spin_effect = 0.3 * (move_left_y if move_left_y != 0 else 1)
-                    self.spin_timer = 50  # 持续50帧
-                    self.spin_direction = -move_left_y if move_left_y != 0 else 1  # 没动默认向上
-                self.ball_vy = self.ball_vy * mult + (self.ball_pos[1] - self.left_paddle_y) * 2 + spin_effect
-                self.left_force_charge = 0  # 击球后清零
-            else:
-                self.score_right += 1
-                self.last_scorer = 2
-                self._serve()
-        # 右挡板碰撞
-        elif self.ball_pos[0] >= self.right_paddle_x - 0.02:
-            if abs(self.ball_pos[1] - self.right_paddle_y) < 0.1:
-                mult = 1.0 + 0.3 * self.right_force_charge
-                mult = min(mult, 3.0)
-                self.ball_vx = -abs(self.ball_vx) * mult
-                # 旋转：香蕉球，持续影响vy
-                spin_effect = 0.0
-                if right_spin:
-                    spin_effect = 0.3 * (move_right_y if move_right_y != 0 else 1)
-                    self.spin_timer = 50
-                    self.spin_direction = -move_right_y if move_right_y != 0 else 1
-                self.ball_vy = self.ball_vy * mult + (self.ball_pos[1] - self.right_paddle_y) * 2 + spin_effect
-                self.right_force_charge = 0  # 击球后清零
-            else:
-                self.score_left += 1
-                self.last_scorer = 1
-                self._serve()
+        advance(self.physics, action)
         # 终局
-        if self.score_left >= WIN_SCORE or self.score_right >= WIN_SCORE:
+        state = self.physics
+        if state.score_left >= WIN_SCORE or state.score_right >= WIN_SCORE:
             done = True
-            reward = 1 if self.score_left > self.score_right else -1
-        #print(f"[DEBUG] step: after, score_left={self.score_left}, score_right={self.score_right}, done={done}")
+            reward = 1 if state.score_left > state.score_right else -1
         return self.get_state(), reward, done, info
 
     def is_terminal(self):
-        result = self.score_left >= WIN_SCORE or self.score_right >= WIN_SCORE
-        #print(f"[DEBUG] is_terminal: score_left={self.score_left}, score_right={self.score_right}, result={result}")
-        return result
+        return is_over(self.physics)
 
     def get_winner(self):
         #print(f"[DEBUG] get_winner: score_left={self.score_left}, score_right={self.score_right}")
@@ -146,17 +86,18 @@ class PingPongGame(BaseGame):
         return None
 
     def get_state(self):
+        state = self.physics
         return {
-            "score_left": self.score_left,
-            "score_right": self.score_right,
-            "ball_pos": self.ball_pos[:],
-            "ball_vx": self.ball_vx,
-            "ball_vy": self.ball_vy,
-            "left_paddle_x": self.left_paddle_x,
-            "left_paddle_y": self.left_paddle_y,
-            "right_paddle_x": self.right_paddle_x,
-            "right_paddle_y": self.right_paddle_y,
-            "last_scorer": self.last_scorer
+            "score_left": state.score_left,
+            "score_right": state.score_right,
+            "ball_pos": [state.ball_x, state.ball_y],
+            "ball_vx": state.ball_vx,
+            "ball_vy": state.ball_vy,
+            "left_paddle_x": state.left_x,
+            "left_paddle_y": state.left_y,
+            "right_paddle_x": state.right_x,
+            "right_paddle_y": state.right_y,
+            "last_scorer": state.last_scorer
         }
 
     def get_valid_actions(self, player=None):
@@ -181,15 +122,20 @@ class PingPongGame(BaseGame):
             for rs in [False, True]  # 新增：右旋转
         ]
 
-    def _serve(self):
-        self.ball_pos = [0.5, 0.5]
-        self.ball_vx = self.serve_dir * BALL_INITIAL_SPEED
-        self.ball_vy = 0.0
-        self.serve_dir *= -1
     def clone(self) -> 'PingPongGame':
-        """克隆当前游戏状态"""
-        import copy
-        return copy.deepcopy(self)
+        """克隆当前游戏状态（物理状态单独复制）"""
+        new_game = PingPongGame.__new__(PingPongGame)
+        new_game.__dict__.update(self.__dict__)
+        new_game.physics = self.physics.copy()
+        return new_game
+
+    def snapshot(self):
+        """返回全部动态字段组成的元组"""
+        return self.physics.as_tuple() + (self.move_count,)
+
+    def restore(self, snapshot):
+        self.physics.load(snapshot[:-1])
+        self.move_count = snapshot[-1]
 
     def get_action_space(self):
         """返回动作空间结构（用于RL）"""
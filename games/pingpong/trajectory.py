@@ -0,0 +1,87 @@
+"""
+乒乓球轨迹预测
+预测球在不被击回的前提下何时、在什么高度到达某条竖直线（通常是挡板的接触线）。
+旋转期间 vy 每 tick 都在变化，直接调用 physics 中的纯函数逐 tick 推进（最多 SPIN_TICKS 个）；
+旋转结束后速度恒定，位置是 tick 数的线性函数，于是按“下一次碰墙 / 到达接触线”
+整段跳跃，每段 O(1)，一次预测只需几次除法。
+"""
+
+import math
+from typing import Optional, Tuple
+
+from games.pingpong.physics import (PADDLE_REACH, PingPongState, VELOCITY_DIVISOR,
+                                    apply_spin, integrate)
+
+MAX_TICKS = 100000  # 球几乎不横向移动时放弃预测
+
+
+def _ticks_until(position: float, delta: float, bound: float, upward: bool) -> int:
+    """位置每 tick 增加 delta，首次满足 position >= bound（upward）或 <= bound 所需的 tick 数"""
+    k = max(1, math.ceil((bound - position) / delta))
+    # 浮点误差修正，保证与逐 tick 累加的判定一致
+    while k > 1 and ((position + (k - 1) * delta >= bound) if upward else (position + (k - 1) * delta <= bound)):
+        k -= 1
+    while not ((position + k * delta >= bound) if upward else (position + k * delta <= bound)):
+        k += 1
+    return k
+
+
+def predict_crossing(x: float, y: float, vx: float, vy: float, plane_x: float,
+                     spin_timer: int = 0, spin_direction: int = 0) -> Optional[Tuple[int, float]]:
+    """
+    球首次越过 plane_x 的 tick 数与此时的 y
+
+    Args:
+        plane_x: 竖直线位置；球向左运动时判定 x <= plane_x，向右时判定 x >= plane_x
+
+    Returns:
+        (ticks, y)；球不朝 plane_x 运动（或太慢）时返回 None
+    """
+    if vx == 0 or (vx < 0) != (plane_x < x):
+        return None
+    leftward = vx < 0
+    ticks = 0
+    # 旋转阶段：逐 tick 与物理核心完全一致
+    while spin_timer > 0:
+        vy, spin_timer, spin_direction = apply_spin(vy, spin_timer, spin_direction)
+        x, y, vy = integrate(x, y, vx, vy)
+        ticks += 1
+        if (x <= plane_x) if leftward else (x >= plane_x):
+            return ticks, y
+
+    dx = vx / VELOCITY_DIVISOR
+    k_plane = _ticks_until(x, dx, plane_x, not leftward)
+    while ticks + k_plane <= MAX_TICKS:
+        dy = vy / VELOCITY_DIVISOR
+        if dy == 0:
+            k_wall = k_plane + 1
+        elif y + dy <= 0 or y + dy >= 1:
+            k_wall = 1
+        elif dy > 0:
+            k_wall = _ticks_until(y, dy, 1.0, True)
+        else:
+            k_wall = _ticks_until(y, dy, 0.0, False)
+        if k_plane <= k_wall:
+            return ticks + k_plane, y + k_plane * dy
+        # 先碰墙：推进到碰墙的 tick，vy 反向后继续
+        ticks += k_wall
+        x += k_wall * dx
+        y += k_wall * dy
+        vy = -vy
+        k_plane = _ticks_until(x, dx, plane_x, not leftward)
+    return None
+
+
+def predict_intercept(state: PingPongState, player: int) -> Optional[Tuple[int, float]]:
+    """
+    球到达 player（1 左 / 2 右）挡板接触线的 tick 数与高度（假设挡板横向不动）
+
+    Returns:
+        (ticks, y)；球正飞离该挡板时返回 None
+    """
+    if player == 1:
+        plane = state.left_x + PADDLE_REACH
+    else:
+        plane = state.right_x - PADDLE_REACH
+    return predict_crossing(state.ball_x, state.ball_y, state.ball_vx, state.ball_vy, plane,
+                            state.spin_timer, state.spin_direction)
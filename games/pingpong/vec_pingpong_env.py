@@ -0,0 +1,244 @@
+"""
+批量乒乓球环境
+同时模拟 B 局，球、挡板、旋转、蓄力与比分都保存在长度为 B 的 numpy 数组中，
+每个 tick 用一组向量运算推进全部对局。运算顺序与 physics.step 完全相同，
+发球使用同一 SplitMix64 随机数，相同种子下与 PingPongGame 逐位一致。
+一局结束（任一方达到 WIN_SCORE）或达到 max_steps 时自动重置该局。
+"""
+
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from games.pingpong.physics import (
+    BALL_INITIAL_SPEED, CHARGE_GAIN, LEFT_X_RANGE, MAX_CHARGE, MAX_POWER, OFFSET_GAIN,
+    PADDLE_HALF_HEIGHT, PADDLE_REACH, PADDLE_STEP, RIGHT_X_RANGE, SERVE_SPREAD, SPIN_ACCEL,
+    SPIN_KICK, SPIN_TICKS, VELOCITY_DIVISOR, WIN_SCORE,
+)
+from games.rng import splitmix64_array
+
+# 动作数组第二维的含义（与 utils.game_records 中的编码顺序一致）
+ACTION_KEYS = ('move_left_x', 'move_left_y', 'move_right_x', 'move_right_y',
+               'left_force', 'right_force', 'left_spin', 'right_spin')
+
+
+def action_array(actions: Iterable[Dict[str, Any]]) -> np.ndarray:
+    """把 PingPongGame 的动作字典列表转换为 (B, 8) 动作数组"""
+    return np.array([[int(action.get(key, 0)) for key in ACTION_KEYS] for action in actions],
+                    dtype=np.int64).reshape(-1, len(ACTION_KEYS))
+
+
+class VecPingPongEnv:
+    """批量乒乓球环境"""
+
+    def __init__(self, num_envs: int, seed: Union[int, Sequence[int], None] = None,
+                 serve_spread: float = SERVE_SPREAD, max_steps: Optional[int] = None):
+        """
+        Args:
+            num_envs: 并行的局数 B
+            seed: 整数时第 b 局使用 seed + b；也可以直接给出每局的种子
+            serve_spread: 发球 vy 的随机范围，与 PingPongGame 相同
+            max_steps: 单局最多 tick 数，超过时截断并重置（None 表示不限）
+        """
+        self.num_envs = num_envs
+        self.serve_spread = serve_spread
+        self.max_steps = max_steps
+
+        B = num_envs
+        self.ball_x = np.zeros(B)
+        self.ball_y = np.zeros(B)
+        self.ball_vx = np.zeros(B)
+        self.ball_vy = np.zeros(B)
+        self.left_x = np.zeros(B)
+        self.left_y = np.zeros(B)
+        self.right_x = np.zeros(B)
+        self.right_y = np.zeros(B)
+        self.spin_timer = np.zeros(B, dtype=np.int64)
+        self.spin_direction = np.zeros(B, dtype=np.int64)
+        self.left_charge = np.zeros(B, dtype=np.int64)
+        self.right_charge = np.zeros(B, dtype=np.int64)
+        self.scores = np.zeros((B, 2), dtype=np.int64)
+        self.last_scorer = np.zeros(B, dtype=np.int8)  # 0 表示本局还没有得分
+        self.serve_dir = np.zeros(B, dtype=np.int64)
+        self.steps = np.zeros(B, dtype=np.int64)
+        self.rng_state = np.zeros(B, dtype=np.uint64)
+
+        self.seed(seed)
+        self._reset_envs(np.arange(B))
+
+    # ------------------------------------------------------------------
+    # 对外接口
+    # ------------------------------------------------------------------
+    def seed(self, seed: Union[int, Sequence[int], None] = None):
+        """设置每局的发球随机数种子"""
+        if seed is None:
+            seeds = np.random.randint(0, 2**63, size=self.num_envs, dtype=np.int64).astype(np.uint64)
+        elif np.isscalar(seed):
+            seeds = np.array([(int(seed) + b) & 0xFFFFFFFFFFFFFFFF for b in range(self.num_envs)],
+                             dtype=np.uint64)
+        else:
+            seeds = np.array([int(s) & 0xFFFFFFFFFFFFFFFF for s in seed], dtype=np.uint64)
+            if len(seeds) != self.num_envs:
+                raise ValueError("种子数量必须等于 num_envs")
+        self.rng_state[:] = seeds
+
+    def reset(self) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """重置所有对局"""
+        self._reset_envs(np.arange(self.num_envs))
+        return self._get_observation(), {}
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray,
+                                                 np.ndarray, Dict[str, Any]]:
+        """
+        所有对局同时前进一个 tick
+
+        Args:
+            actions: (B, 8) 整数，列顺序见 ACTION_KEYS（移动为 -1/0/1，蓄力与旋转为 0/1）
+
+        Returns:
+            observation: (B, 10) float32，与 PingPongEnv._get_observation 的特征顺序相同
+            rewards: (B, 2) float32，本 tick 得分的一方 +1、失分的一方 -1
+            terminated: (B,) 任一方达到 WIN_SCORE
+            truncated: (B,) 达到 max_steps
+            info: scorer (B,)（本 tick 得分方，0 表示没有）、winner (B,)（仅在结束时有意义）、
+                  scores (B, 2)，以及结束对局重置前的 final_observation
+        """
+        actions = np.asarray(actions, dtype=np.int64).reshape(self.num_envs, len(ACTION_KEYS))
+        scorer = self._tick(actions)
+        self.steps += 1
+
+        rewards = np.zeros((self.num_envs, 2), dtype=np.float32)
+        rewards[scorer == 1] = (1.0, -1.0)
+        rewards[scorer == 2] = (-1.0, 1.0)
+        terminated = (self.scores >= WIN_SCORE).any(axis=1)
+        truncated = np.zeros(self.num_envs, dtype=bool)
+        if self.max_steps is not None:
+            truncated = ~terminated & (self.steps >= self.max_steps)
+
+        winner = np.where(self.scores[:, 0] >= WIN_SCORE, 1,
+                          np.where(self.scores[:, 1] >= WIN_SCORE, 2, 0)).astype(np.int8)
+        info = {'scorer': scorer, 'winner': winner, 'scores': self.scores.copy()}
+        done = np.flatnonzero(terminated | truncated)
+        if len(done):
+            info['final_observation'] = self._get_observation()[done]
+            info['done_envs'] = done
+            self._reset_envs(done)
+        return self._get_observation(), rewards, terminated, truncated, info
+
+    def get_state(self, env: int) -> Dict[str, Any]:
+        """第 env 局的状态，格式与 PingPongGame.get_state 相同"""
+        last_scorer = int(self.last_scorer[env])
+        return {
+            "score_left": int(self.scores[env, 0]),
+            "score_right": int(self.scores[env, 1]),
+            "ball_pos": [float(self.ball_x[env]), float(self.ball_y[env])],
+            "ball_vx": float(self.ball_vx[env]),
+            "ball_vy": float(self.ball_vy[env]),
+            "left_paddle_x": float(self.left_x[env]),
+            "left_paddle_y": float(self.left_y[env]),
+            "right_paddle_x": float(self.right_x[env]),
+            "right_paddle_y": float(self.right_y[env]),
+            "last_scorer": last_scorer or None,
+        }
+
+    # ------------------------------------------------------------------
+    # 内部实现
+    # ------------------------------------------------------------------
+    def _get_observation(self) -> np.ndarray:
+        return np.stack([
+            self.scores[:, 0], self.scores[:, 1],
+            self.ball_x, self.ball_y, self.ball_vx, self.ball_vy,
+            self.left_x, self.left_y, self.right_x, self.right_y,
+        ], axis=1).astype(np.float32)
+
+    def _reset_envs(self, envs: np.ndarray):
+        """与 PingPongState() 相同的开局：挡板归位、比分清零，向右发球"""
+        if len(envs) == 0:
+            return
+        self.left_x[envs], self.left_y[envs] = 0.05, 0.5
+        self.right_x[envs], self.right_y[envs] = 0.95, 0.5
+        self.spin_timer[envs] = 0
+        self.spin_direction[envs] = 0
+        self.left_charge[envs] = 0
+        self.right_charge[envs] = 0
+        self.scores[envs] = 0
+        self.last_scorer[envs] = 0
+        self.steps[envs] = 0
+        self._serve(envs, 1)
+        self.serve_dir[envs] = 1
+
+    def _serve(self, envs: np.ndarray, direction):
+        """与 physics.serve 相同：球回到中心，按 direction 发出"""
+        self.ball_x[envs] = 0.5
+        self.ball_y[envs] = 0.5
+        self.ball_vx[envs] = direction * BALL_INITIAL_SPEED
+        if self.serve_spread:
+            self.rng_state[envs], r = splitmix64_array(self.rng_state[envs])
+            unit = (r >> np.uint64(11)).astype(np.float64) * (2.0 / (1 << 53)) - 1.0
+            self.ball_vy[envs] = self.serve_spread * unit
+        else:
+            self.ball_vy[envs] = 0.0
+
+    @staticmethod
+    def _move(pos, move, low, high):
+        return np.where(move == 1, np.minimum(high, pos + PADDLE_STEP),
+                        np.where(move == -1, np.maximum(low, pos - PADDLE_STEP), pos))
+
+    def _paddle_return(self, hit, paddle_y, charge, spin, move_y, direction):
+        """对 hit 为真的对局应用 physics.paddle_return"""
+        mult = np.minimum(1.0 + CHARGE_GAIN * charge, MAX_POWER)
+        spin = hit & spin
+        nonzero = move_y != 0
+        spin_effect = np.where(spin, SPIN_KICK * np.where(nonzero, move_y, 1), 0.0)
+        vx = direction * np.abs(self.ball_vx) * mult
+        vy = self.ball_vy * mult + (self.ball_y - paddle_y) * OFFSET_GAIN + spin_effect
+        self.ball_vx = np.where(hit, vx, self.ball_vx)
+        self.ball_vy = np.where(hit, vy, self.ball_vy)
+        self.spin_timer = np.where(spin, SPIN_TICKS, self.spin_timer)
+        self.spin_direction = np.where(spin, np.where(nonzero, -move_y, 1), self.spin_direction)
+
+    def _tick(self, actions: np.ndarray) -> np.ndarray:
+        """所有对局推进一个 tick（与 physics.step 相同），返回各局本 tick 的得分方"""
+        move_lx, move_ly, move_rx, move_ry = actions[:, 0], actions[:, 1], actions[:, 2], actions[:, 3]
+        left_force, right_force = actions[:, 4] != 0, actions[:, 5] != 0
+        left_spin, right_spin = actions[:, 6] != 0, actions[:, 7] != 0
+
+        self.left_charge = np.where(left_force, np.minimum(self.left_charge + 1, MAX_CHARGE), self.left_charge)
+        self.right_charge = np.where(right_force, np.minimum(self.right_charge + 1, MAX_CHARGE), self.right_charge)
+
+        self.left_x = self._move(self.left_x, move_lx, *LEFT_X_RANGE)
+        self.left_y = self._move(self.left_y, move_ly, 0.0, 1.0)
+        self.right_x = self._move(self.right_x, move_rx, *RIGHT_X_RANGE)
+        self.right_y = self._move(self.right_y, move_ry, 0.0, 1.0)
+
+        # 旋转
+        spinning = self.spin_timer > 0
+        self.ball_vy = np.where(spinning, self.ball_vy + SPIN_ACCEL * self.spin_direction, self.ball_vy)
+        self.spin_timer = self.spin_timer - spinning
+        self.spin_direction = np.where(spinning & (self.spin_timer == 0), 0, self.spin_direction)
+
+        # 积分与上下边界
+        self.ball_x = self.ball_x + self.ball_vx / VELOCITY_DIVISOR
+        self.ball_y = self.ball_y + self.ball_vy / VELOCITY_DIVISOR
+        bounce = (self.ball_y <= 0) | (self.ball_y >= 1)
+        self.ball_vy = np.where(bounce, -self.ball_vy, self.ball_vy)
+
+        # 挡板
+        at_left = self.ball_x <= self.left_x + PADDLE_REACH
+        at_right = ~at_left & (self.ball_x >= self.right_x - PADDLE_REACH)
+        hit_left = at_left & (np.abs(self.ball_y - self.left_y) < PADDLE_HALF_HEIGHT)
+        hit_right = at_right & (np.abs(self.ball_y - self.right_y) < PADDLE_HALF_HEIGHT)
+        self._paddle_return(hit_left, self.left_y, self.left_charge, left_spin, move_ly, 1)
+        self._paddle_return(hit_right, self.right_y, self.right_charge, right_spin, move_ry, -1)
+        self.left_charge = np.where(hit_left, 0, self.left_charge)
+        self.right_charge = np.where(hit_right, 0, self.right_charge)
+
+        # 得分与发球
+        scorer = np.where(at_left & ~hit_left, 2, np.where(at_right & ~hit_right, 1, 0)).astype(np.int8)
+        scored = np.flatnonzero(scorer)
+        if len(scored):
+            self.scores[scored, scorer[scored] - 1] += 1
+            self.last_scorer[scored] = scorer[scored]
+            self._serve(scored, self.serve_dir[scored])
+            self.serve_dir[scored] = -self.serve_dir[scored]
+        return scorer
@@ -0,0 +1,32 @@
+"""
+SplitMix64 随机数
+状态只是一个 64 位整数，复制和快照都没有开销；贪吃蛇的食物与乒乓球的发球共用，
+逐格 / 逐位复现只依赖种子。
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+MASK64 = (1 << 64) - 1
+
+_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+
+
+def splitmix64(state: int) -> Tuple[int, int]:
+    """SplitMix64 随机数：返回 (新状态, 64 位随机数)"""
+    state = (state + 0x9E3779B97F4A7C15) & MASK64
+    z = state
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return state, z ^ (z >> 31)
+
+
+def splitmix64_array(state: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """splitmix64 的向量化版本（uint64 运算自动按 2^64 取模）"""
+    state = state + _GAMMA
+    z = (state ^ (state >> np.uint64(30))) * _MIX1
+    z = (z ^ (z >> np.uint64(27))) * _MIX2
+    return state, z ^ (z >> np.uint64(31))
@@ -1,4 +1,5 @@
 from .snake_game import SnakeGame
 from .snake_env import SnakeEnv
+from .vec_snake_env import VecSnakeEnv
  
-__all__ = ['SnakeGame', 'SnakeEnv'] 
\ No newline at end of file
+__all__ = ['SnakeGame', 'SnakeEnv', 'VecSnakeEnv'] 
\ No newline at end of file
@@ -0,0 +1,195 @@
+"""
+贪吃蛇空间评估：在占用网格上做泛洪填充
+每个格子记录“被占用到第几个 tick”：空格为 0，存活的蛇第 i 节（0 为蛇头，蛇长 L）
+为 L - i，即假设蛇不再变长时，尾巴下一 tick 就会移开（与引擎一致：
+本 tick 尾巴仍算障碍，之后才空出来）。到达时间 t 大于该值的格子即可通行。
+暂存数组按棋盘大小一次性分配，用代数戳代替清零，同一实例可以反复调用。
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from games.snake.snake_game import SNAKE1, SNAKE2
+
+# 永久障碍（不考虑尾巴移动时的蛇身）
+BLOCKED = np.iinfo(np.int32).max
+
+
+class FloodFill:
+    """可复用的泛洪填充 / 可达面积计算"""
+
+    def __init__(self, board_size: int):
+        n = board_size
+        self.board_size = n
+        self._block = np.zeros(n * n, dtype=np.int32)
+        self._blocked = [0] * (n * n)
+        self._stamp = [0] * (n * n)
+        self._dist = [0] * (n * n)
+        self._owner = [0] * (n * n)
+        self._generation = 0
+        neighbors = []
+        for cell in range(n * n):
+            x, y = divmod(cell, n)
+            neighbors.append(tuple(
+                (x + dx) * n + (y + dy)
+                for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1))
+                if 0 <= x + dx < n and 0 <= y + dy < n
+            ))
+        self._neighbors = neighbors
+
+    # ------------------------------------------------------------------
+    # 准备障碍
+    # ------------------------------------------------------------------
+    def prepare(self, game, tail_aware: bool = True) -> 'FloodFill':
+        """
+        按游戏当前局面计算每个格子的占用时间，之后可对多个起点调用 fill
+
+        Args:
+            game: SnakeGame（使用其 grid 与蛇身 deque）
+            tail_aware: False 时所有蛇身都视为永久障碍
+        """
+        block = self._block
+        if tail_aware:
+            block.fill(0)
+            n = self.board_size
+            for snake, alive in ((game.snake1, game.alive1), (game.snake2, game.alive2)):
+                length = len(snake)
+                if length:
+                    cells = np.fromiter((x * n + y for x, y in snake), dtype=np.int64, count=length)
+                    if alive:
+                        times = np.arange(length, 0, -1, dtype=np.int32)
+                    else:
+                        times = BLOCKED  # 死亡的蛇身永久留在棋盘上
+                    block[cells] = np.maximum(block[cells], times)
+        else:
+            np.copyto(block, np.where((game.grid.ravel() & (SNAKE1 | SNAKE2)) != 0, BLOCKED, 0))
+        self._blocked = block.tolist()
+        return self
+
+    def passable(self, cell: Tuple[int, int], t: int = 1) -> bool:
+        """第 t 个 tick 到达 cell 时该格是否已空出（越界返回 False）"""
+        x, y = cell
+        n = self.board_size
+        return 0 <= x < n and 0 <= y < n and self._blocked[x * n + y] < t
+
+    # ------------------------------------------------------------------
+    # 填充
+    # ------------------------------------------------------------------
+    def fill(self, start: Tuple[int, int], t0: int = 1,
+             limit: Optional[int] = None) -> Tuple[int, int]:
+        """
+        从 start（第 t0 个 tick 到达）出发的逐层 BFS。相邻但尚未空出的蛇身格
+        会被记下，等到它空出的那个 tick 再加入（近似蛇在附近绕圈等待）。
+
+        Args:
+            limit: 可达格数达到 limit 即提前结束（例如够放下整条蛇）
+
+        Returns:
+            (可达格数（含 start）, 最远到达时间)
+        """
+        n = self.board_size
+        blocked, stamp, dist, neighbors = self._blocked, self._stamp, self._dist, self._neighbors
+        self._generation += 1
+        gen = self._generation
+        waiting = -gen
+        s = start[0] * n + start[1]
+        stamp[s] = gen
+        dist[s] = t0
+        frontier = [s]
+        pending = []
+        count, t, depth = 1, t0, t0
+        while frontier or pending:
+            if limit is not None and count >= limit:
+                break
+            t += 1
+            reached = []
+            if pending:
+                still = []
+                for cell in pending:
+                    if blocked[cell] < t:
+                        stamp[cell] = gen
+                        dist[cell] = t
+                        reached.append(cell)
+                    else:
+                        still.append(cell)
+                pending = still
+            for cell in frontier:
+                for m in neighbors[cell]:
+                    if stamp[m] != gen:
+                        b = blocked[m]
+                        if b < t:
+                            stamp[m] = gen
+                            dist[m] = t
+                            reached.append(m)
+                        elif stamp[m] != waiting and b != BLOCKED:
+                            stamp[m] = waiting
+                            pending.append(m)
+            if reached:
+                count += len(reached)
+                depth = t
+            elif pending:
+                # 直接跳到最早空出的时刻
+                t = min(blocked[cell] for cell in pending)
+            frontier = reached
+        return count, depth
+
+    def area(self, start: Tuple[int, int], t0: int = 1, limit: Optional[int] = None) -> int:
+        """从 start 出发的可达格数"""
+        return self.fill(start, t0, limit)[0]
+
+    def distances(self, start: Tuple[int, int], t0: int = 0) -> np.ndarray:
+        """(N, N) 到达时间场，不可达为 -1"""
+        self.fill(start, t0)
+        gen = self._generation
+        stamp = np.array(self._stamp)
+        dist = np.array(self._dist)
+        return np.where(stamp == gen, dist, -1).reshape(self.board_size, self.board_size)
+
+    def territory(self, start1: Tuple[int, int], start2: Tuple[int, int],
+                  t0: int = 0) -> Tuple[int, int, int]:
+        """
+        两个起点同时逐层扩展（Voronoi 划分）：严格先到达的一方占有该格，
+        同时到达（或只能经由争夺格到达）的记为争夺格。静态障碍下等价于按两个
+        距离场逐格比较；考虑尾巴时先被一方占有的格子不再让另一方通过，是近似
+
+        Returns:
+            (起点1 占有的格数, 起点2 占有的格数, 争夺格数)，均不含起点本身
+        """
+        n = self.board_size
+        blocked, stamp, dist, neighbors = self._blocked, self._stamp, self._dist, self._neighbors
+        owner = self._owner
+        self._generation += 1
+        gen = self._generation
+        s1 = start1[0] * n + start1[1]
+        s2 = start2[0] * n + start2[1]
+        stamp[s1] = stamp[s2] = gen
+        dist[s1] = dist[s2] = t0
+        frontiers = [None, [s1], [s2], []]
+        counts = [0, 0, 0, 0]
+        t = t0
+        while frontiers[1] or frontiers[2] or frontiers[3]:
+            t += 1
+            reached = [None, [], [], []]
+            for mark in (1, 2, 3):
+                found = reached[mark]
+                for cell in frontiers[mark]:
+                    for m in neighbors[cell]:
+                        if stamp[m] != gen:
+                            if blocked[m] < t:
+                                stamp[m] = gen
+                                dist[m] = t
+                                owner[m] = mark
+                                found.append(m)
+                        elif dist[m] == t and owner[m] != mark:
+                            owner[m] = 3  # 同一层被不同一方到达
+            contested = reached[3]
+            for mark in (1, 2):
+                keep = []
+                for m in reached[mark]:
+                    (keep if owner[m] == mark else contested).append(m)
+                frontiers[mark] = keep
+                counts[mark] += len(keep)
+            frontiers[3] = contested
+            counts[3] += len(contested)
+        return counts[1], counts[2], counts[3]
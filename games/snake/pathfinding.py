@@ -0,0 +1,136 @@
+"""
+贪吃蛇寻路：在 FloodFill 的占用时间上做 A*
+g 值与父指针保存在按棋盘大小预分配的数组中，用代数戳区分本次搜索，
+调用之间无需清零；路径只在找到目标后沿父指针回溯一次。
+支持多目标：启发值取到所有目标的最小曼哈顿距离，一次搜索找到最近的可达目标。
+PathCache 在 tick 之间保存规划好的路径，每个 tick 只做 O(1) 的增量校验。
+"""
+
+from collections import deque
+from heapq import heappush, heappop
+from typing import Iterable, List, Optional, Tuple
+
+from games.snake.flood_fill import FloodFill
+from games.snake.snake_game import FOOD
+
+
+class PathFinder(FloodFill):
+    """FloodFill + A* 寻路，prepare(game) 之后两者共用同一份占用时间"""
+
+    def __init__(self, board_size: int):
+        super().__init__(board_size)
+        n = board_size
+        self._g = [0] * (n * n)
+        self._parent = [0] * (n * n)
+        self._closed = [0] * (n * n)
+        self._goal_stamp = [0] * (n * n)
+
+    def find_path(self, start: Tuple[int, int], goals: Iterable[Tuple[int, int]],
+                  t0: int = 0) -> Optional[List[Tuple[int, int]]]:
+        """
+        从 start 到最近一个可达目标的最短路径（蛇不能原地等待，第 k 步在第 t0 + k 个 tick 到达）
+
+        Args:
+            start: 起点（通常是蛇头，本身不检查是否可通行）
+            goals: 一个或多个目标格
+
+        Returns:
+            [start, ..., goal]；没有可达目标时返回 None
+        """
+        n = self.board_size
+        blocked, stamp, g, parent = self._blocked, self._stamp, self._g, self._parent
+        closed, goal_stamp, neighbors = self._closed, self._goal_stamp, self._neighbors
+        self._generation += 1
+        gen = self._generation
+
+        targets = []
+        for x, y in goals:
+            if 0 <= x < n and 0 <= y < n:
+                goal_stamp[x * n + y] = gen
+                targets.append((x, y))
+        if not targets:
+            return None
+
+        def heuristic(cell):
+            x, y = divmod(cell, n)
+            return min(abs(x - tx) + abs(y - ty) for tx, ty in targets)
+
+        s = start[0] * n + start[1]
+        stamp[s] = gen
+        g[s] = 0
+        parent[s] = -1
+        h = heuristic(s)
+        heap = [(h, h, s)]
+        while heap:
+            _, _, cell = heappop(heap)
+            if closed[cell] == gen:
+                continue
+            closed[cell] = gen
+            if goal_stamp[cell] == gen:
+                path = []
+                while cell >= 0:
+                    path.append(divmod(cell, n))
+                    cell = parent[cell]
+                path.reverse()
+                return path
+            step = g[cell] + 1
+            arrive = t0 + step
+            for m in neighbors[cell]:
+                if blocked[m] >= arrive or closed[m] == gen:
+                    continue
+                if stamp[m] != gen or step < g[m]:
+                    stamp[m] = gen
+                    g[m] = step
+                    parent[m] = cell
+                    h = heuristic(m)
+                    heappush(heap, (step + h, h, m))
+        return None
+
+
+class PathCache:
+    """
+    跨 tick 缓存到食物的路径
+    规划时的占用时间每过一个 tick 整体减一，与路径上剩余步数同步减少，
+    所以只要没有蛇变长或死亡，路径仍然有效的条件就只剩：新蛇头没有落在剩余路径上。
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self._cells = deque()
+        self._members = set()
+        self._lengths = None
+
+    def store(self, path: List[Tuple[int, int]], game):
+        """保存 find_path 的结果（path[0] 为当前蛇头）"""
+        self._cells = deque(path[1:])
+        self._members = set(self._cells)
+        self._lengths = self._signature(game)
+
+    @staticmethod
+    def _signature(game) -> Tuple:
+        return len(game.snake1), len(game.snake2), game.alive1, game.alive2
+
+    def next_cell(self, game, head: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """
+        校验缓存路径并返回下一步要进入的格子；路径失效时清空并返回 None
+
+        Args:
+            head: 自己当前的蛇头，应当是上一 tick 计划进入的格子
+        """
+        cells = self._cells
+        if not cells:
+            return None
+        if cells[0] != head:
+            self.clear()  # 没有按计划移动（新的一局、动作被拒绝等）
+            return None
+        self._members.discard(cells.popleft())
+        if (not cells
+                or self._signature(game) != self._lengths
+                or not game.grid[cells[-1]] & FOOD
+                or game.snake1[0] in self._members
+                or game.snake2[0] in self._members):
+            self.clear()
+            return None
+        return cells[0]
@@ -15,8 +15,15 @@ class SnakeEnv(BaseEnv):
     def __init__(self, board_size=20, **kwargs):
         self.board_size = board_size
         self.game = SnakeGame(board_size)
+        self._pending_action = None
+        self._reward1 = 0.0  # 上一个 tick 蛇1 的奖励，在玩家1 下一次 step 时返回
         super().__init__(self.game)
 
+    def reset(self):
+        self._pending_action = None
+        self._reward1 = 0.0
+        return super().reset()
+
     def _setup_spaces(self):
         """设置观察空间和动作空间"""
         self.observation_space = None
@@ -31,6 +38,40 @@ class SnakeEnv(BaseEnv):
         # 贪吃蛇所有方向都可能有效，但要避免直接掉头
         return np.ones(4, dtype=bool)  # [up, down, left, right]
 
+    def step(self, action):
+        """
+        回合制接口：玩家1 的动作先缓存，轮到玩家2 时两条蛇同时前进一个 tick
+        玩家2 的 step 返回蛇2 的奖励，info['rewards'] 为 (蛇1, 蛇2)；蛇1 的奖励另在玩家1
+        下一次 step 时返回（对局在该 tick 结束时只能从 info 取得）
+
+        Returns:
+            observation, 当前玩家的奖励, terminated, truncated, info
+        """
+        player = self.game.current_player
+        if action not in self.game.get_valid_actions(player):
+            return self._get_observation(), -1000, True, False, {'error': 'Invalid action'}
+        if player == 1:
+            self._pending_action = action
+            self.game.switch_player()
+            reward, self._reward1 = self._reward1, 0.0
+            return self._get_observation(), reward, False, False, {}
+        observation, rewards, terminated, truncated, info = self.step_joint(self._pending_action, action)
+        self.game.switch_player()
+        self._reward1 = rewards[0]
+        info['rewards'] = rewards
+        return observation, rewards[1], terminated, truncated, info
+
+    def step_joint(self, action1, action2):
+        """
+        两条蛇同时前进一个 tick（None 表示沿用已缓存的方向）
+
+        Returns:
+            observation, (蛇1 奖励, 蛇2 奖励), terminated, truncated, info
+        """
+        _, rewards, done, info = self.game.step_joint(action1, action2)
+        self.game.update_game_state()
+        return self._get_observation(), rewards, done, self.game.is_timeout(), info
+
     def get_valid_actions(self):
         """获取有效动作"""
         return self.game.get_valid_actions()
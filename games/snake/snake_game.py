@@ -4,15 +4,108 @@
 
 import numpy as np
 import random
+from collections import deque
+from collections.abc import Mapping
 from typing import Dict, List, Tuple, Any, Optional
 from ..base_game import BaseGame
+from ..rng import MASK64, splitmix64
 import config
 
+# 占用网格的位标记：蛇1 / 蛇2 的身体（含头）以及食物
+EMPTY = 0
+SNAKE1 = 1
+SNAKE2 = 2
+FOOD = 4
+
+_STATE_KEYS = ('board', 'snake1', 'snake2', 'foods', 'direction1', 'direction2',
+               'alive1', 'alive2', 'current_player', 'valid_actions', 'game_state', 'move_count')
+
+
+class SnakeState(Mapping):
+    """
+    get_state() 返回的只读状态视图
+    标量字段在创建时记录；棋盘、蛇身、食物等在首次访问时才生成并缓存，
+    蛇身与食物以元组给出，棋盘为只读数组。游戏进入下一 tick 前会调用 _detach，
+    把尚未生成的字段固定下来，旧视图因此不会看到之后的状态。
+    """
+
+    __slots__ = ('_game', '_values', '_grid', '_scalars')
+
+    def __init__(self, game: 'SnakeGame', scalars: Tuple):
+        self._game = game
+        self._grid = None
+        self._scalars = scalars
+        (direction1, direction2, alive1, alive2,
+         current_player, game_state, move_count) = scalars
+        self._values = {
+            'direction1': direction1, 'direction2': direction2,
+            'alive1': alive1, 'alive2': alive2,
+            'current_player': current_player,
+            'game_state': game_state, 'move_count': move_count,
+        }
+
+    def __getitem__(self, key):
+        values = self._values
+        if key in values:
+            return values[key]
+        if key == 'board':
+            if self._game is not None:
+                value = self._game._render_board()
+            else:
+                value = _render_grid(self._grid, values['snake1'], values['snake2'])
+            value.setflags(write=False)
+        elif key in ('snake1', 'snake2', 'foods'):
+            value = tuple(getattr(self._game, key))
+        elif key == 'valid_actions':
+            direction = values['direction1'] if values['current_player'] == 1 else values['direction2']
+            value = [d for d in _DIRECTIONS if d != (-direction[0], -direction[1])]
+        else:
+            raise KeyError(key)
+        values[key] = value
+        return value
+
+    def __iter__(self):
+        return iter(_STATE_KEYS)
+
+    def __len__(self) -> int:
+        return len(_STATE_KEYS)
+
+    def __repr__(self) -> str:
+        return f"SnakeState({dict(self)!r})"
+
+    def _detach(self):
+        """游戏状态即将改变：固定蛇身与食物，保留网格副本以便之后仍能渲染棋盘"""
+        game = self._game
+        values = self._values
+        for key in ('snake1', 'snake2', 'foods'):
+            if key not in values:
+                values[key] = tuple(getattr(game, key))
+        if 'board' not in values:
+            self._grid = game.grid.copy()
+        self._game = None
+
+
+_DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+def _render_grid(grid: np.ndarray, snake1, snake2) -> np.ndarray:
+    """由占用网格生成棋盘：蛇1 头/身 1/2，蛇2 头/身 3/4，食物 5"""
+    board = np.zeros(grid.shape, dtype=int)
+    board[(grid & SNAKE1) != 0] = 2
+    if snake1:
+        board[snake1[0]] = 1
+    board[(grid & SNAKE2) != 0] = 4
+    if snake2:
+        board[snake2[0]] = 3
+    board[(grid & FOOD) != 0] = 5
+    return board
+
 
 class SnakeGame(BaseGame):
     """双人贪吃蛇游戏"""
 
-    def __init__(self, board_size: int = 20, initial_length: int = 3, food_count: int = 5):
+    def __init__(self, board_size: int = 20, initial_length: int = 3, food_count: int = 5,
+                 seed: Optional[int] = None):
         game_config = {
             'board_size': board_size,
             'initial_length': initial_length,
@@ -23,11 +116,13 @@ class SnakeGame(BaseGame):
         self.board_size = board_size
         self.food_count = food_count
         self.initial_length = initial_length
+        # 食物生成使用独立的随机数状态，指定 seed 时食物序列可复现
+        self.seed(seed)
         super().__init__(game_config)
 
-        # 蛇的位置和方向
-        self.snake1 = []
-        self.snake2 = []
+        # 蛇的位置和方向（deque，头在左端）
+        self.snake1 = deque()
+        self.snake2 = deque()
         self.direction1 = (0, 1)   # 玩家1 当前方向
         self.direction2 = (0, -1)  # 玩家2 当前方向
 
@@ -42,7 +137,8 @@ class SnakeGame(BaseGame):
         self.next_dir2  = self.direction2   # 玩家2 的“待转向”
         self.tick_speed = 6                # 每秒 6 步，可调
 
-        
+        # BaseGame.__init__ 已经 reset 过一次，重新播种使 seed 对应最终开局的食物序列
+        self.seed(seed)
         self.reset()
 
     # ------------------------------------------------------------------
@@ -70,41 +166,178 @@ class SnakeGame(BaseGame):
         self._move_snake_body(self.snake2, self.direction2, 2)
 
     def _move_snake_body(self, snake, direction, player):
-        """移动核心逻辑，与 _move_snake 相似"""
-        head = snake[0]
-        new_head = (head[0] + direction[0], head[1] + direction[1])
+        """实时版移动：可以进入对方蛇头所在格（跳过对方头部）"""
+        self._advance(player, direction, allow_other_head=True)
+
+    def _advance(self, player: int, direction: Tuple[int, int], allow_other_head: bool = False):
+        """
+        按方向推进一条蛇，所有碰撞与食物判断都查占用网格，O(1)
+
+        Args:
+            player: 1 或 2
+            direction: (dx, dy)
+            allow_other_head: 为 True 时进入对方蛇头所在格不算碰撞
+        """
+        self._invalidate_state()
+        target = self._target(player, direction)
 
         # 边界
-        if not (0 <= new_head[0] < self.board_size and 0 <= new_head[1] < self.board_size):
-            if player == 1:
-                self.alive1 = False
-            else:
-                self.alive2 = False
+        if target is None:
+            self._kill_player(player)
             return
 
-        # 自撞
-        if new_head in snake:
-            if player == 1:
-                self.alive1 = False
-            else:
-                self.alive2 = False
+        x, y = target
+        cell = int(self.grid[x, y])
+        # 自撞（尾巴此时尚未移走，同样算碰撞）
+        if cell & player:
+            self._kill_player(player)
             return
+        # 对方身体
+        if cell & (3 - player):
+            other = self.snake2 if player == 1 else self.snake1
+            if not (allow_other_head and other[0] == (x, y)):
+                self._kill_player(player)
+                return
+
+        self._place_head(player, x, y)
+
+    def _target(self, player: int, direction: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """蛇头沿 direction 前进一格后的坐标，越界时返回 None"""
+        head = (self.snake1 if player == 1 else self.snake2)[0]
+        x, y = head[0] + direction[0], head[1] + direction[1]
+        if not (0 <= x < self.board_size and 0 <= y < self.board_size):
+            return None
+        return x, y
+
+    def _place_head(self, player: int, x: int, y: int, refill: bool = True) -> bool:
+        """
+        把蛇头推进到 (x, y) 并处理吃食物/移尾（调用方已完成碰撞判断），返回是否吃到食物
+
+        Args:
+            refill: 吃到食物后是否立即补充（step_joint 在两条蛇都推进后统一补充）
+        """
+        snake = self.snake1 if player == 1 else self.snake2
+        cell = int(self.grid[x, y])
+        new_head = (x, y)
+        snake.appendleft(new_head)
+        if cell == EMPTY:
+            self._take_free_cell(x * self.board_size + y)
+        if cell & FOOD:
+            self.grid[x, y] = (cell & ~FOOD) | player
+            self.foods.remove(new_head)
+            if refill:
+                self._generate_foods()
+            return True
+        self.grid[x, y] = cell | player
+        tx, ty = snake.pop()
+        self.grid[tx, ty] &= ~player
+        if self.grid[tx, ty] == EMPTY:
+            self._release_free_cell(tx * self.board_size + ty)
+        return False
+
+    def step_joint(self, action1: Optional[Tuple[int, int]] = None,
+                   action2: Optional[Tuple[int, int]] = None) -> Tuple[SnakeState, Tuple[float, float], bool, Dict[str, Any]]:
+        """
+        两条蛇同时前进一个 tick
 
-        # 对方身体（跳过头部，允许头碰头同时死亡）
-        other = self.snake2 if player == 1 else self.snake1
-        if new_head in other[1:]:
+        规则：
+            1. 动作先经过 set_next_direction（掉头被忽略，None 表示沿用已缓存的方向）
+            2. 按 tick 开始时的局面判定：越界、撞到任意蛇身（含双方蛇头与尚未移走的尾巴）即死亡
+            3. 两个蛇头进入同一格时较短的蛇死亡，等长则同归于尽
+            4. 存活的蛇推进（吃食物、移尾），两条蛇都推进后再统一补充食物，
+               新食物不会在同一 tick 内被另一条蛇吃到
+
+        Returns:
+            observation, (蛇1 奖励, 蛇2 奖励), done, info
+        """
+        self._invalidate_state()
+        actions = {1: action1, 2: action2}
+        targets = {}
+        for player in (1, 2):
+            if not (self.alive1 if player == 1 else self.alive2):
+                continue
+            if actions[player] is not None:
+                self.set_next_direction(player, actions[player])
             if player == 1:
-                self.alive1 = False
+                self.direction1 = direction = self.next_dir1
             else:
-                self.alive2 = False
-            return
+                self.direction2 = direction = self.next_dir2
+            target = self._target(player, direction)
+            if target is None or self.grid[target] & (SNAKE1 | SNAKE2):
+                self._kill_player(player)
+            else:
+                targets[player] = target
 
-        snake.insert(0, new_head)
-        if new_head in self.foods:
-            self.foods.remove(new_head)
+        # 头对头
+        if len(targets) == 2 and targets[1] == targets[2]:
+            len1, len2 = len(self.snake1), len(self.snake2)
+            if len1 <= len2:
+                self._kill_player(1)
+                del targets[1]
+            if len2 <= len1:
+                self._kill_player(2)
+                del targets[2]
+
+        ate = False
+        for player in (1, 2):
+            if player in targets:
+                ate |= self._place_head(player, *targets[player], refill=False)
+        if ate:
             self._generate_foods()
-        else:
-            snake.pop()
+        self.move_count += 1
+
+        done = self._check_game_over()
+        rewards = (self._calculate_reward(1), self._calculate_reward(2))
+        info = {
+            'snake1_length': len(self.snake1),
+            'snake2_length': len(self.snake2),
+            'food_count': len(self.foods),
+            'alive1': self.alive1,
+            'alive2': self.alive2
+        }
+        return self.get_state(), rewards, done, info
+
+    # ------------------------------------------------------------------
+    # 空闲格池：数组 + 位置索引，交换删除，取/还/随机抽取均为 O(1)
+    # ------------------------------------------------------------------
+    def _reset_free_cells(self):
+        """按占用网格重建空闲格池"""
+        free = np.flatnonzero(self.grid.ravel() == EMPTY)
+        self._free_count = len(free)
+        self._free_cells[:self._free_count] = free
+        self._free_index.fill(-1)
+        self._free_index[free] = np.arange(self._free_count)
+
+    def _take_free_cell(self, cell: int):
+        """从池中移除格子（cell 为展平下标）"""
+        i = self._free_index[cell]
+        last = self._free_count - 1
+        last_cell = self._free_cells[last]
+        self._free_cells[i] = last_cell
+        self._free_index[last_cell] = i
+        self._free_index[cell] = -1
+        self._free_count = last
+
+    def _release_free_cell(self, cell: int):
+        """把格子放回池中"""
+        self._free_cells[self._free_count] = cell
+        self._free_index[cell] = self._free_count
+        self._free_count += 1
+
+    # ------------------------------------------------------------------
+    # 状态缓存：get_state() 在同一 tick 内返回同一个惰性视图
+    # ------------------------------------------------------------------
+    def _invalidate_state(self):
+        """蛇身/食物/网格即将改变"""
+        state = self._state
+        if state is not None:
+            state._detach()
+            self._state = None
+
+    @property
+    def board(self) -> np.ndarray:
+        """只读棋盘（与 get_state()['board'] 相同）"""
+        return self.get_state()['board']
 
     def is_game_over(self) -> bool:
         """实时判断"""
@@ -112,6 +345,10 @@ class SnakeGame(BaseGame):
     
 
     # ===== 4. 小工具：标记死亡 ========================================
+    def seed(self, seed: Optional[int] = None):
+        """重新设置食物随机数种子（None 时从全局 random 取种子）"""
+        self.rng_state = (random.getrandbits(64) if seed is None else seed) & MASK64
+
     def _kill_player(self, player: int):
         if player == 1:
             self.alive1 = False
@@ -120,15 +357,25 @@ class SnakeGame(BaseGame):
     
     def reset(self) -> Dict[str, Any]:
         """重置游戏状态"""
+        if getattr(self, '_state', None) is not None:  # BaseGame.__init__ 首次调用时尚未创建
+            self._invalidate_state()
+        self._state = None
         # 初始化蛇的位置
-        self.board = np.zeros((self.board_size, self.board_size), dtype=int)
+        self.grid = np.zeros((self.board_size, self.board_size), dtype=np.int8)
         center = self.board_size // 2
-        self.snake1 = [(center, center - 2)]
-        self.snake2 = [(center, center + 2)]
+        self.snake1 = deque([(center, center - 2)])
+        self.snake2 = deque([(center, center + 2)])
+        self.grid[self.snake1[0]] = SNAKE1
+        self.grid[self.snake2[0]] = SNAKE2
+        self._free_cells = np.empty(self.board_size * self.board_size, dtype=np.int32)
+        self._free_index = np.empty(self.board_size * self.board_size, dtype=np.int32)
+        self._reset_free_cells()
         
         # 初始化方向
         self.direction1 = (0, 1)  # 向右
         self.direction2 = (0, -1)  # 向左
+        self.next_dir1 = self.direction1
+        self.next_dir2 = self.direction2
         
         # 初始化食物
         self.foods = []
@@ -228,62 +475,73 @@ class SnakeGame(BaseGame):
         else:
             return None  # 平局
     
-    def get_state(self) -> Dict[str, Any]:
-        """获取当前游戏状态"""
-        # 创建棋盘
-        board = np.zeros((self.board_size, self.board_size), dtype=int)
-        
-        # 绘制蛇1
-        for i, (x, y) in enumerate(self.snake1):
-            if 0 <= x < self.board_size and 0 <= y < self.board_size:
-                board[x, y] = 1 if i == 0 else 2  # 头部为1，身体为2
-        
-        # 绘制蛇2
-        for i, (x, y) in enumerate(self.snake2):
-            if 0 <= x < self.board_size and 0 <= y < self.board_size:
-                board[x, y] = 3 if i == 0 else 4  # 头部为3，身体为4
-        
-        # 绘制食物
-        for x, y in self.foods:
-            if 0 <= x < self.board_size and 0 <= y < self.board_size:
-                board[x, y] = 5
-        
-        return {
-            'board': board,
-            'snake1': self.snake1.copy(),
-            'snake2': self.snake2.copy(),
-            'foods': self.foods.copy(),
-            'direction1': self.direction1,
-            'direction2': self.direction2,
-            'alive1': self.alive1,
-            'alive2': self.alive2,
-            'current_player': self.current_player,
-            'valid_actions': self.get_valid_actions(),
-            'game_state': self.game_state,
-            'move_count': self.move_count
-        }
+    def get_state(self) -> SnakeState:
+        """获取当前游戏状态（惰性只读视图，同一 tick 内重复调用返回同一对象）"""
+        scalars = (self.direction1, self.direction2, self.alive1, self.alive2,
+                   self.current_player, self.game_state, self.move_count)
+        state = self._state
+        if state is None or state._scalars != scalars:
+            if state is not None:
+                state._detach()
+            state = self._state = SnakeState(self, scalars)
+        return state
+    
+    def _render_board(self) -> np.ndarray:
+        """由占用网格生成棋盘：蛇1 头/身 1/2，蛇2 头/身 3/4，食物 5"""
+        return _render_grid(self.grid, self.snake1, self.snake2)
     
     def render(self) -> np.ndarray:
         """渲染游戏画面"""
-        state = self.get_state()
-        return state['board']
+        return self._render_board()
     
     def clone(self) -> 'SnakeGame':
-        """克隆游戏状态"""
-        cloned_game = SnakeGame(self.board_size, self.initial_length, self.food_count)
+        """克隆游戏状态（不经过构造函数，避免重新 reset / 生成食物）"""
+        cloned_game = SnakeGame.__new__(SnakeGame)
+        cloned_game.__dict__.update(self.__dict__)
         cloned_game.snake1 = self.snake1.copy()
         cloned_game.snake2 = self.snake2.copy()
-        cloned_game.direction1 = self.direction1
-        cloned_game.direction2 = self.direction2
         cloned_game.foods = self.foods.copy()
-        cloned_game.alive1 = self.alive1
-        cloned_game.alive2 = self.alive2
-        cloned_game.current_player = self.current_player
-        cloned_game.game_state = self.game_state
-        cloned_game.move_count = self.move_count
+        cloned_game.grid = self.grid.copy()
+        cloned_game._free_cells = self._free_cells.copy()
+        cloned_game._free_index = self._free_index.copy()
         cloned_game.history = self.history.copy()
+        cloned_game._state = None
         return cloned_game
     
+    def snapshot(self) -> Tuple:
+        """获取不可变状态快照"""
+        return (
+            tuple(self.snake1), tuple(self.snake2), tuple(self.foods),
+            self.direction1, self.direction2,
+            self.next_dir1, self.next_dir2,
+            self.alive1, self.alive2,
+            self.current_player, self.game_state, self.move_count,
+            self.grid.tobytes(), self._free_cells[:self._free_count].tobytes(),
+            self.rng_state,
+        )
+    
+    def restore(self, snapshot: Tuple) -> None:
+        """从快照原地恢复状态"""
+        self._invalidate_state()
+        (snake1, snake2, foods,
+         self.direction1, self.direction2,
+         self.next_dir1, self.next_dir2,
+         self.alive1, self.alive2,
+         self.current_player, self.game_state, self.move_count, grid, free,
+         self.rng_state) = snapshot
+        self.snake1.clear()
+        self.snake1.extend(snake1)
+        self.snake2.clear()
+        self.snake2.extend(snake2)
+        self.foods[:] = foods
+        np.copyto(self.grid, np.frombuffer(grid, dtype=np.int8).reshape(self.grid.shape))
+        # 按快照中的顺序恢复空闲格池，保证之后的食物序列与快照时一致
+        free = np.frombuffer(free, dtype=np.int32)
+        self._free_count = len(free)
+        self._free_cells[:self._free_count] = free
+        self._free_index.fill(-1)
+        self._free_index[free] = np.arange(self._free_count)
+    
     def get_action_space(self):
         """获取动作空间"""
         return [(-1, 0), (1, 0), (0, -1), (0, 1)]
@@ -298,77 +556,32 @@ class SnakeGame(BaseGame):
         }
     
     def _move_snake(self, player: int):
-        """移动蛇"""
-        if player == 1:
-            snake = self.snake1
-            direction = self.direction1
-            alive = self.alive1
-        else:
-            snake = self.snake2
-            direction = self.direction2
-            alive = self.alive2
-        
+        """移动蛇（回合制版本：对方蛇头同样算作障碍）"""
+        alive = self.alive1 if player == 1 else self.alive2
         if not alive:
             return
-        
-        # 计算新头部位置
-        head = snake[0]
-        new_head = (head[0] + direction[0], head[1] + direction[1])
-        
-        # 检查边界碰撞
-        if (new_head[0] < 0 or new_head[0] >= self.board_size or
-            new_head[1] < 0 or new_head[1] >= self.board_size):
-            if player == 1:
-                self.alive1 = False
-            else:
-                self.alive2 = False
-            return
-        
-        # 检查自身碰撞
-        if new_head in snake:
-            if player == 1:
-                self.alive1 = False
-            else:
-                self.alive2 = False
-            return
-        
-        # 检查与对方蛇的碰撞
-        other_snake = self.snake2 if player == 1 else self.snake1
-        if new_head in other_snake:
-            if player == 1:
-                self.alive1 = False
-            else:
-                self.alive2 = False
-            return
-        
-        # 移动蛇
-        snake.insert(0, new_head)
-        
-        # 检查是否吃到食物
-        if new_head in self.foods:
-            self.foods.remove(new_head)
-            self._generate_foods()
-        else:
-            snake.pop()
+        direction = self.direction1 if player == 1 else self.direction2
+        self._advance(player, direction)
     
     def _generate_foods(self):
-        """生成食物"""
-        while len(self.foods) < self.food_count:
-            x = random.randint(0, self.board_size - 1)
-            y = random.randint(0, self.board_size - 1)
-            pos = (x, y)
-            
-            # 确保食物不在蛇身上
-            if pos not in self.snake1 and pos not in self.snake2 and pos not in self.foods:
-                self.foods.append(pos)
+        """生成食物：从空闲格池中均匀抽取，棋盘填满时停止"""
+        while len(self.foods) < self.food_count and self._free_count > 0:
+            self.rng_state, r = splitmix64(self.rng_state)
+            cell = int(self._free_cells[r % self._free_count])
+            self._take_free_cell(cell)
+            x, y = divmod(cell, self.board_size)
+            self.grid[x, y] = FOOD
+            self.foods.append((x, y))
     
     def _check_game_over(self) -> bool:
         """检查游戏是否结束"""
         return not (self.alive1 or self.alive2)
     
-    def _calculate_reward(self) -> float:
-        """计算奖励"""
-        if self.current_player == 1:
+    def _calculate_reward(self, player: int = None) -> float:
+        """计算奖励（默认针对当前玩家）"""
+        if player is None:
+            player = self.current_player
+        if player == 1:
             if not self.alive1:
                 return -1.0
             elif not self.alive2:
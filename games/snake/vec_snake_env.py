@@ -0,0 +1,294 @@
+"""
+批量贪吃蛇环境
+同时模拟 B 局双蛇对战，所有状态保存在 numpy 数组中：
+    grid        (B, N, N) int8 占用网格，位标记与 SnakeGame 相同
+    body        (B, 2, N*N) int32 环形缓冲区，保存蛇身格子的展平下标
+    head/length (B, 2) 蛇头在缓冲区中的位置与蛇长
+    free_*      每局的空闲格池，交换删除顺序与 SnakeGame 完全一致
+每个 tick 的语义与 SnakeGame.step_joint 相同：两条蛇同时判定碰撞，
+头对头时较短者死亡，存活的蛇按蛇1、蛇2 的顺序推进；两条蛇都死亡时自动重置该局。
+食物使用同一 SplitMix64 随机数，相同种子下与 SnakeGame 逐格一致。
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from games.rng import splitmix64_array
+from games.snake.snake_game import EMPTY, SNAKE1, SNAKE2, FOOD
+
+# 与 SnakeGame.get_action_space() 顺序一致
+DIRECTIONS = np.array([(-1, 0), (1, 0), (0, -1), (0, 1)], dtype=np.int64)
+# 每个方向的反方向下标
+OPPOSITE = np.array([1, 0, 3, 2], dtype=np.int64)
+
+class VecSnakeEnv:
+    """批量双人贪吃蛇环境"""
+
+    def __init__(self, num_envs: int, board_size: int = 20, initial_length: int = 3,
+                 food_count: int = 5, seed: Union[int, Sequence[int], None] = None,
+                 max_steps: Optional[int] = None):
+        """
+        Args:
+            num_envs: 并行的局数 B
+            seed: 整数时第 b 局使用 seed + b；也可以直接给出每局的种子
+            max_steps: 单局最多 tick 数，超过时截断并重置（None 表示不限）
+        """
+        self.num_envs = num_envs
+        self.board_size = board_size
+        self.initial_length = initial_length
+        self.food_count = food_count
+        self.max_steps = max_steps
+
+        B, n = num_envs, board_size
+        cells = n * n
+        self.grid = np.zeros((B, n, n), dtype=np.int8)
+        self.body = np.zeros((B, 2, cells), dtype=np.int32)
+        self.head = np.zeros((B, 2), dtype=np.int64)
+        self.length = np.zeros((B, 2), dtype=np.int64)
+        self.direction = np.zeros((B, 2), dtype=np.int64)
+        self.alive = np.zeros((B, 2), dtype=bool)
+        self.food_num = np.zeros(B, dtype=np.int64)
+        self.steps = np.zeros(B, dtype=np.int64)
+        self.free_cells = np.zeros((B, cells), dtype=np.int32)
+        self.free_index = np.zeros((B, cells), dtype=np.int32)
+        self.free_count = np.zeros(B, dtype=np.int64)
+        self.rng_state = np.zeros(B, dtype=np.uint64)
+
+        self.seed(seed)
+        self._reset_envs(np.arange(B))
+
+    # ------------------------------------------------------------------
+    # 对外接口
+    # ------------------------------------------------------------------
+    def seed(self, seed: Union[int, Sequence[int], None] = None):
+        """设置每局的食物随机数种子"""
+        if seed is None:
+            seeds = np.random.randint(0, 2**63, size=self.num_envs, dtype=np.int64).astype(np.uint64)
+        elif np.isscalar(seed):
+            seeds = np.array([(int(seed) + b) & 0xFFFFFFFFFFFFFFFF for b in range(self.num_envs)],
+                             dtype=np.uint64)
+        else:
+            seeds = np.array([int(s) & 0xFFFFFFFFFFFFFFFF for s in seed], dtype=np.uint64)
+            if len(seeds) != self.num_envs:
+                raise ValueError("种子数量必须等于 num_envs")
+        self.rng_state[:] = seeds
+
+    def reset(self) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """重置所有对局"""
+        self._reset_envs(np.arange(self.num_envs))
+        return self._get_observation(), {}
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray,
+                                                 np.ndarray, Dict[str, Any]]:
+        """
+        所有对局同时前进一个 tick
+
+        Args:
+            actions: (B, 2) 方向下标（0 上 1 下 2 左 3 右），第二维为玩家 1/2
+
+        Returns:
+            observation: (B, N, N) 棋盘，编码与 SnakeGame.board 相同
+            rewards: (B, 2) float32，与 SnakeGame._calculate_reward 相同（-1 自己死亡，+1 对方死亡）
+            terminated: (B,) 两条蛇都已死亡
+            truncated: (B,) 达到 max_steps
+            info: winner (B,)（0 为平局，仅在结束时有意义）、lengths (B, 2)，
+                  以及结束对局重置前的 final_observation
+        """
+        actions = np.asarray(actions, dtype=np.int64).reshape(self.num_envs, 2)
+        self._tick(actions)
+        self.steps += 1
+
+        dead = ~self.alive
+        rewards = np.where(dead, -1.0, np.where(dead[:, ::-1], 1.0, 0.0)).astype(np.float32)
+        terminated = dead.all(axis=1)
+        truncated = np.zeros(self.num_envs, dtype=bool)
+        if self.max_steps is not None:
+            truncated = ~terminated & (self.steps >= self.max_steps)
+
+        winner = np.where(self.alive[:, 0] & dead[:, 1], 1,
+                          np.where(self.alive[:, 1] & dead[:, 0], 2, 0)).astype(np.int8)
+        info = {'winner': winner, 'lengths': self.length.copy()}
+        done = np.flatnonzero(terminated | truncated)
+        if len(done):
+            info['final_observation'] = self._get_observation()[done]
+            info['done_envs'] = done
+            self._reset_envs(done)
+        return self._get_observation(), rewards, terminated, truncated, info
+
+    def get_snake(self, env: int, player: int) -> List[Tuple[int, int]]:
+        """第 env 局玩家 player 的蛇身坐标（头在前），便于与 SnakeGame 对照"""
+        p = player - 1
+        cap = self.body.shape[2]
+        idx = (self.head[env, p] + np.arange(self.length[env, p])) % cap
+        return [divmod(int(c), self.board_size) for c in self.body[env, p, idx]]
+
+    def get_action_mask(self) -> np.ndarray:
+        """(B, 2, 4) 动作掩码：禁止掉头"""
+        mask = np.ones((self.num_envs, 2, 4), dtype=bool)
+        b, p = np.indices((self.num_envs, 2))
+        mask[b, p, OPPOSITE[self.direction]] = False
+        return mask
+
+    # ------------------------------------------------------------------
+    # 内部实现
+    # ------------------------------------------------------------------
+    def _get_observation(self) -> np.ndarray:
+        """渲染棋盘：蛇1 头/身 1/2，蛇2 头/身 3/4，食物 5"""
+        grid = self.grid
+        board = np.zeros(grid.shape, dtype=np.int8)
+        board[(grid & SNAKE1) != 0] = 2
+        flat = board.reshape(self.num_envs, -1)
+        envs = np.arange(self.num_envs)
+        flat[envs, self.body[envs, 0, self.head[:, 0]]] = 1
+        board[(grid & SNAKE2) != 0] = 4
+        flat[envs, self.body[envs, 1, self.head[:, 1]]] = 3
+        board[(grid & FOOD) != 0] = 5
+        return board
+
+    def _reset_envs(self, envs: np.ndarray):
+        """重置指定对局（与 SnakeGame.reset 相同）"""
+        if len(envs) == 0:
+            return
+        n = self.board_size
+        center = n // 2
+        self.grid[envs] = EMPTY
+        self.head[envs] = 0
+        self.length[envs] = 1
+        self.body[envs, 0, 0] = center * n + center - 2
+        self.body[envs, 1, 0] = center * n + center + 2
+        self.grid[envs, center, center - 2] = SNAKE1
+        self.grid[envs, center, center + 2] = SNAKE2
+        self.direction[envs, 0] = 3  # 向右
+        self.direction[envs, 1] = 2  # 向左
+        self.alive[envs] = True
+        self.steps[envs] = 0
+
+        # 空闲格池按下标升序重建
+        flat = self.grid[envs].reshape(len(envs), -1)
+        free = flat == EMPTY
+        self.free_count[envs] = free.sum(axis=1)
+        order = np.argsort(~free, axis=1, kind='stable').astype(np.int32)
+        self.free_cells[envs] = order
+        index = np.empty_like(order)
+        np.put_along_axis(index, order, np.arange(order.shape[1], dtype=np.int32)[None, :], axis=1)
+        index[~free] = -1
+        self.free_index[envs] = index
+
+        self.food_num[envs] = 0
+        self._generate_foods(envs)
+
+    def _take_free_cell(self, envs: np.ndarray, cells: np.ndarray):
+        """每局从池中移除一个格子（envs 互不相同）"""
+        i = self.free_index[envs, cells]
+        last = self.free_count[envs] - 1
+        last_cells = self.free_cells[envs, last]
+        self.free_cells[envs, i] = last_cells
+        self.free_index[envs, last_cells] = i
+        self.free_index[envs, cells] = -1
+        self.free_count[envs] = last
+
+    def _release_free_cell(self, envs: np.ndarray, cells: np.ndarray):
+        """每局把一个格子放回池中"""
+        count = self.free_count[envs]
+        self.free_cells[envs, count] = cells
+        self.free_index[envs, cells] = count
+        self.free_count[envs] = count + 1
+
+    def _generate_foods(self, envs: np.ndarray):
+        """补充食物，直到数量足够或没有空格"""
+        n = self.board_size
+        while True:
+            envs = envs[(self.food_num[envs] < self.food_count) & (self.free_count[envs] > 0)]
+            if len(envs) == 0:
+                return
+            self.rng_state[envs], r = splitmix64_array(self.rng_state[envs])
+            slots = (r % self.free_count[envs].astype(np.uint64)).astype(np.int64)
+            cells = self.free_cells[envs, slots]
+            self._take_free_cell(envs, cells)
+            self.grid[envs, cells // n, cells % n] = FOOD
+            self.food_num[envs] += 1
+
+    def _tick(self, actions: np.ndarray):
+        """所有对局同时推进一个 tick（与 SnakeGame.step_joint 相同）"""
+        n = self.board_size
+        # 每局每条蛇的目标格，-1 表示不移动（已死亡或本 tick 撞死）
+        targets = np.full((self.num_envs, 2), -1, dtype=np.int64)
+        for p in (0, 1):
+            envs = np.flatnonzero(self.alive[:, p])
+            if len(envs) == 0:
+                continue
+            # set_next_direction：掉头的指令被忽略
+            acts = actions[envs, p]
+            current = self.direction[envs, p]
+            self.direction[envs, p] = np.where(acts == OPPOSITE[current], current, acts)
+
+            head_cell = self.body[envs, p, self.head[envs, p]].astype(np.int64)
+            delta = DIRECTIONS[self.direction[envs, p]]
+            x = head_cell // n + delta[:, 0]
+            y = head_cell % n + delta[:, 1]
+            inside = (x >= 0) & (x < n) & (y >= 0) & (y < n)
+            # 越界或撞到任意蛇身（按 tick 开始时的网格）
+            hit = ~inside
+            hit[inside] = (self.grid[envs[inside], x[inside], y[inside]] & (SNAKE1 | SNAKE2)) != 0
+            self.alive[envs[hit], p] = False
+            targets[envs[~hit], p] = x[~hit] * n + y[~hit]
+
+        # 头对头：较短者死亡，等长同归于尽
+        clash = np.flatnonzero((targets[:, 0] >= 0) & (targets[:, 0] == targets[:, 1]))
+        if len(clash):
+            len1, len2 = self.length[clash, 0], self.length[clash, 1]
+            lose1, lose2 = clash[len1 <= len2], clash[len2 <= len1]
+            self.alive[lose1, 0] = False
+            targets[lose1, 0] = -1
+            self.alive[lose2, 1] = False
+            targets[lose2, 1] = -1
+
+        # 两条蛇都推进后再补充食物
+        ate = np.zeros(self.num_envs, dtype=bool)
+        for p in (0, 1):
+            envs = np.flatnonzero(targets[:, p] >= 0)
+            if len(envs):
+                ate[self._place_head(p, envs, targets[envs, p])] = True
+        if ate.any():
+            self._generate_foods(np.flatnonzero(ate))
+
+    def _place_head(self, p: int, envs: np.ndarray, new_cell: np.ndarray) -> np.ndarray:
+        """
+        把玩家 p+1 的蛇头推进到目标格，处理吃食物/移尾（与 SnakeGame._place_head 相同），
+        返回吃到食物的对局（由 _tick 统一补充食物）
+        """
+        n = self.board_size
+        cap = n * n
+        bit = SNAKE1 if p == 0 else SNAKE2
+        x, y = new_cell // n, new_cell % n
+        cell = self.grid[envs, x, y]
+
+        # 新蛇头入队
+        head = (self.head[envs, p] - 1) % cap
+        self.head[envs, p] = head
+        self.body[envs, p, head] = new_cell
+        self.length[envs, p] += 1
+        empty = cell == EMPTY
+        if empty.any():
+            self._take_free_cell(envs[empty], new_cell[empty])
+
+        eat = (cell & FOOD) != 0
+        self.grid[envs, x, y] = (cell & ~FOOD) | bit
+
+        # 没吃到食物：尾巴出队
+        move = ~eat
+        if move.any():
+            m_envs = envs[move]
+            tail_pos = (self.head[m_envs, p] + self.length[m_envs, p] - 1) % cap
+            tail = self.body[m_envs, p, tail_pos].astype(np.int64)
+            self.length[m_envs, p] -= 1
+            tx, ty = tail // n, tail % n
+            self.grid[m_envs, tx, ty] &= ~bit
+            freed = self.grid[m_envs, tx, ty] == EMPTY
+            if freed.any():
+                self._release_free_cell(m_envs[freed], tail[freed])
+
+        e_envs = envs[eat]
+        self.food_num[e_envs] -= 1
+        return e_envs
@@ -0,0 +1,209 @@
+"""
+贪吃蛇 Voronoi 领地评估：位棋盘上的多源 BFS
+棋盘按行展开成一个 Python 大整数，每行末尾多留一位空列（行宽 N + 1），
+这样一层扩展只需对整块位图做四次移位再与可通行掩码相与，两条蛇（以及争夺区）
+的前沿在同一次逐层循环里同时推进，每层的代价与格子数几乎无关。
+可通行掩码与 FloodFill 一致：存活的蛇第 i 节（蛇长 L）在第 L - i 个 tick 之后空出，
+死亡的蛇身永久占用。
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+if hasattr(int, 'bit_count'):
+    _popcount = int.bit_count
+else:  # Python 3.10 之前
+    def _popcount(x: int) -> int:
+        return bin(x).count('1')
+
+
+class Territory:
+    """一次领地划分的结果（计数均不含两个起点）"""
+
+    __slots__ = ('cells1', 'cells2', 'contested', 'food1', 'food2',
+                 'food_dist1', 'food_dist2', '_masks', '_width')
+
+    def __init__(self, masks, width, counts, food_counts, food_dists):
+        self._masks = masks
+        self._width = width
+        self.cells1, self.cells2, self.contested = counts
+        self.food1, self.food2 = food_counts
+        self.food_dist1, self.food_dist2 = food_dists
+
+    def owner(self, cell: Tuple[int, int]) -> int:
+        """cell 的归属：1 / 2，争夺格为 3，谁都到不了（或是起点）为 0"""
+        bit = 1 << (cell[0] * self._width + cell[1])
+        for mark in (1, 2, 3):
+            if self._masks[mark - 1] & bit:
+                return mark
+        return 0
+
+    def score(self, player: int = 1) -> int:
+        """player 视角的领地差"""
+        diff = self.cells1 - self.cells2
+        return diff if player == 1 else -diff
+
+    def __repr__(self):
+        return (f"Territory(cells1={self.cells1}, cells2={self.cells2}, contested={self.contested}, "
+                f"food1={self.food1}, food2={self.food2})")
+
+
+class Voronoi:
+    """可复用的双蛇领地 / 距离场计算"""
+
+    def __init__(self, board_size: int):
+        n = board_size
+        w = n + 1
+        self.board_size = n
+        self._width = w
+        row = (1 << n) - 1
+        self._board = sum(row << (x * w) for x in range(n))
+        self._open = self._board   # 任何时刻都能通行的格子
+        self._unlock = []          # _unlock[k]：第 k 个 tick 之后空出的蛇身格
+        self._foods = 0
+
+    def bit(self, cell: Tuple[int, int]) -> int:
+        return 1 << (cell[0] * self._width + cell[1])
+
+    # ------------------------------------------------------------------
+    # 准备障碍
+    # ------------------------------------------------------------------
+    def prepare(self, game, tail_aware: bool = True) -> 'Voronoi':
+        """
+        按游戏当前局面构建可通行掩码与食物掩码
+
+        Args:
+            game: SnakeGame（使用其蛇身 deque 与食物列表）
+            tail_aware: False 时所有蛇身都视为永久障碍
+        """
+        w = self._width
+        walls = 0
+        unlock = [0]
+        for snake, alive in ((game.snake1, game.alive1), (game.snake2, game.alive2)):
+            length = len(snake)
+            if tail_aware and alive:
+                if len(unlock) <= length:
+                    unlock.extend([0] * (length + 1 - len(unlock)))
+                for i, (x, y) in enumerate(snake):
+                    unlock[length - i] |= 1 << (x * w + y)
+            else:
+                for x, y in snake:
+                    walls |= 1 << (x * w + y)
+        bodies = walls
+        for mask in unlock:
+            bodies |= mask
+        self._open = self._board & ~bodies
+        self._unlock = [mask & ~walls for mask in unlock]
+        foods = 0
+        for x, y in game.foods:
+            foods |= 1 << (x * w + y)
+        self._foods = foods
+        return self
+
+    def _free_masks(self, t0: int):
+        """依次产出第 t0 + 1, t0 + 2, ... 个 tick 可通行的掩码"""
+        unlock = self._unlock
+        free = self._open
+        for k in range(1, min(t0 + 1, len(unlock))):
+            free |= unlock[k]
+        k = t0 + 1
+        while True:
+            yield free
+            if k < len(unlock):
+                free |= unlock[k]
+            k += 1
+
+    # ------------------------------------------------------------------
+    # 领地
+    # ------------------------------------------------------------------
+    def territory(self, start1: Tuple[int, int], start2: Tuple[int, int],
+                  t0: int = 0) -> Territory:
+        """
+        两个起点同时逐层扩展：严格先到达的一方占有该格，同时到达（或只能经由
+        争夺格到达）的记为争夺格；结果与 FloodFill.territory 相同，另外统计食物归属
+        与各自最近的己方食物距离（没有为 -1）
+        """
+        w = self._width
+        foods = self._foods
+        f1, f2 = self.bit(start1), self.bit(start2)
+        f3 = 0
+        seen = f1 | f2
+        own1 = own2 = contested = 0
+        dist1 = dist2 = -1
+        t = t0
+        free_masks = self._free_masks(t0)
+        while f1 | f2 | f3:
+            t += 1
+            free = next(free_masks) & ~seen
+            n1 = ((f1 << 1) | (f1 >> 1) | (f1 << w) | (f1 >> w)) & free
+            n2 = ((f2 << 1) | (f2 >> 1) | (f2 << w) | (f2 >> w)) & free
+            n3 = ((f3 << 1) | (f3 >> 1) | (f3 << w) | (f3 >> w)) & free
+            f3 = (n1 & n2) | n3
+            f1 = n1 & ~f3
+            f2 = n2 & ~f3
+            seen |= f1 | f2 | f3
+            own1 |= f1
+            own2 |= f2
+            contested |= f3
+            if foods:
+                if dist1 < 0 and f1 & foods:
+                    dist1 = t - t0
+                if dist2 < 0 and f2 & foods:
+                    dist2 = t - t0
+        return Territory(
+            (own1, own2, contested), w,
+            (_popcount(own1), _popcount(own2), _popcount(contested)),
+            (_popcount(own1 & foods), _popcount(own2 & foods)),
+            (dist1, dist2),
+        )
+
+    def evaluate(self, game, tail_aware: bool = True) -> Optional[Territory]:
+        """按 game 的两个蛇头直接计算领地；有蛇身为空时返回 None"""
+        if not (game.snake1 and game.snake2):
+            return None
+        return self.prepare(game, tail_aware).territory(game.snake1[0], game.snake2[0])
+
+    # ------------------------------------------------------------------
+    # 距离场
+    # ------------------------------------------------------------------
+    def distance_fields(self, start1: Tuple[int, int], start2: Tuple[int, int],
+                        t0: int = 0) -> np.ndarray:
+        """
+        两个起点各自（互不阻挡）的到达时间场，在同一次逐层循环中求出。
+        与 FloodFill.distances 一致：相邻的蛇身格在它空出的 tick 到达（可以原地绕圈等待），
+        所以每层从已到达的全部格子向外扩展
+
+        Returns:
+            (2, N, N) int32，不可达为 -1
+        """
+        n, w = self.board_size, self._width
+        fields = np.full((2, n * w), -1, dtype=np.int32)
+        seen = [self.bit(start1), self.bit(start2)]
+        levels = [[(seen[0], t0)], [(seen[1], t0)]]
+        last_unlock = len(self._unlock) - 1
+        t = t0
+        free_masks = self._free_masks(t0)
+        while True:
+            t += 1
+            free = next(free_masks)
+            grew = False
+            for i in (0, 1):
+                s = seen[i]
+                f = ((s << 1) | (s >> 1) | (s << w) | (s >> w)) & free & ~s
+                if f:
+                    seen[i] = s | f
+                    levels[i].append((f, t))
+                    grew = True
+            if not grew and t > last_unlock:
+                break
+        for i in (0, 1):
+            for mask, level in levels[i]:
+                fields[i][_mask_indices(mask, n * w)] = level
+        return fields.reshape(2, n, w)[:, :, :n].copy()
+
+
+def _mask_indices(mask: int, size: int) -> np.ndarray:
+    """位图中为 1 的位下标"""
+    raw = np.frombuffer(mask.to_bytes((size + 7) // 8, 'little'), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(raw, bitorder='little')[:size])
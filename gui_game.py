@@ -235,13 +235,10 @@ class MultiGameGUI:
             # ===== Snake 实时事件 =====
             if self.current_game == "snake":
                 if event.type == self.MOVE_EVENT and not (self.game_over or self.paused):
-                    # 人类蛇
-                    self.env.game.move_snake1()
-                    # AI 蛇
+                    # AI 蛇根据 tick 开始时的局面决策，人类蛇沿用键盘缓存的方向
                     obs = self.env._get_observation()
                     act2 = self.ai_agent.get_action(obs, self.env)
-                    self.env.game.set_next_direction(2, act2)
-                    self.env.game.move_snake2()
+                    self.env.step_joint(None, act2)
                     if self.env.game.is_game_over():
                         self.game_over = True
                         self.winner = self.env.game.get_winner()
@@ -3,8 +3,11 @@ import sys
 import time
 import traceback
 from games.pingpong.pingpong_env import PingPongEnv
+from games.pingpong.physics import TICK_RATE
 from agents.ai_bots.random_pingpong_ai import RandomPingPongAI
 from agents.ai_bots.rule_based_pingpong_ai import RuleBasedPingPongAI
+from agents.ai_bots.predictive_pingpong_ai import PredictivePingPongAI
+from agents.ai_bots.pingpong_search_ai import PingPongSearchAI
 import random
 
 WHITE = (255, 255, 255)
@@ -15,6 +18,9 @@ GREEN = (0, 255, 0)
 YELLOW = (255, 255, 0)
 LIGHT_GRAY = (211, 211, 211)
 
+TICK_SECONDS = 1.0 / TICK_RATE
+MAX_TICKS_PER_FRAME = 5  # 卡顿时最多补这么多 tick，其余积压直接丢弃
+
 class PingPongGUI:
     def __init__(self):
         pygame.init()
@@ -24,7 +30,7 @@ class PingPongGUI:
         self.clock = pygame.time.Clock()
         self.env = PingPongEnv()
         self.font = pygame.font.SysFont(None, 32)
-        self.ai_types = ["Human", "RandomPingPongAI", "RuleBasedPingPongAI"]
+        self.ai_types = ["Human", "RandomPingPongAI", "RuleBasedPingPongAI", "PredictivePingPongAI", "PingPongSearchAI"]
         self.left_ai = "Human"
         self.right_ai = "RuleBasedPingPongAI"
         self._create_agents()
@@ -41,6 +47,10 @@ class PingPongGUI:
             self.left_agent = RandomPingPongAI(name="Random AI L", player_id=1)
         elif self.left_ai == "RuleBasedPingPongAI":
             self.left_agent = RuleBasedPingPongAI(name="Smart AI L", player_id=1)
+        elif self.left_ai == "PredictivePingPongAI":
+            self.left_agent = PredictivePingPongAI(name="Predict AI L", player_id=1)
+        elif self.left_ai == "PingPongSearchAI":
+            self.left_agent = PingPongSearchAI(name="Search AI L", player_id=1)
         # 右挡板
         if self.right_ai == "Human":
             self.right_agent = None
@@ -48,6 +58,10 @@ class PingPongGUI:
             self.right_agent = RandomPingPongAI(name="Random AI R", player_id=2)
         elif self.right_ai == "RuleBasedPingPongAI":
             self.right_agent = RuleBasedPingPongAI(name="Smart AI R", player_id=2)
+        elif self.right_ai == "PredictivePingPongAI":
+            self.right_agent = PredictivePingPongAI(name="Predict AI R", player_id=2)
+        elif self.right_ai == "PingPongSearchAI":
+            self.right_agent = PingPongSearchAI(name="Search AI R", player_id=2)
 
     def _create_buttons(self):
         button_width = 120
@@ -104,7 +118,8 @@ class PingPongGUI:
             color = YELLOW if (side == "left" and self.left_ai == ai_name) or (side == "right" and self.right_ai == ai_name) else LIGHT_GRAY
             pygame.draw.rect(self.screen, color, rect)
             pygame.draw.rect(self.screen, BLACK, rect, 2)
-            short_name = "Human" if ai_name == "Human" else ("Smart AI" if ai_name == "RuleBasedPingPongAI" else "Random AI")
+            short_name = {"Human": "Human", "RuleBasedPingPongAI": "Smart AI",
+                          "PredictivePingPongAI": "Predict AI", "PingPongSearchAI": "Search AI"}.get(ai_name, "Random AI")
             text = self.font.render(short_name, True, BLACK)
             text_rect = text.get_rect(center=rect.center)
             self.screen.blit(text, text_rect)
@@ -160,6 +175,7 @@ class PingPongGUI:
             state, _ = self.env.reset()
             ai_speed_factor = 0.8
             spin_flag = None
+            lag = 0.0  # 尚未模拟的真实时间（秒）
 
             while not self.done:
                 # ---------- 统一动作字典 ----------
@@ -259,13 +275,21 @@ class PingPongGUI:
                 if self.paused:
                     self.draw(self.env.game.get_state(), spin_flag=spin_flag)
                     self.clock.tick(60)
+                    lag = 0.0
                     continue
 
-                # ---------- 游戏步进 ----------
-                state, _, self.done, _, _ = self.env.step(action)
+                # ---------- 游戏步进：固定时间步长，按实际经过的时间补足 tick ----------
+                lag += self.clock.tick(60) / 1000.0
+                ticks = 0
+                while lag >= TICK_SECONDS and not self.done:
+                    if ticks == MAX_TICKS_PER_FRAME:
+                        lag = 0.0
+                        break
+                    state, _, self.done, _, _ = self.env.step(action)
+                    lag -= TICK_SECONDS
+                    ticks += 1
                 spin_flag = action.get("left_spin") or action.get("right_spin")
                 self.draw(self.env.game.get_state(), spin_flag=spin_flag)
-                self.clock.tick(60)
 
         except Exception as e:
             print("[FATAL]", e)
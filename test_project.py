@@ -250,6 +250,1271 @@ def test_custom_agents():
         return False
 
 
+def test_snapshot_restore():
+    """测试快照/恢复"""
+    print("\n=== 测试快照与恢复 ===")
+    
+    try:
+        from games.gomoku import GomokuGame
+        from games.snake import SnakeGame
+        from games.pingpong.pingpong_game import PingPongGame
+        
+        # 五子棋：走几步后恢复
+        game = GomokuGame(board_size=9, win_length=5)
+        game.step((4, 4))
+        snap = game.snapshot()
+        game.step((4, 5))
+        game.step((5, 5))
+        game.restore(snap)
+        assert game.board[4, 5] == 0 and game.board[4, 4] == 1
+        assert game.move_count == 1 and game.current_player == 2
+        assert game.history == [(4, 4)]
+        print("✓ 五子棋快照恢复成功")
+        
+        # 贪吃蛇
+        game = SnakeGame(board_size=10)
+        snap = game.snapshot()
+        for _ in range(3):
+            game.step(game.get_valid_actions()[0])
+        game.restore(snap)
+        assert game.snapshot() == snap
+        print("✓ 贪吃蛇快照恢复成功")
+        
+        # 乒乓球
+        game = PingPongGame()
+        snap = game.snapshot()
+        for _ in range(50):
+            game.step({"move_left_y": 1})
+        game.restore(snap)
+        assert game.snapshot() == snap
+        print("✓ 乒乓球快照恢复成功")
+        
+        # 克隆互不影响
+        game = GomokuGame(board_size=9, win_length=5)
+        cloned = game.clone()
+        cloned.step((0, 0))
+        assert game.board[0, 0] == 0 and not game.history
+        print("✓ 克隆独立性检查成功")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 快照恢复测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_gomoku_symmetry():
+    """测试五子棋对称规范键"""
+    print("\n=== 测试五子棋对称规范键 ===")
+    
+    try:
+        from games.gomoku import GomokuGame
+        from games.gomoku.zobrist import board_canonical_key
+        from agents.ai_bots.mcts_bot import GomokuBoard
+        
+        moves = [(1, 2), (4, 4), (2, 7), (6, 3)]
+        game = GomokuGame(board_size=9, win_length=5)
+        for move in moves:
+            game.step(move)
+        key, transform = game.canonical_key()
+        
+        # 8 种对称变换后的局面应得到同一规范键
+        for t in range(8):
+            other = GomokuGame(board_size=9, win_length=5)
+            for move in moves:
+                other.step(game.transform_move(move, t))
+            assert other.canonical_key()[0] == key
+        print("✓ 对称局面规范键一致")
+        
+        # 坐标映射可逆
+        canon_move = game.transform_move((0, 3), transform)
+        assert game.inverse_transform_move(canon_move, transform) == (0, 3)
+        
+        # 悔棋后增量键回到原值
+        before = game.symmetry_keys()
+        game.step((8, 8))
+        game.undo()
+        assert (game.symmetry_keys() == before).all()
+        print("✓ 增量更新与坐标映射正确")
+        
+        # MCTS 棋盘同样增量维护规范键，与从头计算一致
+        board = GomokuBoard(size=9)
+        board.set_board(game.board)
+        assert board.canonical_key() == board_canonical_key(game.board)
+        copy = board.clone()
+        copy.place(8, 8, 1)
+        assert copy.canonical_key() == board_canonical_key(copy.board)
+        assert board.canonical_key() == board_canonical_key(game.board)
+        print("✓ MCTS 棋盘增量规范键正确")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 对称规范键测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_game_records():
+    """测试二进制对局记录"""
+    print("\n=== 测试二进制对局记录 ===")
+    
+    try:
+        import os
+        import tempfile
+        from games.gomoku import GomokuEnv
+        from agents import RandomBot
+        from utils.game_utils import evaluate_agents
+        from utils.game_records import GameRecordReader, encode_action, decode_action
+        
+        env = GomokuEnv(board_size=9, win_length=5)
+        agent1 = RandomBot(name="随机Bot1", player_id=1)
+        agent2 = RandomBot(name="随机Bot2", player_id=2)
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "games.bin")
+            results = evaluate_agents(env, agent1, agent2, num_games=3, record_path=path)
+            reader = GameRecordReader(path)
+            assert len(reader) == 3
+            for record, game in zip(reader, results['games']):
+                restored = record.to_dict()
+                assert restored['winner'] == game['winner']
+                assert restored['players'] == game['players']
+                assert [m['action'] for m in restored['moves']] == [m['action'] for m in game['moves']]
+            reader.close()
+        print("✓ 记录写入与读取一致")
+        
+        action = {"move_left_x": -1, "move_left_y": 1, "move_right_x": 0, "move_right_y": 1,
+                  "left_force": True, "right_force": False, "left_spin": False, "right_spin": True}
+        assert decode_action('pingpong', encode_action('pingpong', action, 0), 0) == action
+        print("✓ 动作编码可逆")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 对局记录测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_position_db():
+    """测试局面数据库"""
+    print("\n=== 测试局面数据库 ===")
+    
+    try:
+        import os
+        import tempfile
+        import numpy as np
+        from games.gomoku import GomokuGame
+        from utils.game_records import GameRecord, GameRecordWriter
+        from utils.position_db import PositionDB
+        
+        # 两局互为镜像的对局，应合并为同一组局面
+        moves_a = [(4, 4), (3, 3), (4, 5), (3, 4)]
+        moves_b = [(4, 4), (3, 5), (4, 3), (3, 4)]
+        with tempfile.TemporaryDirectory() as tmp:
+            record_path = os.path.join(tmp, "games.bin")
+            with GameRecordWriter(record_path) as writer:
+                for moves, winner in ((moves_a, 1), (moves_b, 2)):
+                    writer.write(GameRecord(
+                        'gomoku', 9, ("A", "B"), winner,
+                        np.array([1, 2, 1, 2], dtype=np.uint8),
+                        np.array([r * 9 + c for r, c in moves], dtype=np.uint16),
+                        np.zeros(4, dtype=np.float16),
+                    ))
+            db = PositionDB.build(record_path, os.path.join(tmp, "positions.db"))
+            
+            game = GomokuGame(board_size=9, win_length=5)
+            game.step((4, 4))
+            result = db.probe(game)
+            assert result['games'] == 2 and result['p1_wins'] == 1 and result['p2_wins'] == 1
+            assert len(result['moves']) == 1 and result['moves'][0]['count'] == 2
+            assert result['moves'][0]['move'] in [(3, 3), (3, 5), (5, 3), (5, 5)]
+            assert db.win_rate(game, 1) == 0.5
+            
+            game.step((0, 0))
+            assert db.probe(game) is None
+            del result, game, db
+        print("✓ 对称局面合并与查询成功")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 局面数据库测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_opening_book():
+    """测试开局库"""
+    print("\n=== 测试开局库 ===")
+    
+    try:
+        import os
+        import tempfile
+        from games.gomoku import GomokuEnv
+        from agents import MinimaxBot, MCTSBot
+        from utils.opening_book import build_from_search
+        
+        # 用一个固定的“搜索”生成开局库：空棋盘下天元，之后下在 (7, 8)
+        def fake_search(game):
+            return (7, 7) if not game.history else (7, 8)
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            book = build_from_search(os.path.join(tmp, "opening.book"), board_size=15,
+                                     max_plies=2, branching=1, search_fn=fake_search)
+            assert len(book) > 0
+            
+            env = GomokuEnv(board_size=15, win_length=5)
+            observation, info = env.reset()
+            minimax_bot = MinimaxBot(name="开局Minimax", player_id=1, opening_book=book)
+            assert minimax_bot.get_action(observation, env) == (7, 7)
+            
+            # 对称局面：对手在天元下方落子，推荐着法应随之变换
+            env.step((7, 7))
+            mcts_bot = MCTSBot(name="开局MCTS", player_id=2, opening_book=book)
+            action = mcts_bot.get_action(observation, env)
+            assert action in [(7, 8), (7, 6), (8, 7), (6, 7)]
+            del book, minimax_bot, mcts_bot
+        print("✓ 开局库生成与查询成功")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 开局库测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_snake_occupancy_grid():
+    """测试贪吃蛇占用网格"""
+    print("\n=== 测试贪吃蛇占用网格 ===")
+    
+    try:
+        import random
+        import numpy as np
+        from games.snake import SnakeGame
+        from games.snake.snake_game import SNAKE1, SNAKE2, FOOD
+        
+        random.seed(0)
+        game = SnakeGame(board_size=10)
+        directions = game.get_action_space()
+        for _ in range(200):
+            if game.is_terminal():
+                game.reset()
+            player = random.choice([1, 2])
+            game.set_next_direction(player, random.choice(directions))
+            game.move_snake1() if player == 1 else game.move_snake2()
+            
+            # 网格与蛇身/食物列表保持一致
+            expected = np.zeros_like(game.grid)
+            for x, y in game.snake1:
+                expected[x, y] |= SNAKE1
+            for x, y in game.snake2:
+                expected[x, y] |= SNAKE2
+            for x, y in game.foods:
+                expected[x, y] |= FOOD
+            assert (expected == game.grid).all()
+        print("✓ 网格增量更新正确")
+        
+        # 撞到自己的身体
+        game = SnakeGame(board_size=10)
+        game.snake1.clear()
+        game.snake1.extend([(5, 5), (5, 4), (6, 4), (6, 5), (6, 6)])
+        game.grid[:] = 0
+        for x, y in game.snake1:
+            game.grid[x, y] = SNAKE1
+        game.direction1 = (1, 0)
+        game._move_snake(1)
+        assert not game.alive1
+        print("✓ 自撞检测正确")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 占用网格测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_snake_food_spawning():
+    """测试贪吃蛇食物生成"""
+    print("\n=== 测试贪吃蛇食物生成 ===")
+    
+    try:
+        import numpy as np
+        from games.snake import SnakeGame
+        from games.snake.snake_game import EMPTY
+        
+        # 相同种子产生相同的食物序列
+        game_a = SnakeGame(board_size=10, seed=7)
+        game_b = SnakeGame(board_size=10, seed=7)
+        for _ in range(30):
+            if game_a.is_terminal():
+                break
+            game_a.move_snake1()
+            game_b.move_snake1()
+        assert game_a.foods == game_b.foods
+        print("✓ 食物序列可复现")
+        
+        # 空格池与网格一致
+        game = SnakeGame(board_size=10, seed=3)
+        empty = set(np.flatnonzero(game.grid.ravel() == EMPTY).tolist())
+        pool = game._free_cells[:game._free_count].tolist()
+        assert set(pool) == empty and len(pool) == len(empty)
+        print("✓ 空格池与网格一致")
+        
+        # 棋盘填满时不再生成食物
+        game = SnakeGame(board_size=5, food_count=30, seed=1)
+        assert game._free_count == 0
+        assert len(game.foods) == 25 - len(game.snake1) - len(game.snake2)
+        print("✓ 棋盘已满时停止生成")
+        
+        # 快照包含随机数状态
+        game = SnakeGame(board_size=10, seed=5)
+        snapshot = game.snapshot()
+        game.move_snake1()
+        foods = list(game.foods)
+        game.restore(snapshot)
+        game.move_snake1()
+        assert game.foods == foods
+        print("✓ 恢复快照后食物序列一致")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 食物生成测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_snake_state_view():
+    """测试贪吃蛇惰性状态视图"""
+    print("\n=== 测试贪吃蛇状态视图 ===")
+    
+    try:
+        from games.snake import SnakeGame, SnakeEnv
+        
+        game = SnakeGame(board_size=10, seed=1)
+        state = game.get_state()
+        assert game.get_state() is state
+        assert not state['board'].flags.writeable
+        assert isinstance(state['snake1'], tuple)
+        print("✓ 同一 tick 内复用只读视图")
+        
+        # 进入下一 tick 后旧视图保持不变（包括尚未生成的棋盘）
+        expected_board = game._render_board()
+        expected_snake = tuple(game.snake1)
+        game.move_snake1()
+        assert game.get_state() is not state
+        assert state['snake1'] == expected_snake
+        assert (state['board'] == expected_board).all()
+        print("✓ 旧视图不受后续移动影响")
+        
+        # reset 后旧视图（如环境循环保留的终局观察）仍是重置前的局面
+        state = game.get_state()
+        expected_board = game._render_board()
+        expected_snake = tuple(game.snake1)
+        expected_foods = tuple(game.foods)
+        game.reset()
+        assert state['snake1'] == expected_snake and state['foods'] == expected_foods
+        assert (state['board'] == expected_board).all()
+        assert tuple(game.snake1) != expected_snake
+        print("✓ 旧视图不受 reset 影响")
+        
+        # 环境观察不再是全零棋盘
+        env = SnakeEnv(board_size=10)
+        assert env._get_observation().any()
+        print("✓ 环境观察来自当前棋盘")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 状态视图测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_vec_snake_env():
+    """测试批量贪吃蛇环境与单局引擎一致"""
+    print("\n=== 测试批量贪吃蛇环境 ===")
+    
+    try:
+        import numpy as np
+        from games.snake import SnakeGame, VecSnakeEnv
+        
+        num_envs, board_size = 8, 6
+        directions = SnakeGame(board_size).get_action_space()
+        vec = VecSnakeEnv(num_envs, board_size, food_count=3, seed=100)
+        games = [SnakeGame(board_size, food_count=3, seed=100 + b) for b in range(num_envs)]
+        rng = np.random.default_rng(0)
+        
+        for _ in range(300):
+            actions = rng.integers(0, 4, size=(num_envs, 2))
+            observation, rewards, terminated, _, _ = vec.step(actions)
+            for b, game in enumerate(games):
+                _, step_rewards, done, _ = game.step_joint(directions[actions[b, 0]],
+                                                           directions[actions[b, 1]])
+                assert terminated[b] == done
+                assert tuple(rewards[b]) == step_rewards
+                if done:
+                    game.reset()
+                assert (game.grid == vec.grid[b]).all()
+                assert list(game.snake1) == vec.get_snake(b, 1)
+                assert list(game.snake2) == vec.get_snake(b, 2)
+                assert (game.board == observation[b]).all()
+        print("✓ 与 SnakeGame 逐 tick 一致（含食物与自动重置）")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 批量环境测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_snake_step_joint():
+    """测试贪吃蛇同时移动"""
+    print("\n=== 测试贪吃蛇同时移动 ===")
+    
+    try:
+        from games.snake import SnakeGame, SnakeEnv
+        from games.snake.snake_game import SNAKE1, SNAKE2, FOOD
+        
+        def setup(snake1, snake2):
+            game = SnakeGame(board_size=10, food_count=0)
+            game.snake1.clear()
+            game.snake1.extend(snake1)
+            game.snake2.clear()
+            game.snake2.extend(snake2)
+            game.grid[:] = 0
+            for cell in snake1:
+                game.grid[cell] |= SNAKE1
+            for cell in snake2:
+                game.grid[cell] |= SNAKE2
+            game._reset_free_cells()
+            return game
+        
+        # 等长头对头：同归于尽
+        game = setup([(5, 3)], [(5, 5)])
+        _, rewards, done, _ = game.step_joint((0, 1), (0, -1))
+        assert done and not game.alive1 and not game.alive2 and rewards == (-1.0, -1.0)
+        # 较长的一方获胜
+        game = setup([(5, 3), (5, 2)], [(5, 5)])
+        _, rewards, done, _ = game.step_joint((0, 1), (0, -1))
+        assert game.alive1 and not game.alive2 and rewards == (1.0, -1.0)
+        assert game.snake1[0] == (5, 4)
+        # 交换位置：双方都撞到对方
+        game = setup([(5, 4)], [(5, 5)])
+        game.step_joint((0, 1), (0, -1))
+        assert not game.alive1 and not game.alive2
+        print("✓ 头对头判定正确")
+        
+        # 蛇1 吃到食物后补充的食物不能落在蛇2 本 tick 的目标格上
+        game = setup([(5, 3), (5, 2)], [(7, 5), (8, 5)])
+        game.food_count = 1
+        game.grid[game.grid == 0] = SNAKE1  # 填满棋盘，只留食物格与蛇2 的目标格
+        game.grid[5, 4] = FOOD
+        game.foods.append((5, 4))
+        game.grid[6, 5] = 0
+        game._reset_free_cells()
+        game.step_joint((0, 1), (-1, 0))
+        assert len(game.snake1) == 3 and len(game.snake2) == 2
+        assert list(game.foods) == [(8, 5)]
+        print("✓ 两条蛇都推进后才补充食物")
+        
+        # 环境的回合制接口：两位玩家各给一个动作后同时前进一个 tick
+        env = SnakeEnv(board_size=10)
+        head1, head2 = env.game.snake1[0], env.game.snake2[0]
+        env.step((0, 1))
+        assert env.game.snake1[0] == head1 and env.game.current_player == 2
+        env.step((1, 0))
+        assert env.game.snake1[0] == (head1[0], head1[1] + 1)
+        assert env.game.snake2[0] == (head2[0] + 1, head2[1])
+        assert env.game.current_player == 1
+        print("✓ 环境按 tick 同时推进两条蛇")
+        
+        # 蛇1 的奖励不能丢：放在 info['rewards'] 中，并在玩家1 下一次 step 时返回
+        env.game = setup([(5, 4)], [(5, 6), (5, 7)])
+        env.game.current_player = 1
+        env.step((0, 1))
+        _, reward, _, _, info = env.step((0, -1))
+        assert reward == 1.0 and info['rewards'] == (-1.0, 1.0)
+        _, reward, _, _, _ = env.step((0, 1))
+        assert reward == -1.0
+        env.reset()
+        env.step((0, 1))
+        _, reward, _, _, info = env.step((1, 0))
+        assert info['rewards'] == (0.0, 0.0)
+        assert env.step((0, 1))[1] == 0.0
+        print("✓ 蛇1 的奖励经 info 与下一次 step 返回")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 同时移动测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_snake_flood_fill():
+    """测试贪吃蛇泛洪填充"""
+    print("\n=== 测试贪吃蛇泛洪填充 ===")
+    
+    try:
+        from games.snake import SnakeGame
+        from games.snake.flood_fill import FloodFill
+        from games.snake.snake_game import SNAKE1, SNAKE2
+        
+        # 蛇1 横穿棋盘把左上角隔出 3 格
+        game = SnakeGame(board_size=6, food_count=0)
+        game.snake1.clear()
+        game.snake1.extend([(0, 2), (1, 2), (2, 2), (2, 1), (2, 0)])
+        game.snake2.clear()
+        game.snake2.append((5, 5))
+        game.grid[:] = 0
+        for cell in game.snake1:
+            game.grid[cell] = SNAKE1
+        game.grid[5, 5] = SNAKE2
+        
+        flood = FloodFill(6)
+        flood.prepare(game, tail_aware=False)
+        assert flood.area((0, 0)) == 4
+        print("✓ 封闭区域面积正确")
+        
+        # 考虑尾巴移动：尾巴下一 tick 仍是障碍，之后空出来
+        flood.prepare(game)
+        assert not flood.passable((2, 0), t=1) and flood.passable((2, 0), t=2)
+        assert flood.area((0, 0)) == 6 * 6
+        distances = flood.distances((0, 1), t0=1)
+        assert distances[0, 0] == 2 and distances[1, 0] == 3
+        assert distances[2, 1] == 3 and distances[2, 0] == 4
+        print("✓ 尾巴空出的时间正确")
+        
+        # Voronoi 领地：空棋盘上与按曼哈顿距离划分的结果一致
+        game = SnakeGame(board_size=10, food_count=0)
+        game.grid[:] = 0
+        flood = FloodFill(10).prepare(game, tail_aware=False)
+        (x1, y1), (x2, y2) = (7, 3), (5, 5)
+        expected = [0, 0, 0]
+        for x in range(10):
+            for y in range(10):
+                d1, d2 = abs(x - x1) + abs(y - y1), abs(x - x2) + abs(y - y2)
+                if d1 and d2:
+                    expected[0 if d1 < d2 else 1 if d2 < d1 else 2] += 1
+        assert flood.territory((x1, y1), (x2, y2)) == tuple(expected)
+        print("✓ Voronoi 领地划分正确")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 泛洪填充测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_snake_pathfinding():
+    """测试贪吃蛇 A* 寻路"""
+    print("\n=== 测试贪吃蛇寻路 ===")
+    
+    try:
+        from games.snake import SnakeGame
+        from games.snake.pathfinding import PathFinder
+        from games.snake.snake_game import SNAKE1
+        
+        game = SnakeGame(board_size=8, food_count=0)
+        # 蛇1 竖直挡在第 3 列，只在最下面留出缺口
+        game.snake1.clear()
+        game.snake1.extend([(0, 3), (1, 3), (2, 3), (3, 3), (4, 3), (5, 3), (6, 3)])
+        game.snake2.clear()
+        game.snake2.append((7, 7))
+        game.grid[:] = 0
+        for cell in game.snake1:
+            game.grid[cell] = SNAKE1
+        game.grid[7, 7] = 2
+        
+        finder = PathFinder(8).prepare(game)
+        path = finder.find_path((0, 2), [(0, 4)])
+        assert path[0] == (0, 2) and path[-1] == (0, 4)
+        # 第 r 行的蛇身在第 7 - r 个 tick 之后空出：最早在第 5 步从 (4, 3) 穿过
+        assert len(path) - 1 == 10 and (4, 3) in path
+        for step, cell in enumerate(path[1:], 1):
+            assert finder.passable(cell, step)
+        print("✓ 绕过蛇身的最短路径正确")
+        
+        # 多目标：一次搜索返回最近的可达目标
+        path = finder.find_path((0, 2), [(0, 4), (3, 0), (7, 7)])
+        assert path[-1] == (3, 0) and len(path) - 1 == 5
+        assert finder.find_path((0, 2), [(9, 9)]) is None
+        print("✓ 多目标寻路正确")
+        
+        # 路径缓存：按计划移动时沿用，对方蛇头压到剩余路径上时失效
+        from games.snake.pathfinding import PathCache
+        game = SnakeGame(board_size=8, food_count=0)
+        game._take_free_cell(2 * 8 + 6)
+        game.grid[2, 6] = 4
+        game.foods.append((2, 6))
+        finder = PathFinder(8).prepare(game)
+        path = finder.find_path(game.snake1[0], game.foods)
+        cache = PathCache()
+        cache.store(path, game)
+        game.step_joint((path[1][0] - path[0][0], path[1][1] - path[0][1]), (1, 0))
+        assert cache.next_cell(game, game.snake1[0]) == path[2]
+        game.snake2.appendleft(path[3])
+        assert cache.next_cell(game, path[2]) is None
+        print("✓ 路径缓存增量校验正确")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 寻路测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_snake_voronoi():
+    """测试贪吃蛇位棋盘 Voronoi 领地评估"""
+    print("\n=== 测试贪吃蛇 Voronoi 领地 ===")
+    
+    try:
+        from games.snake import SnakeGame
+        from games.snake.flood_fill import FloodFill
+        from games.snake.voronoi import Voronoi
+        
+        # 空棋盘：食物归属与最近己方食物距离
+        game = SnakeGame(board_size=10, food_count=0)
+        game.foods[:] = [(6, 0), (6, 9), (0, 5)]
+        voronoi = Voronoi(10)
+        territory = voronoi.evaluate(game)
+        head1, head2 = game.snake1[0], game.snake2[0]
+        assert territory.owner((6, 0)) == 1 and territory.owner((6, 9)) == 2
+        assert territory.owner((0, 5)) == 3 and territory.owner(head1) == 0
+        assert (territory.food1, territory.food2) == (1, 1)
+        assert territory.food_dist1 == 4 and territory.food_dist2 == 3
+        print("✓ 食物归属正确")
+        
+        # 对局中途：与逐格 BFS 的 FloodFill 结果一致
+        game = SnakeGame(board_size=10, seed=5)
+        for action1, action2 in [((-1, 0), (1, 0))] * 3 + [((0, -1), (0, 1))] * 2:
+            game.step_joint(action1, action2)
+        assert game.alive1 and game.alive2
+        head1, head2 = game.snake1[0], game.snake2[0]
+        flood = FloodFill(10).prepare(game)
+        territory = voronoi.prepare(game).territory(head1, head2)
+        assert (territory.cells1, territory.cells2, territory.contested) == flood.territory(head1, head2)
+        fields = voronoi.distance_fields(head1, head2)
+        assert (fields[0] == flood.distances(head1)).all()
+        assert (fields[1] == flood.distances(head2)).all()
+        print("✓ 与 FloodFill 领地 / 距离场一致")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ Voronoi 测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_snake_search_bot():
+    """测试贪吃蛇对抗搜索 AI"""
+    print("\n=== 测试贪吃蛇对抗搜索 AI ===")
+    
+    try:
+        from games.snake import SnakeEnv
+        from games.snake.snake_game import SNAKE1, SNAKE2
+        from agents.ai_bots.snake_search_bot import SnakeSearchBot
+        
+        env = SnakeEnv(board_size=10)
+        game = env.game
+        game.foods.clear()
+        game.grid[:] = 0
+        # 两蛇相向，中间隔一格；对方更长，抢进中间格会在头对头中死亡
+        game.snake1.clear()
+        game.snake1.extend([(5, 3), (5, 2)])
+        game.snake2.clear()
+        game.snake2.extend([(5, 5), (5, 6), (5, 7)])
+        for cell in game.snake1:
+            game.grid[cell] = SNAKE1
+        for cell in game.snake2:
+            game.grid[cell] = SNAKE2
+        game.direction1 = game.next_dir1 = (0, 1)
+        game.direction2 = game.next_dir2 = (0, -1)
+        
+        bot = SnakeSearchBot(player_id=1, time_limit=0.05)
+        action = bot.get_action(None, env)
+        assert action in game.get_valid_actions(1) and action != (0, 1)
+        assert bot.last_depth >= 1
+        print(f"✓ 避开头对头（搜索深度 {bot.last_depth}）")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 对抗搜索测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_pingpong_physics():
+    """测试乒乓球固定步长物理核心"""
+    print("\n=== 测试乒乓球物理核心 ===")
+    
+    try:
+        import random
+        from games.pingpong.pingpong_game import PingPongGame
+        from games.pingpong import physics
+        
+        # 同一种子 + 同一动作序列逐位复现
+        rng = random.Random(0)
+        actions = [{"move_left_y": rng.choice([-1, 0, 1]), "move_right_y": rng.choice([-1, 0, 1]),
+                    "left_force": rng.random() < 0.1, "right_spin": rng.random() < 0.05}
+                   for _ in range(3000)]
+        games = [PingPongGame(seed=42), PingPongGame(seed=42)]
+        for game in games:
+            for action in actions:
+                game.step(action)
+        assert games[0].snapshot() == games[1].snapshot()
+        assert games[0].physics.tick == 3000
+        print("✓ 相同种子与动作逐位复现")
+        
+        # 发球角度由种子决定，默认 serve_spread=0 时水平发球
+        assert PingPongGame(seed=1, serve_spread=0.1).ball_vy != PingPongGame(seed=2, serve_spread=0.1).ball_vy
+        assert PingPongGame(seed=1).ball_vy == 0.0
+        print("✓ 发球随机性可复现")
+        
+        # 纯函数：挡板移动与击球
+        assert physics.move_paddle(0.19, 0.5, 1, 0, physics.LEFT_X_RANGE) == (0.2, 0.5)
+        vx, vy, timer, direction = physics.paddle_return(0.55, -0.25, 0.0, 0.5, 20, True, 0, 1, 0, 0)
+        assert vx == 0.25 * physics.MAX_POWER and timer == physics.SPIN_TICKS and direction == 1
+        print("✓ 挡板移动与击球计算正确")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 乒乓球物理测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_vec_pingpong_env():
+    """测试批量乒乓球环境"""
+    print("\n=== 测试批量乒乓球环境 ===")
+    
+    try:
+        import random
+        import numpy as np
+        from games.pingpong.pingpong_env import PingPongEnv
+        from games.pingpong.vec_pingpong_env import VecPingPongEnv, action_array
+        
+        B = 4
+        vec = VecPingPongEnv(B, seed=7, serve_spread=0.1)
+        envs = [PingPongEnv(seed=7 + b, serve_spread=0.1) for b in range(B)]
+        obs = vec._get_observation()
+        assert obs.shape == (B, 10) and obs.dtype == np.float32
+        
+        # 挡板大致跟球，保证有来回击球、旋转和得分
+        rng = random.Random(0)
+        for _ in range(3000):
+            actions = []
+            for env in envs:
+                state = env.game.get_state()
+                ball_y = state['ball_pos'][1]
+                actions.append({
+                    "move_left_y": (ball_y > state['left_paddle_y']) - (ball_y < state['left_paddle_y']),
+                    "move_right_y": rng.choice([-1, 0, 1]),
+                    "move_left_x": rng.choice([-1, 0, 1]),
+                    "left_force": rng.random() < 0.1,
+                    "left_spin": rng.random() < 0.05,
+                })
+            obs, rewards, terminated, truncated, info = vec.step(action_array(actions))
+            for b, env in enumerate(envs):
+                _, _, done, _ = env.game.step(actions[b])
+                if done:
+                    env.game.reset()
+                assert np.array_equal(obs[b], env._get_observation())
+                assert vec.get_state(b) == env.game.get_state()
+                assert rewards[b].sum() == 0
+        print("✓ 与 PingPongGame 逐 tick 一致（含自动重置）")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 批量乒乓球环境测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_pingpong_trajectory():
+    """测试乒乓球轨迹预测与预测型 AI"""
+    print("\n=== 测试乒乓球轨迹预测 ===")
+    
+    try:
+        from games.pingpong.pingpong_env import PingPongEnv
+        from games.pingpong import physics
+        from games.pingpong.trajectory import predict_intercept
+        from agents.ai_bots.predictive_pingpong_ai import PredictivePingPongAI
+        
+        # 带旋转、会碰墙的球：挡板移开时恰好在预测的 tick 失分，放在预测高度时恰好击回
+        for spin_timer in (0, 30):
+            state = physics.PingPongState(seed=0, serve_spread=0.0)
+            state.ball_vx, state.ball_vy = -0.6, 2.4
+            state.spin_timer, state.spin_direction = spin_timer, -1 if spin_timer else 0
+            ticks, y = predict_intercept(state, 1)
+            assert predict_intercept(state, 2) is None
+            for left_y, expected in ((-1.0, 2), (y, None)):
+                trial = state.copy()
+                trial.left_y = left_y
+                for t in range(1, ticks + 1):
+                    scorer = physics.step(trial, {})
+                    assert scorer is None or t == ticks
+                assert scorer == expected
+                assert expected is not None or trial.ball_vx > 0
+        print("✓ 预测的到达时间与高度正确")
+        
+        # 预测型 AI 对打：不蓄力时双方都能接住每一个球
+        env = PingPongEnv(seed=3)
+        left, right = PredictivePingPongAI(player_id=1), PredictivePingPongAI(player_id=2)
+        for _ in range(3000):
+            action = dict(left.get_action(None, env))
+            action.update(right.get_action(None, env))
+            env.game.step(action)
+        assert env.game.score_left == env.game.score_right == 0
+        print("✓ 预测型 AI 接住所有来球")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 轨迹预测测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_pingpong_match_runner():
+    """测试无界面乒乓球对战器"""
+    print("\n=== 测试乒乓球对战器 ===")
+    
+    try:
+        from games.pingpong.physics import WIN_SCORE
+        from games.pingpong.pingpong_env import PingPongEnv
+        from utils.pingpong_runner import play_match, run_matches
+        from agents.ai_bots import RandomPingPongAI, RuleBasedPingPongAI, PredictivePingPongAI
+        
+        # 规则 AI 同时返回左右两侧的键，只应生效右侧：预测型 AI 执左时不受干扰
+        left = PredictivePingPongAI(player_id=1)
+        result = play_match(left, RuleBasedPingPongAI("rule", 2), seed=1, max_ticks=2000)
+        assert result['winner'] is None and result['ticks'] == 2000
+        assert result['score'][1] == 0 and result['hits'] > 0
+        print("✓ 只采用各自一侧的按键，max_ticks 截断未完成的比赛")
+        
+        # 批量对战打满 WIN_SCORE，汇总一致，同种子可复现
+        outcome = run_matches(RandomPingPongAI("random", 1), PredictivePingPongAI(player_id=2), 3, seed=5)
+        summary = outcome['summary']
+        assert summary['right_wins'] == 3 and summary['unfinished'] == 0
+        assert summary['score_distribution'] == {f"0:{WIN_SCORE}": 3}
+        assert summary['rallies_per_second'] > 0
+        # 水平发球时两名预测型 AI 会一直对拉、蓄力使球速发散，这里打开随机发球角度
+        again, repeat = (play_match(PredictivePingPongAI(player_id=1, use_force=True), PredictivePingPongAI(player_id=2),
+                                    seed=5, env=PingPongEnv(serve_spread=0.1)) for _ in range(2))
+        assert again['winner'] is not None
+        assert (again['score'], again['ticks'], again['hits']) == (repeat['score'], repeat['ticks'], repeat['hits'])
+        print(f"✓ 批量对战完成（{summary['rallies_per_second']:.0f} 分/秒）")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 对战器测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_pingpong_search_ai():
+    """测试乒乓球前瞻搜索 AI"""
+    print("\n=== 测试乒乓球搜索 AI ===")
+    
+    try:
+        from games.pingpong.pingpong_env import PingPongEnv
+        from games.pingpong.trajectory import predict_intercept
+        from utils.pingpong_runner import run_matches
+        from agents.ai_bots import PingPongSearchAI, RuleBasedPingPongAI
+        
+        # 推演不改动真实局面，且不超过 tick 预算
+        env = PingPongEnv(seed=0)
+        agent = PingPongSearchAI(player_id=2, tick_budget=300)
+        while predict_intercept(env.game.physics, 2) is None or predict_intercept(env.game.physics, 2)[0] > agent.window:
+            env.game.step({})
+        before = env.game.snapshot()
+        action = agent.get_action(None, env)
+        assert env.game.snapshot() == before
+        assert agent.plan is not None and 0 < agent.last_ticks <= 300
+        assert set(action) == {'move_right_x', 'move_right_y', 'right_force', 'right_spin'}
+        print(f"✓ 搜索在 tick 预算内完成（推演 {agent.last_ticks} tick）")
+        
+        outcome = run_matches(PingPongSearchAI(player_id=1), RuleBasedPingPongAI("rule", 2), 2, seed=7)
+        assert outcome['summary']['left_wins'] == 2
+        print(f"✓ 战胜规则 AI: {outcome['summary']['score_distribution']}")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 搜索 AI 测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_parallel_tournament():
+    """测试多进程锦标赛"""
+    print("\n=== 测试多进程锦标赛 ===")
+    
+    try:
+        import pickle
+        from utils.parallel_tournament import Spec, AgentSpec, MatchJob, parallel_tournament
+        
+        env_spec = Spec('games.gomoku:GomokuEnv', board_size=7, win_length=4)
+        agent_specs = [AgentSpec('agents:RandomBot', 'random_a'),
+                       AgentSpec('agents:RandomBot', 'random_b'),
+                       AgentSpec('examples.simple_ai_examples:ImprovedRandomBot', 'improved')]
+        job = MatchJob((0, 1), 0, 0, env_spec, agent_specs[0], agent_specs[1], 42)
+        assert pickle.loads(pickle.dumps(job)).key == ((0, 1), 0, 0)
+        print("✓ 任务可序列化")
+        
+        # 结果与进程数、完成顺序无关
+        single = parallel_tournament(env_spec, agent_specs, 6, workers=1, seed=1, verbose=False)
+        multi = parallel_tournament(env_spec, agent_specs, 6, workers=2, seed=1, verbose=False)
+        games = lambda r: [[(g['game'], g['winner'], g['moves']) for g in m['games']] for m in r['matches']]
+        assert games(single) == games(multi)
+        assert single['leaderboard'] == multi['leaderboard']
+        assert sum(stats['games'] for _, stats in single['leaderboard']) == 2 * 3 * 6
+        print("✓ 单进程与多进程结果一致")
+        
+        # 出错的局（MinimaxBot 不支持 7x7 棋盘）不当作和棋
+        broken = parallel_tournament(env_spec, [agent_specs[0], AgentSpec('agents:MinimaxBot', 'broken')], 4,
+                                     workers=1, verbose=False)
+        assert broken['errors'] == 4 and broken['matches'] == []
+        assert all(stats['games'] == 0 for _, stats in broken['ratings'])
+        print("✓ 出错的局单独计数")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 多进程锦标赛测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_result_log():
+    """测试流式结果日志与断点续跑"""
+    print("\n=== 测试结果日志 ===")
+    
+    try:
+        import os
+        import json
+        import tempfile
+        from games.gomoku import GomokuEnv
+        from agents import RandomBot
+        from utils.game_utils import evaluate_agents
+        from utils.result_log import read_results
+        from utils.game_records import GameRecordReader
+        from utils.parallel_tournament import Spec, AgentSpec, parallel_tournament
+        
+        env = GomokuEnv(board_size=7, win_length=4)
+        agent1 = RandomBot(name="随机Bot1", player_id=1)
+        agent2 = RandomBot(name="随机Bot2", player_id=2)
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.jsonl")
+            results = evaluate_agents(env, agent1, agent2, num_games=4, log_path=path)
+            assert results['games'] == []
+            records = list(read_results(path))
+            assert [r['game'] for r in records] == [0, 1, 2, 3]
+            
+            # 模拟崩溃：只保留前两局，末尾留半行
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(''.join(json.dumps(r) + '\n' for r in records[:2]) + '{"pairing": ["随')
+            resumed = evaluate_agents(env, agent1, agent2, num_games=4, log_path=path, resume=True)
+            summary = resumed['summary']
+            assert summary['agent1_wins'] + summary['agent2_wins'] + summary['draws'] == 4
+            assert [r['game'] for r in read_results(path)] == [0, 1, 2, 3]
+            print("✓ 续跑跳过已完成的局并截掉残缺行")
+            
+            # 中途被打断（KeyboardInterrupt 不被逐局的异常处理捕获）时日志与记录文件照样关闭
+            class InterruptingBot(RandomBot):
+                def get_action(self, observation, env):
+                    if env.game.move_count <= 1 and self.moves > 1:  # 下一局的第一步
+                        raise KeyboardInterrupt
+                    self.moves += 1
+                    return super().get_action(observation, env)
+            
+            interrupted = InterruptingBot(name="打断Bot", player_id=1)
+            interrupted.moves = 0
+            log_path, record_path = os.path.join(tmp, "interrupted.jsonl"), os.path.join(tmp, "interrupted.bin")
+            try:
+                evaluate_agents(env, interrupted, agent2, num_games=4, log_path=log_path, record_path=record_path)
+                assert False, "应当被打断"
+            except KeyboardInterrupt:
+                # 仍持有 traceback（及其中的帧），文件不会被垃圾回收顺带关闭
+                assert [r['game'] for r in read_results(log_path)] == [0]
+                reader = GameRecordReader(record_path)
+                assert len(reader) == 1
+                reader.close()
+            print("✓ 被打断时关闭日志与记录文件")
+            
+            # 锦标赛续跑：已完成的局不再重下，排行榜与一次跑完一致
+            env_spec = Spec('games.gomoku:GomokuEnv', board_size=7, win_length=4)
+            specs = [AgentSpec('agents:RandomBot', 'a'), AgentSpec('agents:RandomBot', 'b'),
+                     AgentSpec('agents:RandomBot', 'c')]
+            full = parallel_tournament(env_spec, specs, 4, workers=1, verbose=False)
+            log_path = os.path.join(tmp, "tournament.jsonl")
+            parallel_tournament(env_spec, specs[:2], 4, workers=1, verbose=False, log_path=log_path)
+            # 最后一局记为出错：续跑时应重下，而不是当作和棋
+            records = list(read_results(log_path))
+            records[-1].update(error="RuntimeError()", winner=None, winner_name=None)
+            with open(log_path, 'w', encoding='utf-8') as f:
+                f.write(''.join(json.dumps(r) + '\n' for r in records))
+            played = []
+            resumed = parallel_tournament(env_spec, specs, 4, workers=1, verbose=False, log_path=log_path,
+                                          resume=True, on_result=played.append)
+            assert len(played) == 9
+            assert resumed['leaderboard'] == full['leaderboard']
+            assert len(list(read_results(log_path))) == 13
+            
+            # 换智能体顺序续跑：按名字识别已下的局，不重下也不重复计入
+            reorder_path = os.path.join(tmp, "reorder.jsonl")
+            parallel_tournament(env_spec, specs[:2], 4, workers=1, verbose=False, log_path=reorder_path)
+            played = []
+            reordered = parallel_tournament(env_spec, [specs[1], specs[0]], 4, workers=1, verbose=False,
+                                            log_path=reorder_path, resume=True, on_result=played.append)
+            assert played == [] and len(reordered['matches']) == 1
+            assert reordered['matches'][0]['summary']['total_games'] == 4
+            assert reordered['leaderboard'] == parallel_tournament(env_spec, specs[:2], 4, workers=1,
+                                                                   verbose=False)['leaderboard']
+        print("✓ 锦标赛续跑结果与一次跑完一致")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 结果日志测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_ratings():
+    """测试等级分"""
+    print("\n=== 测试等级分 ===")
+    
+    try:
+        import os
+        import tempfile
+        import numpy as np
+        from utils.ratings import ResultTable, EloRating, bradley_terry, rating_leaderboard
+        from utils.result_log import ResultLog
+        
+        # 由已知等级分生成的大量对局应还原出原等级分，且置信区间覆盖真值
+        rng = np.random.default_rng(0)
+        true = np.array([0.0, 100.0, 200.0, -150.0])
+        table = ResultTable([f"bot{i}" for i in range(4)])
+        for i in range(4):
+            for j in range(i + 1, 4):
+                p = 1 / (1 + 10 ** ((true[j] - true[i]) / 400))
+                table.add(f"bot{i}", f"bot{j}", rng.binomial(20000, p), 20000)
+        ratings, stderr = bradley_terry(table)
+        error = (ratings - ratings.mean()) - (true - true.mean())
+        assert np.all(np.abs(error) < 4 * stderr) and np.all(stderr < 10)
+        board = rating_leaderboard(table)
+        assert [name for name, _ in board] == ['bot2', 'bot1', 'bot0', 'bot3']
+        assert all(stats['low'] < stats['rating'] < stats['high'] for _, stats in board)
+        print("✓ Bradley-Terry 还原已知等级分")
+        
+        # 全胜时等级分仍有限
+        sweep = ResultTable()
+        sweep.add('strong', 'weak', 10, 10)
+        ratings, _ = bradley_terry(sweep)
+        assert np.all(np.isfinite(ratings)) and ratings[0] > ratings[1]
+        
+        # 增量读取日志：只读新增的完整行
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.jsonl")
+            log_table = ResultTable()
+            with ResultLog(path) as log:
+                log.write({'pairing': ['a', 'b'], 'game': 0, 'winner_name': 'a'})
+                log.write({'pairing': ['a', 'b'], 'game': 1, 'winner_name': None})
+            assert log_table.update_from_log(path) == 2
+            with ResultLog(path) as log:
+                log.write({'pairing': ['b', 'c'], 'game': 0, 'winner_name': 'c'})
+            assert log_table.update_from_log(path) == 1
+            assert log_table.names == ['a', 'b', 'c']
+            assert log_table.scores[0, 1] == 1.5 and log_table.games.sum() == 6
+        print("✓ 增量读取结果日志")
+        
+        elo = EloRating(k=32)
+        elo.update('a', 'b', 1.0)
+        assert elo.rating('a') == 1516 and elo.rating('b') == 1484
+        print("✓ Elo 更新正确")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 等级分测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_sprt():
+    """测试 SPRT 提前结束"""
+    print("\n=== 测试 SPRT ===")
+    
+    try:
+        import os
+        import json
+        import math
+        import tempfile
+        from games.gomoku import GomokuEnv
+        from agents import RandomBot, MinimaxBot
+        from examples.simple_ai_examples import RuleBasedGomokuBot
+        from utils.game_utils import evaluate_agents
+        from utils.parallel_tournament import Spec, AgentSpec, sprt_match
+        from utils.result_log import read_results
+        from utils.sprt import SPRT
+        
+        sprt = SPRT(0, 50, alpha=0.05, beta=0.1)
+        assert math.isclose(sprt.upper, math.log(0.9 / 0.05)) and math.isclose(sprt.lower, math.log(0.1 / 0.95))
+        for scores in [(1, 0.5), (0, 1), (0.5, 0.5), (1, 1)]:
+            sprt.add_pair(*scores)
+        assert sprt.pentanomial == [0, 0, 2, 1, 1] and sprt.pairs == 4
+        assert sprt.decision() is None
+        
+        # 全部一胜一负（先后手决定胜负）应判为不更强，全胜应判为更强
+        even, sweep = SPRT(0, 50), SPRT(0, 50)
+        while even.decision() is None:
+            even.add_pair(1, 0)
+        while sweep.decision() is None:
+            sweep.add_pair(1, 1)
+        assert even.decision() == 'H0' and sweep.decision() == 'H1'
+        print("✓ 五项分布与判定边界正确")
+        
+        env = GomokuEnv(board_size=7, win_length=4)
+        results = evaluate_agents(env, RuleBasedGomokuBot("rule", 1), RandomBot("random", 2), 200,
+                                  sprt=SPRT(0, 100))
+        summary = results['summary']
+        assert summary['sprt']['decision'] == 'H1'
+        assert summary['total_games'] < 200 and summary['total_games'] == 2 * summary['sprt']['pairs']
+        print(f"✓ evaluate_agents 在第 {summary['total_games']} 局提前结束")
+        
+        env_spec = Spec('games.gomoku:GomokuEnv', board_size=7, win_length=4)
+        parallel = sprt_match(env_spec, AgentSpec('agents:RandomBot', 'random'),
+                              AgentSpec('examples.simple_ai_examples:RuleBasedGomokuBot', 'rule'),
+                              SPRT(0, 100), max_pairs=100, workers=2, verbose=False)
+        assert parallel['sprt']['decision'] == 'H0' and parallel['games'] < 200
+        print(f"✓ 多进程 SPRT 在第 {parallel['games']} 局提前结束")
+        
+        # 单进程与多进程按同一 seed 派生每对的种子，逐局结果一致；出错的局不计入胜负与检验
+        with tempfile.TemporaryDirectory() as tmp:
+            serial_path, parallel_path = os.path.join(tmp, "serial.jsonl"), os.path.join(tmp, "parallel.jsonl")
+            evaluate_agents(env, RandomBot("a", 1), RandomBot("b", 2), 8, sprt=SPRT(0, 5), seed=3,
+                            log_path=serial_path)
+            sprt_match(env_spec, AgentSpec('agents:RandomBot', 'a'), AgentSpec('agents:RandomBot', 'b'),
+                       SPRT(0, 5), max_pairs=4, workers=1, seed=3, verbose=False, log_path=parallel_path)
+            serial = [(r['game'], r['winner'], r['moves']) for r in read_results(serial_path)]
+            assert serial == sorted((r['game'], r['winner'], r['moves']) for r in read_results(parallel_path))
+        # 7x7 棋盘上 MinimaxBot 必然出错
+        summary = evaluate_agents(env, MinimaxBot("minimax", 1), RandomBot("random", 2), 6,
+                                  sprt=SPRT(0, 100))['summary']
+        assert summary['errors'] == 6 and summary['draws'] == 0 and summary['total_games'] == 0
+        assert summary['sprt']['pairs'] == 0
+        print("✓ 单进程 SPRT 与 sprt_match 种子一致，出错的局不计入")
+        
+        # 续跑：日志里已有的局计入检验，只补下缺失的局，日志中不出现重复的局
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "sprt.jsonl")
+            specs = (AgentSpec('agents:RandomBot', 'random'),
+                     AgentSpec('examples.simple_ai_examples:RuleBasedGomokuBot', 'rule'))
+            first = sprt_match(env_spec, *specs, SPRT(0, 100), workers=1, verbose=False, log_path=path)
+            records = list(read_results(path))
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(''.join(json.dumps(r) + '\n' for r in records[:3]))
+            played = []
+            resumed = sprt_match(env_spec, *specs, SPRT(0, 100), workers=1, verbose=False, log_path=path,
+                                 resume=True, on_result=played.append)
+            assert resumed['sprt'] == first['sprt'] and len(played) == len(records) - 3
+            games = [r['game'] for r in read_results(path)]
+            assert sorted(games) == list(range(len(records)))
+            played = []
+            sprt_match(env_spec, *specs, SPRT(0, 100), workers=2, verbose=False, log_path=path,
+                       resume=True, on_result=played.append)
+            assert played == []
+        print("✓ SPRT 续跑不重复已记录的局")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ SPRT 测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_adaptive_pairing():
+    """测试自适应配对"""
+    print("\n=== 测试自适应配对 ===")
+    
+    try:
+        import numpy as np
+        from utils.adaptive_pairing import AdaptiveScheduler
+        from utils.ratings import bradley_terry
+        from utils.parallel_tournament import Spec, AgentSpec, adaptive_tournament
+        
+        names = [f"bot{i}" for i in range(8)]
+        true = np.array([0.0, 40.0, 80.0, 120.0, 400.0, 440.0, -400.0, -440.0])
+        scheduler = AdaptiveScheduler(names, target_stderr=60)
+        
+        # 没有结果时第一批应让每名智能体各下一局
+        first = scheduler.next_pairs(4)
+        assert sorted(i for pair in first for i in pair[:2]) == list(range(8))
+        
+        rng = np.random.default_rng(0)
+        chosen = []
+        batch = first
+        while True:
+            for i, j, game in batch:
+                p = 1 / (1 + 10 ** ((true[j] - true[i]) / 400))
+                winner = names[i] if rng.random() < p else names[j]
+                scheduler.add_result({'pairing': [names[i], names[j]], 'game': game, 'winner_name': winner})
+                chosen.append(abs(true[i] - true[j]))
+            if scheduler.converged():
+                break
+            batch = scheduler.next_pairs(4)
+        assert scheduler.stderr().max() <= 60 and scheduler.pending.sum() == 0
+        # 实力接近的对阵下得更多
+        all_pairs = [abs(true[i] - true[j]) for i in range(8) for j in range(i + 1, 8)]
+        assert np.mean(chosen) < np.mean(all_pairs)
+        ratings, stderr = bradley_terry(scheduler.table)
+        assert np.all(np.abs((ratings - ratings.mean()) - (true - true.mean())) < 4 * stderr)
+        print(f"✓ {scheduler.games} 局后标准误差达标")
+        
+        env_spec = Spec('games.gomoku:GomokuEnv', board_size=7, win_length=4)
+        agent_specs = [AgentSpec('agents:RandomBot', 'random_a'),
+                       AgentSpec('agents:RandomBot', 'random_b'),
+                       AgentSpec('examples.simple_ai_examples:ImprovedRandomBot', 'improved')]
+        run = lambda: adaptive_tournament(env_spec, agent_specs, target_stderr=80, workers=1, seed=3, verbose=False)
+        result = run()
+        assert max(result['stderr'].values()) <= 80
+        assert sum(m['summary']['total_games'] for m in result['matches']) == result['games']
+        assert result['leaderboard'] == run()['leaderboard']
+        print(f"✓ 自适应锦标赛 {result['games']} 局完成，单进程可复现")
+        
+        # 出错的局（MinimaxBot 不支持 7x7 棋盘）不计入胜负与等级分，两边的局数一致
+        broken = agent_specs[:2] + [AgentSpec('agents:MinimaxBot', 'broken')]
+        result = adaptive_tournament(env_spec, broken, target_stderr=10, max_games=30, workers=1, verbose=False)
+        assert result['errors'] > 0 and result['games'] + result['errors'] == 30
+        assert sum(m['summary']['total_games'] for m in result['matches']) == result['games']
+        print("✓ 出错的局单独计数")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 自适应配对测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
 def run_all_tests():
     """运行所有测试"""
     print("双人游戏AI框架 - 项目测试")
@@ -262,7 +1527,31 @@ def run_all_tests():
         test_agents,
         test_game_play,
         test_evaluation,
-        test_custom_agents
+        test_custom_agents,
+        test_snapshot_restore,
+        test_gomoku_symmetry,
+        test_game_records,
+        test_position_db,
+        test_opening_book,
+        test_snake_occupancy_grid,
+        test_snake_food_spawning,
+        test_snake_state_view,
+        test_vec_snake_env,
+        test_snake_step_joint,
+        test_snake_flood_fill,
+        test_snake_pathfinding,
+        test_snake_search_bot,
+        test_snake_voronoi,
+        test_pingpong_physics,
+        test_vec_pingpong_env,
+        test_pingpong_trajectory,
+        test_pingpong_match_runner,
+        test_pingpong_search_ai,
+        test_parallel_tournament,
+        test_result_log,
+        test_ratings,
+        test_sprt,
+        test_adaptive_pairing
     ]
     
     passed = 0
@@ -0,0 +1,117 @@
+"""
+自适应配对
+循环赛的局数是 O(N^2)，且大部分花在结果早已明确的悬殊对阵上。这里每次按当前
+Bradley-Terry 估计挑选"下一局最能缩小置信区间"的对阵，直到所有智能体的等级分标准误差
+都低于目标。
+
+对阵 (i, j) 一局的 Fisher 信息为 w = p(1-p)（p 为当前估计的胜率，实力接近时最大），
+令 u = e_i - e_j、C 为等级分协方差，下完这一局后协方差按秩一更新
+    C' = C - w C u uᵀ C / (1 + w uᵀ C u)
+于是还没达标的智能体（对角权重 D）的方差总和减少
+    w (C u)ᵀ D (C u) / (1 + w uᵀ C u)
+实力接近（w 大）、置信区间宽（C 大）的对阵得分高。一批对阵逐个贪心挑选，每选一个就把它
+按上式计入 C，同一批里不会反复挑同一对；已派发未返回的对局也这样计入（期望信息量与胜负无关）。
+"""
+
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from utils.ratings import ELO_PER_NAT, ResultTable, bradley_terry_fit
+
+
+class AdaptiveScheduler:
+    """按信息量挑选对阵，直到全部等级分标准误差（Elo）不超过 target_stderr"""
+
+    def __init__(self, names: Iterable[str], target_stderr: float = 30.0, prior: float = 1.0):
+        """
+        Args:
+            target_stderr: 目标标准误差（Elo，相对全体平均值）
+            prior: 传给 Bradley-Terry 的先验虚拟局数
+        """
+        self.table = ResultTable(names)
+        self.names = self.table.names
+        self.target_stderr = target_stderr
+        self.prior = prior
+        n = len(self.names)
+        self.scheduled = np.zeros((n, n), dtype=int)  # scheduled[i, j]（i < j）：已派发局数，即下一局的局号
+        self.pending = np.zeros((n, n), dtype=int)    # 已派发、结果未返回
+        self._fit = None
+
+    @property
+    def games(self) -> int:
+        """已返回结果的局数"""
+        return int(self.table.games.sum() // 2)
+
+    def add_result(self, result: Dict[str, Any]):
+        """计入一局结果（parallel_tournament.play_job / 结果日志格式）"""
+        i, j = sorted((self.table.index[result['pairing'][0]], self.table.index[result['pairing'][1]]))
+        if self.pending[i, j] > 0:
+            self.pending[i, j] -= 1
+        self.scheduled[i, j] = max(self.scheduled[i, j], result['game'] + 1)
+        self.table.add_record(result)
+        self._fit = None
+
+    def fit(self) -> Tuple[np.ndarray, np.ndarray]:
+        """当前的 (对数强度, 协方差)，有新结果时才重新拟合"""
+        if self._fit is None:
+            self._fit = bradley_terry_fit(self.table, self.prior)
+        return self._fit
+
+    def stderr(self) -> np.ndarray:
+        """每名智能体等级分的标准误差（Elo）"""
+        _, covariance = self.fit()
+        return np.sqrt(np.maximum(np.diag(covariance), 0.0)) * ELO_PER_NAT
+
+    def converged(self) -> bool:
+        return bool(np.all(self.stderr() <= self.target_stderr))
+
+    def next_pairs(self, count: int) -> List[Tuple[int, int, int]]:
+        """
+        挑选接下来 count 局并记为已派发
+
+        Returns:
+            list: [(i, j, 局号), ...]，i < j
+        """
+        n = len(self.names)
+        if n < 2 or count <= 0:
+            return []
+        theta, covariance = self.fit()
+        covariance = covariance.copy()
+        q = 1.0 / (1.0 + np.exp(theta[None, :] - theta[:, None]))
+        weight = q * (1 - q)
+        for i, j in zip(*np.nonzero(self.pending)):
+            _observe(covariance, i, j, self.pending[i, j] * weight[i, j])
+
+        upper = np.triu(np.ones((n, n), dtype=bool), 1)
+        target_var = (self.target_stderr / ELO_PER_NAT) ** 2
+        pairs = []
+        for _ in range(count):
+            # 只为还没达标的智能体争取信息；在途对局已足够时退回到缩小全体方差
+            focus = (np.diag(covariance) > target_var).astype(float)
+            if not focus.any():
+                focus[:] = 1.0
+            gain = _variance_reduction(covariance, weight, focus)
+            gain[~upper] = -np.inf
+            i, j = np.unravel_index(np.argmax(gain), gain.shape)
+            _observe(covariance, i, j, weight[i, j])
+            pairs.append((int(i), int(j), int(self.scheduled[i, j])))
+            self.scheduled[i, j] += 1
+            self.pending[i, j] += 1
+        return pairs
+
+
+def _variance_reduction(covariance: np.ndarray, weight: np.ndarray, focus: np.ndarray) -> np.ndarray:
+    """每个对阵再下一局后，focus 加权的方差总和的期望减少量（N×N）"""
+    spread = covariance @ (focus[:, None] * covariance)  # C D C
+    diag_s, diag_c = np.diag(spread), np.diag(covariance)
+    numerator = diag_s[:, None] + diag_s[None, :] - 2 * spread
+    denominator = diag_c[:, None] + diag_c[None, :] - 2 * covariance
+    return weight * numerator / (1.0 + weight * denominator)
+
+
+def _observe(covariance: np.ndarray, i: int, j: int, information: float):
+    """把对阵 (i, j) 信息量为 information 的观测按秩一更新计入协方差（原地修改）"""
+    column = covariance[:, i] - covariance[:, j]
+    variance = column[i] - column[j]
+    covariance -= information * np.outer(column, column) / (1.0 + information * variance)
@@ -0,0 +1,288 @@
+"""
+紧凑二进制对局记录
+文件格式：
+    文件头  b'MPGR' + uint16 版本号
+    记录    uint32 记录长度 + 记录头 + 两个玩家名 + 打包的走子数组
+记录头（小端）：游戏类型 uint8、棋盘大小 uint16、胜者 int8（0 为平局）、
+局号 uint32、步数 uint32、对局用时 float64、时间戳 float64。
+走子数组依次为：玩家 uint8[n]、动作编码 uint16[n]、奖励 float16[n]。
+"""
+
+import json
+import mmap
+import os
+import struct
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+MAGIC = b'MPGR'
+VERSION = 1
+FILE_HEADER = struct.Struct('<4sH')
+RECORD_LEN = struct.Struct('<I')
+RECORD_HEADER = struct.Struct('<BHbIIdd')
+
+GAME_TYPES = {'gomoku': 1, 'snake': 2, 'pingpong': 3}
+GAME_TYPE_NAMES = {code: name for name, code in GAME_TYPES.items()}
+
+# 与 SnakeGame.get_action_space() 顺序一致
+SNAKE_ACTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+PINGPONG_MOVE_KEYS = ['move_left_x', 'move_left_y', 'move_right_x', 'move_right_y']
+PINGPONG_FLAG_KEYS = ['left_force', 'right_force', 'left_spin', 'right_spin']
+
+_GAME_CLASS_TYPES = {'GomokuGame': 'gomoku', 'SnakeGame': 'snake', 'PingPongGame': 'pingpong'}
+
+
+def game_type_of(env) -> str:
+    """根据环境中的游戏类推断游戏类型"""
+    return _GAME_CLASS_TYPES[type(env.game).__name__]
+
+
+# ----------------------------------------------------------------------
+# 动作编码
+# ----------------------------------------------------------------------
+def encode_action(game_type: str, action: Any, board_size: int) -> int:
+    """把动作编码为 uint16"""
+    if game_type == 'gomoku':
+        return int(action[0]) * board_size + int(action[1])
+    if game_type == 'snake':
+        return SNAKE_ACTIONS.index(tuple(action))
+    if game_type == 'pingpong':
+        code = 0
+        for i, key in enumerate(PINGPONG_MOVE_KEYS):
+            code |= (int(action.get(key, 0)) + 1) << (2 * i)
+        for i, key in enumerate(PINGPONG_FLAG_KEYS):
+            if action.get(key, False):
+                code |= 1 << (8 + i)
+        return code
+    raise ValueError(f"不支持的游戏类型: {game_type}")
+
+
+def decode_action(game_type: str, code: int, board_size: int) -> Any:
+    """encode_action 的逆操作"""
+    code = int(code)
+    if game_type == 'gomoku':
+        return divmod(code, board_size)
+    if game_type == 'snake':
+        return SNAKE_ACTIONS[code]
+    if game_type == 'pingpong':
+        action = {}
+        for i, key in enumerate(PINGPONG_MOVE_KEYS):
+            action[key] = ((code >> (2 * i)) & 3) - 1
+        for i, key in enumerate(PINGPONG_FLAG_KEYS):
+            action[key] = bool(code >> (8 + i) & 1)
+        return action
+    raise ValueError(f"不支持的游戏类型: {game_type}")
+
+
+# ----------------------------------------------------------------------
+# 记录
+# ----------------------------------------------------------------------
+class GameRecord:
+    """一局对局的紧凑表示，走子保存在 numpy 数组中（读取时为 mmap 视图）"""
+
+    def __init__(self, game_type: str, board_size: int, players: Tuple[str, str],
+                 winner: Optional[int], move_players: np.ndarray, move_codes: np.ndarray,
+                 rewards: np.ndarray, game_num: int = 0, game_time: float = 0.0,
+                 timestamp: float = None):
+        self.game_type = game_type
+        self.board_size = board_size
+        self.players = tuple(players)
+        self.winner = winner
+        self.move_players = move_players
+        self.move_codes = move_codes
+        self.rewards = rewards
+        self.game_num = game_num
+        self.game_time = game_time
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+    def __len__(self) -> int:
+        return len(self.move_codes)
+
+    def actions(self) -> List[Any]:
+        """解码后的动作列表"""
+        return [decode_action(self.game_type, code, self.board_size) for code in self.move_codes]
+
+    def to_bytes(self) -> bytes:
+        """序列化为一条记录（不含长度前缀）"""
+        header = RECORD_HEADER.pack(
+            GAME_TYPES[self.game_type], self.board_size, self.winner or 0,
+            self.game_num, len(self), self.game_time, self.timestamp
+        )
+        names = b''
+        for name in self.players:
+            raw = name.encode('utf-8')[:255]
+            names += bytes([len(raw)]) + raw
+        return b''.join((
+            header, names,
+            np.asarray(self.move_players, dtype=np.uint8).tobytes(),
+            np.asarray(self.move_codes, dtype='<u2').tobytes(),
+            np.asarray(self.rewards, dtype='<f2').tobytes(),
+        ))
+
+    @classmethod
+    def from_buffer(cls, buf, offset: int = 0) -> 'GameRecord':
+        """从缓冲区（bytes 或 mmap）解析记录，走子数组为零拷贝视图"""
+        (game_type, board_size, winner, game_num, n,
+         game_time, timestamp) = RECORD_HEADER.unpack_from(buf, offset)
+        pos = offset + RECORD_HEADER.size
+        players = []
+        for _ in range(2):
+            length = buf[pos]
+            players.append(bytes(buf[pos + 1:pos + 1 + length]).decode('utf-8'))
+            pos += 1 + length
+        move_players = np.frombuffer(buf, dtype=np.uint8, count=n, offset=pos)
+        pos += n
+        move_codes = np.frombuffer(buf, dtype='<u2', count=n, offset=pos)
+        pos += 2 * n
+        rewards = np.frombuffer(buf, dtype='<f2', count=n, offset=pos)
+        return cls(GAME_TYPE_NAMES[game_type], board_size, tuple(players), winner or None,
+                   move_players, move_codes, rewards, game_num, game_time, timestamp)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为 evaluate_agents 使用的单局 JSON 结构"""
+        names = {1: self.players[0], 2: self.players[1]}
+        moves = [
+            {'player': int(p), 'agent': names[int(p)], 'action': action, 'reward': float(r)}
+            for p, action, r in zip(self.move_players, self.actions(), self.rewards)
+        ]
+        return {
+            'game_num': self.game_num,
+            'players': names,
+            'moves': moves,
+            'winner': self.winner,
+            'total_moves': len(self),
+            'game_time': self.game_time,
+        }
+
+    @classmethod
+    def from_dict(cls, game_result: Dict[str, Any], game_type: str, board_size: int,
+                  players: Tuple[str, str] = None) -> 'GameRecord':
+        """从 evaluate_agents 的单局 JSON 结构构造记录"""
+        moves = game_result.get('moves', [])
+        if players is None:
+            names = game_result.get('players') or {}
+            players = (names.get(1, names.get('1', '')), names.get(2, names.get('2', '')))
+            if not all(players):
+                seen = {m['player']: m.get('agent', '') for m in moves}
+                players = (players[0] or seen.get(1, ''), players[1] or seen.get(2, ''))
+        return cls(
+            game_type, board_size, players, game_result.get('winner'),
+            np.array([m['player'] for m in moves], dtype=np.uint8),
+            np.array([encode_action(game_type, m['action'], board_size) for m in moves], dtype=np.uint16),
+            np.array([m.get('reward', 0.0) for m in moves], dtype=np.float16),
+            game_num=game_result.get('game_num', 0),
+            game_time=game_result.get('game_time', 0.0),
+        )
+
+
+# ----------------------------------------------------------------------
+# 读写
+# ----------------------------------------------------------------------
+class GameRecordWriter:
+    """追加写入对局记录"""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(FILE_HEADER.pack(MAGIC, VERSION))
+
+    def write(self, record: GameRecord):
+        data = record.to_bytes()
+        self._file.write(RECORD_LEN.pack(len(data)))
+        self._file.write(data)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class GameRecordReader:
+    """内存映射读取对局记录，打开时只扫描长度前缀建立偏移索引"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        self.offsets = self._build_index(size)
+
+    def _build_index(self, size: int) -> np.ndarray:
+        if size == 0:
+            return np.zeros(0, dtype=np.int64)
+        magic, version = FILE_HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"不是对局记录文件: {self.path}")
+        if version != VERSION:
+            raise ValueError(f"不支持的记录版本: {version}")
+        offsets = []
+        pos = FILE_HEADER.size
+        while pos + RECORD_LEN.size <= size:
+            (length,) = RECORD_LEN.unpack_from(self._mmap, pos)
+            if pos + RECORD_LEN.size + length > size:
+                break  # 末尾不完整的记录（写入中断）
+            offsets.append(pos + RECORD_LEN.size)
+            pos += RECORD_LEN.size + length
+        return np.array(offsets, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, index: int) -> GameRecord:
+        return GameRecord.from_buffer(self._mmap, int(self.offsets[index]))
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        for offset in self.offsets:
+            yield GameRecord.from_buffer(self._mmap, int(offset))
+
+    def close(self):
+        if isinstance(self._mmap, mmap.mmap):
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # 仍有记录数组引用该映射，随其被回收时释放
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# ----------------------------------------------------------------------
+# 与 JSON 互转
+# ----------------------------------------------------------------------
+def json_to_records(json_path: str, record_path: str, game_type: str, board_size: int,
+                    players: Tuple[str, str] = None) -> int:
+    """把 evaluate_agents 保存的 JSON 结果转换为二进制记录，返回写入局数"""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        results = json.load(f)
+    games = results['games'] if isinstance(results, dict) else results
+    with GameRecordWriter(record_path) as writer:
+        for game_result in games:
+            writer.write(GameRecord.from_dict(game_result, game_type, board_size, players))
+    return len(games)
+
+
+def records_to_json(record_path: str, json_path: str) -> int:
+    """把二进制记录转换回 JSON（{'games': [...]}），返回局数"""
+    with GameRecordReader(record_path) as reader:
+        games = [record.to_dict() for record in reader]
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump({'games': games}, f, ensure_ascii=False, indent=2)
+    return len(games)
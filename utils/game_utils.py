@@ -2,10 +2,14 @@
 游戏工具函数
 """
 
+import random
 import time
 from typing import Dict, Any, List
 
-def evaluate_agents(env, agent1, agent2, num_games=10, save_results=False):
+import numpy as np
+
+def evaluate_agents(env, agent1, agent2, num_games=10, save_results=False, record_path=None,
+                    log_path=None, resume=False, sprt=None, seed=0):
     """
     评估两个智能体的对战结果
     
@@ -15,6 +19,16 @@ def evaluate_agents(env, agent1, agent2, num_games=10, save_results=False):
         agent2: 智能体2
         num_games: 游戏局数
         save_results: 是否保存结果
+        record_path: 若指定，则把每局以紧凑二进制格式追加到该文件
+        log_path: 若指定，每局结束把结果追加到该 JSONL 日志（utils.result_log），
+                  且不在内存中保留逐局走子，results['games'] 为空
+        resume: 与 log_path 一起使用，跳过日志中已有的局，其胜负计入统计（出错的局重下）
+        sprt: utils.sprt.SPRT 实例（检验 agent1 是否强于 agent2）；每下完一对（第 2k、2k+1 局，
+              先后手互换且使用相同的游戏随机种子）检验一次，得出结论即停止，
+              total_games 为实际局数，summary['sprt'] 为检验结果
+        seed: SPRT 模式下的基础种子，第 k 对的种子与 parallel_tournament.sprt_match 相同
+    
+    出错的局不计入胜负（summary['errors'] 为其局数），所在的对也不计入 sprt
     
     Returns:
         dict: 评估结果
@@ -26,93 +40,179 @@ def evaluate_agents(env, agent1, agent2, num_games=10, save_results=False):
             'agent1_wins': 0,
             'agent2_wins': 0,
             'draws': 0,
+            'errors': 0,
             'agent1_win_rate': 0.0,
             'agent2_win_rate': 0.0,
             'draw_rate': 0.0
         }
     }
     
-    for game_num in range(num_games):
-        # 重置环境
-        observation, info = env.reset()
-        
-        # 交替玩家顺序
-        if game_num % 2 == 0:
-            players = {1: agent1, 2: agent2}
+    writer = None
+    if record_path:
+        from utils.game_records import GameRecordWriter, GameRecord, game_type_of
+        writer = GameRecordWriter(record_path)
+        game_type = game_type_of(env)
+        board_size = getattr(env.game, 'board_size', 0)
+    
+    log = None
+    logged = {}
+    if log_path:
+        from utils.result_log import ResultLog, read_results
+        if resume:
+            for record in read_results(log_path):
+                if ('error' not in record and tuple(record['pairing']) == (agent1.name, agent2.name)
+                        and record['game'] < num_games):
+                    logged[record['game']] = record
+        log = ResultLog(log_path)
+    
+    pair_first = {}  # SPRT：每对第一局 agent1 的得分（出错为 None）
+    
+    def tally(game_num, winner, agent1_first, error=None):
+        """计入一局，返回 SPRT 是否已得出结论"""
+        if error is not None:
+            results['summary']['errors'] += 1
+            score = None
+        elif winner is None:
+            results['summary']['draws'] += 1
+            score = 0.5
+        elif (winner == 1) == agent1_first:
+            results['summary']['agent1_wins'] += 1
+            score = 1.0
         else:
-            players = {1: agent2, 2: agent1}
+            results['summary']['agent2_wins'] += 1
+            score = 0.0
+        if sprt is None:
+            return False
+        if game_num % 2 == 0:
+            pair_first[game_num // 2] = score
+            return False
+        if game_num // 2 not in pair_first:
+            return False
+        first = pair_first.pop(game_num // 2)
+        if first is None or score is None:
+            return False
+        sprt.add_pair(first, score)
+        return sprt.decision() is not None
+    
+    try:
+        for game_num in range(num_games):
+            if game_num in logged:
+                # 续跑：日志中已有的局只计入统计
+                if tally(game_num, logged[game_num]['winner'], logged[game_num]['seat'] == 0):
+                    break
+                continue
         
-        game_result = {
-            'game_num': game_num + 1,
-            'moves': [],
-            'winner': None,
-            'total_moves': 0,
-            'game_time': 0
-        }
+            # 重置环境（SPRT 模式下同一对的两局使用相同的随机种子）
+            if sprt is not None:
+                from utils.parallel_tournament import job_seed
+                pair_seed = job_seed(seed, (0, 1), game_num // 2)
+                random.seed(pair_seed)
+                np.random.seed(pair_seed)
+                if hasattr(env.game, 'seed'):
+                    env.game.seed(pair_seed)
+            observation, info = env.reset()
+        
+            # 交替玩家顺序
+            if game_num % 2 == 0:
+                players = {1: agent1, 2: agent2}
+            else:
+                players = {1: agent2, 2: agent1}
+        
+            game_result = {
+                'game_num': game_num + 1,
+                'players': {1: players[1].name, 2: players[2].name},
+                'moves': [],
+                'winner': None,
+                'total_moves': 0,
+                'game_time': 0
+            }
         
-        start_time = time.time()
-        move_count = 0
-        max_moves = 1000  # 防止无限循环
+            start_time = time.time()
+            move_count = 0
+            max_moves = 1000  # 防止无限循环
+            error = None
         
-        # 游戏循环
-        while not env.is_terminal() and move_count < max_moves:
-            current_player = env.game.current_player
-            current_agent = players[current_player]
+            # 游戏循环
+            while not env.is_terminal() and move_count < max_moves:
+                current_player = env.game.current_player
+                current_agent = players[current_player]
             
-            # 获取动作
-            try:
-                action = current_agent.get_action(observation, env)
-                if action is None:
-                    break
+                # 获取动作
+                try:
+                    action = current_agent.get_action(observation, env)
+                    if action is None:
+                        break
                 
-                # 执行动作
-                observation, reward, terminated, truncated, step_info = env.step(action)
+                    # 执行动作
+                    observation, reward, terminated, truncated, step_info = env.step(action)
                 
-                # 记录移动
-                game_result['moves'].append({
-                    'player': current_player,
-                    'agent': current_agent.name,
-                    'action': action,
-                    'reward': reward
-                })
+                    # 记录移动
+                    game_result['moves'].append({
+                        'player': current_player,
+                        'agent': current_agent.name,
+                        'action': action,
+                        'reward': reward
+                    })
                 
-                move_count += 1
+                    move_count += 1
                 
-                if terminated or truncated:
-                    break
+                    if terminated or truncated:
+                        break
                     
-            except Exception as e:
-                print(f"游戏 {game_num + 1} 中发生错误: {e}")
-                break
+                except Exception as e:
+                    print(f"游戏 {game_num + 1} 中发生错误: {e}")
+                    error = repr(e)
+                    break
         
-        # 记录游戏结果
-        game_result['total_moves'] = move_count
-        game_result['game_time'] = time.time() - start_time
-        game_result['winner'] = env.get_winner()
+            # 记录游戏结果
+            game_result['total_moves'] = move_count
+            game_result['game_time'] = time.time() - start_time
+            game_result['winner'] = env.get_winner()
+            if error is not None:
+                game_result['error'] = error
         
-        # 更新统计
-        winner = game_result['winner']
-        if winner == 1:
-            if game_num % 2 == 0:
-                results['summary']['agent1_wins'] += 1
-            else:
-                results['summary']['agent2_wins'] += 1
-        elif winner == 2:
-            if game_num % 2 == 0:
-                results['summary']['agent2_wins'] += 1
+            # 更新统计
+            winner = game_result['winner']
+            decided = tally(game_num, winner, game_num % 2 == 0, error)
+        
+            if writer is not None and error is None:
+                writer.write(GameRecord.from_dict(game_result, game_type, board_size))
+            if log is not None:
+                record = {
+                    'pairing': [agent1.name, agent2.name],
+                    'game': game_num,
+                    'seat': game_num % 2,
+                    'players': game_result['players'],
+                    'winner': winner,
+                    'winner_name': players[winner].name if winner in players else None,
+                    'moves': move_count,
+                    'game_time': game_result['game_time']
+                }
+                if error is not None:
+                    record['error'] = error
+                log.write(record)
             else:
-                results['summary']['agent1_wins'] += 1
-        else:
-            results['summary']['draws'] += 1
+                results['games'].append(game_result)
         
-        results['games'].append(game_result)
+            # 打印进度
+            if (game_num + 1) % max(1, num_games // 10) == 0:
+                print(f"已完成 {game_num + 1}/{num_games} 局游戏")
         
-        # 打印进度
-        if (game_num + 1) % max(1, num_games // 10) == 0:
-            print(f"已完成 {game_num + 1}/{num_games} 局游戏")
+            if decided:
+                print(f"SPRT 在第 {game_num + 1} 局得出结论: {sprt.decision()} ({sprt})")
+                break
+    finally:
+        if writer is not None:
+            writer.close()
+        if log is not None:
+            log.close()
     
-    # 计算胜率
-    total = results['summary']['total_games']
+    # 计算胜率（SPRT 提前结束时按实际局数）
+    summary = results['summary']
+    summary['total_games'] = summary['agent1_wins'] + summary['agent2_wins'] + summary['draws']
+    if sprt is not None:
+        summary['sprt'] = sprt.summary()
+    total = max(1, summary['total_games'])
     results['summary']['agent1_win_rate'] = results['summary']['agent1_wins'] / total
     results['summary']['agent2_win_rate'] = results['summary']['agent2_wins'] / total
     results['summary']['draw_rate'] = results['summary']['draws'] / total
@@ -199,7 +299,7 @@ def play_human_vs_ai(env, human_agent, ai_agent):
     print(f"总回合数: {move_count}")
 
 
-def tournament(env, agents, num_games_per_pair=10):
+def tournament(env, agents, num_games_per_pair=10, log_path=None, resume=False):
     """
     锦标赛模式，让多个智能体互相对战
     
@@ -207,6 +307,7 @@ def tournament(env, agents, num_games_per_pair=10):
         env: 游戏环境
         agents: 智能体列表
         num_games_per_pair: 每对智能体的对战局数
+        log_path / resume: 见 evaluate_agents
     
     Returns:
         dict: 锦标赛结果
@@ -227,7 +328,9 @@ def tournament(env, agents, num_games_per_pair=10):
             match_result = evaluate_agents(
                 env, agent1, agent2, 
                 num_games=num_games_per_pair, 
-                save_results=False
+                save_results=False,
+                log_path=log_path,
+                resume=resume
             )
             
             match_result['agent1_name'] = agent1.name
@@ -240,9 +343,28 @@ def tournament(env, agents, num_games_per_pair=10):
             print(f"平局率: {match_result['summary']['draw_rate']:.2%}")
     
     # 计算排行榜
-    agent_stats = {agent.name: {'wins': 0, 'losses': 0, 'draws': 0, 'games': 0} for agent in agents}
+    names = [agent.name for agent in agents]
+    results['leaderboard'] = build_leaderboard(names, results['matches'])
+    print_leaderboard(results['leaderboard'])
+    
+    # 考虑对手强度的等级分
+    from utils.ratings import ResultTable, rating_leaderboard, print_rating_leaderboard
+    results['ratings'] = rating_leaderboard(ResultTable.from_matches(names, results['matches']))
+    print_rating_leaderboard(results['ratings'])
+    
+    return results
+
+
+def build_leaderboard(agent_names, matches):
+    """
+    由对阵结果（evaluate_agents 格式，另含 agent1_name / agent2_name）计算按胜率排序的排行榜
+    
+    Returns:
+        list: [(智能体名, {'wins', 'losses', 'draws', 'games', 'win_rate'}), ...]
+    """
+    agent_stats = {name: {'wins': 0, 'losses': 0, 'draws': 0, 'games': 0} for name in agent_names}
     
-    for match in results['matches']:
+    for match in matches:
         agent1_name = match['agent1_name']
         agent2_name = match['agent2_name']
         
@@ -253,12 +375,12 @@ def tournament(env, agents, num_games_per_pair=10):
         agent_stats[agent1_name]['wins'] += agent1_wins
         agent_stats[agent1_name]['losses'] += agent2_wins
         agent_stats[agent1_name]['draws'] += draws
-        agent_stats[agent1_name]['games'] += num_games_per_pair
+        agent_stats[agent1_name]['games'] += match['summary']['total_games']
         
         agent_stats[agent2_name]['wins'] += agent2_wins
         agent_stats[agent2_name]['losses'] += agent1_wins
         agent_stats[agent2_name]['draws'] += draws
-        agent_stats[agent2_name]['games'] += num_games_per_pair
+        agent_stats[agent2_name]['games'] += match['summary']['total_games']
     
     # 计算胜率并排序
     for agent_name, stats in agent_stats.items():
@@ -268,13 +390,12 @@ def tournament(env, agents, num_games_per_pair=10):
             stats['win_rate'] = 0
     
     # 按胜率排序
-    leaderboard = sorted(agent_stats.items(), key=lambda x: x[1]['win_rate'], reverse=True)
-    results['leaderboard'] = leaderboard
-    
-    # 显示排行榜
+    return sorted(agent_stats.items(), key=lambda x: x[1]['win_rate'], reverse=True)
+
+
+def print_leaderboard(leaderboard):
+    """显示排行榜"""
     print("\n=== 锦标赛排行榜 ===")
     for rank, (agent_name, stats) in enumerate(leaderboard, 1):
         print(f"{rank}. {agent_name}: 胜率 {stats['win_rate']:.2%} "
-              f"({stats['wins']}胜 {stats['losses']}负 {stats['draws']}平)")
-    
-    return results 
\ No newline at end of file
+              f"({stats['wins']}胜 {stats['losses']}负 {stats['draws']}平)") 
\ No newline at end of file
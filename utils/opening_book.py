@@ -0,0 +1,231 @@
+"""
+五子棋开局库
+以对称规范 Zobrist 键为索引，每个局面只存一步推荐着法（规范坐标系下）。
+文件布局（小端）：
+    文件头    b'MPOB' + uint16 版本 + uint16 棋盘大小 + uint64 条目数
+    keys      uint64[条目数]，升序
+    entries   (move uint16, count uint32, score float32)
+开局库可以从自对弈记录中挖掘（build_from_records），
+也可以离线用深度搜索生成（build_from_search）。
+"""
+
+import os
+import struct
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from games.gomoku import zobrist
+from utils.game_records import GameRecordReader
+from utils.position_db import replay_canonical
+
+MAGIC = b'MPOB'
+VERSION = 1
+HEADER = struct.Struct('<4sHHQ')
+ENTRY_DTYPE = np.dtype([('move', '<u2'), ('count', '<u4'), ('score', '<f4')])
+
+
+class OpeningBook:
+    """只读开局库（内存映射）"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            magic, version, board_size, n = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"不是开局库文件: {path}")
+        if version != VERSION:
+            raise ValueError(f"不支持的开局库版本: {version}")
+        self.board_size = board_size
+        self.num_entries = n
+        if n:
+            self.keys = np.memmap(path, dtype='<u8', mode='r', offset=HEADER.size, shape=(n,))
+            self.entries = np.memmap(path, dtype=ENTRY_DTYPE, mode='r',
+                                     offset=HEADER.size + 8 * n, shape=(n,))
+        else:
+            self.keys = np.zeros(0, dtype='<u8')
+            self.entries = np.zeros(0, dtype=ENTRY_DTYPE)
+
+    def __len__(self) -> int:
+        return self.num_entries
+
+    def probe(self, position) -> Optional[Tuple[int, int]]:
+        """
+        查询推荐着法
+
+        Args:
+            position: GomokuGame 或棋盘数组
+
+        Returns:
+            position 坐标系下的着法；未收录、棋盘大小不符或该点已被占用时返回 None
+        """
+        board = position.board if hasattr(position, 'board') else position
+        if board.shape[0] != self.board_size or self.num_entries == 0:
+            return None
+        if hasattr(position, 'canonical_key'):
+            key, transform = position.canonical_key()
+        else:
+            key, transform = zobrist.board_canonical_key(board)
+        key = np.uint64(key)
+        i = int(np.searchsorted(self.keys, key))
+        if i >= self.num_entries or self.keys[i] != key:
+            return None
+        canon_move = divmod(int(self.entries[i]['move']), self.board_size)
+        move = zobrist.inverse_transform_move(canon_move, transform, self.board_size)
+        if board[move] != 0:
+            return None
+        return move
+
+
+def load_opening_book(book) -> Optional[OpeningBook]:
+    """Bot 构造参数的统一处理：接受 None、路径或 OpeningBook 实例"""
+    if book is None or isinstance(book, OpeningBook):
+        return book
+    return OpeningBook(book)
+
+
+def write_opening_book(path: str, board_size: int, book: Dict[int, Tuple[int, int, float]]):
+    """
+    写出开局库
+
+    Args:
+        book: {规范键: (规范坐标系下的着法编码, 样本数, 得分)}
+    """
+    keys = np.array(sorted(book), dtype=np.uint64)
+    entries = np.zeros(len(keys), dtype=ENTRY_DTYPE)
+    for i, key in enumerate(keys):
+        entries[i] = book[int(key)]
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, board_size, len(keys)))
+        f.write(keys.astype('<u8').tobytes())
+        f.write(entries.tobytes())
+
+
+# ----------------------------------------------------------------------
+# 从自对弈记录挖掘
+# ----------------------------------------------------------------------
+def build_from_records(record_paths: Union[str, Iterable[str]], book_path: str,
+                       max_plies: int = 8, min_games: int = 2) -> OpeningBook:
+    """
+    统计前 max_plies 手每个局面下各着法对走子方的得分率，取得分最高者入库
+
+    Args:
+        record_paths: 一个或多个二进制对局记录文件
+        max_plies: 只考虑每局的前若干手
+        min_games: 着法至少出现的局数
+    """
+    if isinstance(record_paths, str):
+        record_paths = [record_paths]
+
+    board_size = None
+    key_parts, move_parts, score_parts = [], [], []
+    for path in record_paths:
+        with GameRecordReader(path) as reader:
+            for record in reader:
+                if record.game_type != 'gomoku' or len(record) == 0:
+                    continue
+                if board_size is None:
+                    board_size = record.board_size
+                elif record.board_size != board_size:
+                    raise ValueError("所有对局的棋盘大小必须一致")
+                keys, moves = replay_canonical(record, max_plies)
+                movers = np.asarray(record.move_players[:len(keys)])
+                if record.winner:
+                    scores = (movers == record.winner).astype(np.float32)
+                else:
+                    scores = np.full(len(keys), 0.5, dtype=np.float32)
+                key_parts.append(keys)
+                move_parts.append(moves)
+                score_parts.append(scores)
+
+    book = {}
+    if key_parts:
+        keys = np.concatenate(key_parts)
+        moves = np.concatenate(move_parts)
+        scores = np.concatenate(score_parts)
+        order = np.lexsort((moves, keys))
+        keys, moves, scores = keys[order], moves[order], scores[order]
+        starts = np.flatnonzero(np.r_[True, (keys[1:] != keys[:-1]) | (moves[1:] != moves[:-1])])
+        counts = np.diff(np.r_[starts, len(keys)])
+        means = np.add.reduceat(scores, starts) / counts
+        for i in np.flatnonzero(counts >= min_games):
+            key = int(keys[starts[i]])
+            entry = (int(moves[starts[i]]), int(counts[i]), float(means[i]))
+            best = book.get(key)
+            if best is None or (entry[2], entry[1]) > (best[2], best[1]):
+                book[key] = entry
+    write_opening_book(book_path, board_size or 0, book)
+    return OpeningBook(book_path)
+
+
+# ----------------------------------------------------------------------
+# 离线深度搜索生成
+# ----------------------------------------------------------------------
+def minimax_search_fn(max_depth: int = 2) -> Callable:
+    """返回用 MinimaxBot 为局面选点的搜索函数"""
+    from agents.ai_bots.minimax_bot import MinimaxBot
+    from games.gomoku import GomokuEnv
+
+    def search(game) -> Tuple[int, int]:
+        env = GomokuEnv(game.board_size, game.win_length)
+        env.game = game.clone()
+        bot = MinimaxBot(player_id=game.current_player, max_depth=max_depth)
+        return bot.get_action(None, env)
+
+    return search
+
+
+def _candidate_replies(game, limit: int) -> List[Tuple[int, int]]:
+    """已有棋子周围一格的空位，按到中心的距离排序"""
+    n = game.board_size
+    center = n // 2
+    cells = set()
+    for r, c in zip(*np.nonzero(game.board)):
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                nr, nc = int(r) + dr, int(c) + dc
+                if 0 <= nr < n and 0 <= nc < n and game.board[nr, nc] == 0:
+                    cells.add((nr, nc))
+    if not cells:
+        cells = {(center, center)}
+    return sorted(cells, key=lambda m: (max(abs(m[0] - center), abs(m[1] - center)), m))[:limit]
+
+
+def build_from_search(book_path: str, board_size: int = 15, win_length: int = 5,
+                      max_plies: int = 4, branching: int = 3,
+                      search_fn: Callable = None) -> OpeningBook:
+    """
+    从空棋盘出发离线搜索：每个局面用 search_fn 求出推荐着法入库，
+    然后沿推荐着法以及 branching 个备选应手继续展开，直到 max_plies 手。
+    对称局面只搜索一次。
+
+    Args:
+        search_fn: game -> move，默认使用 minimax_search_fn()
+    """
+    from games.gomoku import GomokuGame
+
+    search_fn = search_fn or minimax_search_fn()
+    game = GomokuGame(board_size, win_length)
+    book = {}
+
+    def expand(ply: int):
+        if ply >= max_plies or game.is_terminal():
+            return
+        key, transform = game.canonical_key()
+        if key in book:
+            return
+        move = tuple(int(v) for v in search_fn(game))
+        canon_move = game.transform_move(move, transform)
+        book[key] = (canon_move[0] * board_size + canon_move[1], 1, 0.0)
+        children = [move] + [m for m in _candidate_replies(game, branching) if m != move]
+        for child in children[:branching + 1]:
+            game.step(child)
+            expand(ply + 1)
+            game.undo()
+
+    expand(0)
+    write_opening_book(book_path, board_size, book)
+    return OpeningBook(book_path)
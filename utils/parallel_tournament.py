@@ -0,0 +1,521 @@
+"""
+多进程锦标赛
+把 (对阵, 局号, 座次) 拆成互相独立的任务分发给进程池。智能体和环境不跨进程传递，
+而是传可序列化的 Spec（"模块:可调用对象" + 参数），由子进程自行构造：环境按进程缓存
+（每局 reset），智能体每局新建，内部缓存（如 MCTS 评估缓存、寻路缓存）不会带到下一局；
+每局按任务键派生随机种子，结果与进程数、完成顺序无关。
+结果按完成顺序流式返回，排行榜按任务键排序后汇总，保证确定性。
+"""
+
+import importlib
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from utils.adaptive_pairing import AdaptiveScheduler
+from utils.game_utils import build_leaderboard, print_leaderboard
+from utils.ratings import ResultTable, print_rating_leaderboard, rating_leaderboard
+from utils.result_log import ResultLog, read_results, result_key
+
+MAX_MOVES = 1000  # 与 evaluate_agents 相同的防死循环上限
+
+
+class Spec:
+    """
+    可序列化的构造描述
+
+    Args:
+        target: "模块:可调用对象"（如 "agents:RandomBot"、"evaluate_ai:create_agent"），
+                也可直接传顶层类 / 函数
+        **kwargs: 构造参数
+    """
+
+    def __init__(self, target, **kwargs):
+        if not isinstance(target, str):
+            target = f"{target.__module__}:{target.__qualname__}"
+        self.target = target
+        self.kwargs = kwargs
+
+    def resolve(self) -> Callable:
+        module, _, attr = self.target.partition(':')
+        obj = importlib.import_module(module)
+        for part in attr.split('.'):
+            obj = getattr(obj, part)
+        return obj
+
+    def build(self, **extra):
+        return self.resolve()(**self.kwargs, **extra)
+
+    def key(self):
+        return self.target, tuple(sorted((k, repr(v)) for k, v in self.kwargs.items()))
+
+    def __repr__(self):
+        return f"Spec({self.target!r}, {self.kwargs!r})"
+
+
+class AgentSpec(Spec):
+    """智能体描述：build(player_id) 时传入 name 与 player_id"""
+
+    def __init__(self, target, name: str, **kwargs):
+        super().__init__(target, **kwargs)
+        self.name = name
+
+    def build(self, player_id: int = 1):
+        return super().build(name=self.name, player_id=player_id)
+
+    def key(self):
+        return (self.name,) + super().key()
+
+
+class MatchJob:
+    """
+    一局对战任务
+
+    seat 为 0 时 agent_a 执先手（玩家 1），为 1 时交换
+    """
+
+    __slots__ = ('pair', 'game', 'seat', 'env_spec', 'agent_a', 'agent_b', 'seed')
+
+    def __init__(self, pair, game, seat, env_spec, agent_a, agent_b, seed=0):
+        self.pair = pair
+        self.game = game
+        self.seat = seat
+        self.env_spec = env_spec
+        self.agent_a = agent_a
+        self.agent_b = agent_b
+        self.seed = seed
+
+    @property
+    def key(self):
+        return self.pair, self.game, self.seat
+
+
+def job_seed(seed: int, pair, game: int) -> int:
+    """由基础种子与任务键派生每局种子（不依赖 hash 随机化）"""
+    for part in pair + (game,):
+        seed = (seed * 1000003 + part) & 0xFFFFFFFF
+    return seed
+
+
+def round_robin_jobs(env_spec: Spec, agent_specs: List[AgentSpec], num_games_per_pair: int,
+                     seed: int = 0) -> Iterator[MatchJob]:
+    """循环赛任务：每对 (i, j) 打 num_games_per_pair 局，与 evaluate_agents 一样按局号交替先后手"""
+    for i in range(len(agent_specs)):
+        for j in range(i + 1, len(agent_specs)):
+            for game in range(num_games_per_pair):
+                yield MatchJob((i, j), game, game % 2, env_spec, agent_specs[i], agent_specs[j],
+                               job_seed(seed, (i, j), game))
+
+
+# ----------------------------------------------------------------------
+# 子进程
+# ----------------------------------------------------------------------
+_cache: Dict[Any, Any] = {}  # 每个进程内复用构造好的环境
+
+
+def _cached(key, factory):
+    obj = _cache.get(key)
+    if obj is None:
+        obj = _cache[key] = factory()
+    return obj
+
+
+def play_job(job: MatchJob) -> Dict[str, Any]:
+    """
+    在当前进程里下完一局
+
+    Returns:
+        dict: pairing（两名字）/ pair / game / seat、players（玩家号 -> 名字）、winner（玩家号）、
+              winner_name、moves、game_time；出错时另含 error
+    """
+    env = _cached(('env',) + job.env_spec.key(), job.env_spec.build)
+    first, second = (job.agent_a, job.agent_b) if job.seat == 0 else (job.agent_b, job.agent_a)
+    # 智能体每局新建：reset() 只清计数，复用会让结果取决于该进程之前下过哪些局
+    players = {1: first.build(1), 2: second.build(2)}
+    random.seed(job.seed)
+    np.random.seed(job.seed)
+    if hasattr(env.game, 'seed'):
+        env.game.seed(job.seed)
+
+    result = {'pairing': (job.agent_a.name, job.agent_b.name), 'pair': job.pair,
+              'game': job.game, 'seat': job.seat, 'players': {1: first.name, 2: second.name}}
+    start = time.time()
+    moves = 0
+    try:
+        if hasattr(env.game, 'physics'):
+            # 乒乓球是实时游戏，走无界面对战器
+            from utils.pingpong_runner import play_match
+            outcome = play_match(players[1], players[2], env=env)
+            moves = outcome['ticks']
+        else:
+            observation, _ = env.reset()
+            while not env.is_terminal() and moves < MAX_MOVES:
+                action = players[env.game.current_player].get_action(observation, env)
+                if action is None:
+                    break
+                observation, _, terminated, truncated, _ = env.step(action)
+                moves += 1
+                if terminated or truncated:
+                    break
+        winner = env.get_winner()
+    except Exception as e:
+        result['error'] = repr(e)
+        winner = None
+    result['winner'] = winner
+    result['winner_name'] = result['players'].get(winner)
+    result['moves'] = moves
+    result['game_time'] = time.time() - start
+    return result
+
+
+# ----------------------------------------------------------------------
+# 调度
+# ----------------------------------------------------------------------
+def run_jobs(jobs: Iterable[MatchJob], workers: Optional[int] = None,
+             max_pending: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    执行任务并按完成顺序逐个产出结果
+
+    jobs 按需拉取（可以是生成器，调度器可根据已返回的结果决定后续任务）；
+    同时在途的任务不超过 max_pending（默认 4 × workers），内存不随任务总数增长。
+    workers 为 1 时在当前进程顺序执行，便于调试。提前关闭生成器会取消尚未开始的任务。
+    """
+    workers = workers or os.cpu_count() or 1
+    jobs = iter(jobs)
+    if workers == 1:
+        for job in jobs:
+            yield play_job(job)
+        return
+
+    max_pending = max_pending or 4 * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < max_pending:
+                    job = next(jobs, None)
+                    if job is None:
+                        exhausted = True
+                    else:
+                        pending.add(pool.submit(play_job, job))
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            # 调用方提前停止（如 SPRT 已得出结论）时取消尚未开始的任务
+            for future in pending:
+                future.cancel()
+
+
+def summarize_pair(name_a: str, name_b: str, a_wins: int, b_wins: int, total: int,
+                   games: List[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """把一对智能体的胜负计数整理成与 evaluate_agents 相同格式的 summary"""
+    match = {
+        'agent1_name': name_a,
+        'agent2_name': name_b,
+        'summary': {
+            'total_games': total,
+            'agent1_wins': a_wins,
+            'agent2_wins': b_wins,
+            'draws': total - a_wins - b_wins,
+            'agent1_win_rate': a_wins / total if total else 0.0,
+            'agent2_win_rate': b_wins / total if total else 0.0,
+            'draw_rate': (total - a_wins - b_wins) / total if total else 0.0,
+        },
+    }
+    if games is not None:
+        match['games'] = games
+    return match
+
+
+def parallel_tournament(env_spec: Spec, agent_specs: List[AgentSpec], num_games_per_pair: int = 10,
+                        workers: Optional[int] = None, seed: int = 0,
+                        on_result: Callable[[Dict[str, Any]], None] = None,
+                        verbose: bool = True, log_path: str = None, resume: bool = False) -> Dict[str, Any]:
+    """
+    多进程循环赛，返回与 tournament() 相同结构的结果（含 Bradley-Terry 等级分 ratings），
+    另含 errors：出错的局数（不计入胜负与等级分）
+
+    Args:
+        env_spec / agent_specs: 环境与智能体的构造描述
+        workers: 进程数（默认 CPU 核数）
+        seed: 基础随机种子
+        on_result: 每局结束（按完成顺序）时回调
+        log_path: 每局结果追加写入该 JSONL 日志；此时不在内存中保留逐局结果，
+                  matches 里只有汇总（内存占用与局数无关）
+        resume: 跳过日志中已有的 (对阵, 局号)，其结果计入排行榜。对阵按名字匹配、与先后顺序无关；
+                智能体顺序不变时结果与一次跑完一致（种子由对阵下标派生，换顺序后新下的局种子不同）
+    """
+    names = [spec.name for spec in agent_specs]
+    if len(set(names)) != len(names):
+        raise ValueError(f"智能体名字必须唯一: {names}")
+    index = {name: i for i, name in enumerate(names)}
+
+    counts: Dict[Any, List[int]] = {}  # 对阵 (i, j)，i < j -> [i 胜, j 胜, 局数]；求和与顺序无关
+    by_pair: Dict[Any, List[Dict[str, Any]]] = {}
+    keep_games = log_path is None
+    errors = 0
+
+    def pair_of(result):
+        """结果在当前智能体顺序下的对阵下标 (i, j)，i < j"""
+        i, j = index[result['pairing'][0]], index[result['pairing'][1]]
+        return (i, j) if i < j else (j, i)
+
+    def tally(result):
+        nonlocal errors
+        if 'error' in result:
+            errors += 1  # 与 ResultTable 一致：出错的局不计入胜负与等级分
+            return
+        pair = pair_of(result)
+        count = counts.setdefault(pair, [0, 0, 0])
+        count[0] += result['winner_name'] == names[pair[0]]
+        count[1] += result['winner_name'] == names[pair[1]]
+        count[2] += 1
+        if keep_games:
+            by_pair.setdefault(pair, []).append(result)
+
+    done_keys = set()
+    if log_path and resume:
+        for result in read_results(log_path):
+            if 'error' in result:
+                continue  # 出错的局（如子进程异常）续跑时重下
+            name_a, name_b = result['pairing']
+            if name_a not in index or name_b not in index or result['game'] >= num_games_per_pair:
+                continue
+            key = (pair_of(result), result['game'])
+            if key not in done_keys:
+                done_keys.add(key)
+                tally(result)
+        if verbose and done_keys:
+            print(f"从 {log_path} 恢复 {len(done_keys)} 局")
+
+    jobs = (job for job in round_robin_jobs(env_spec, agent_specs, num_games_per_pair, seed)
+            if (job.pair, job.game) not in done_keys)
+    total = len(agent_specs) * (len(agent_specs) - 1) // 2 * num_games_per_pair - len(done_keys)
+    log = ResultLog(log_path) if log_path else None
+    start = time.time()
+    try:
+        for done, result in enumerate(run_jobs(jobs, workers), 1):
+            if log is not None:
+                log.write(result)
+            tally(result)
+            if on_result is not None:
+                on_result(result)
+            if verbose and done % max(1, total // 10) == 0:
+                print(f"已完成 {done}/{total} 局 ({done / (time.time() - start):.1f} 局/秒)")
+    finally:
+        if log is not None:
+            log.close()
+
+    # 按任务键排序后汇总：与完成顺序无关
+    matches = []
+    for pair in sorted(counts):
+        games = sorted(by_pair[pair], key=lambda g: (g['game'], g['seat'])) if keep_games else None
+        matches.append(summarize_pair(names[pair[0]], names[pair[1]], *counts[pair], games=games))
+    leaderboard = build_leaderboard(names, matches)
+    ratings = rating_leaderboard(ResultTable.from_matches(names, matches))
+    if verbose:
+        print_leaderboard(leaderboard)
+        print_rating_leaderboard(ratings)
+    if verbose and errors:
+        print(f"{errors} 局出错，未计入排行榜")
+    return {'agents': names, 'matches': matches, 'leaderboard': leaderboard, 'ratings': ratings,
+            'errors': errors}
+
+
+def sprt_match(env_spec: Spec, agent_a: AgentSpec, agent_b: AgentSpec, sprt, max_pairs: int = 10000,
+               workers: Optional[int] = None, seed: int = 0,
+               on_result: Callable[[Dict[str, Any]], None] = None,
+               log_path: str = None, verbose: bool = True, resume: bool = False) -> Dict[str, Any]:
+    """
+    多进程 SPRT 对战：第 2k、2k+1 局为一对（共用种子、交换先后手），
+    一对下完即计入 sprt（utils.sprt.SPRT，检验 agent_a 是否强于 agent_b），得出结论后停止派发；
+    出错的局不计入胜负，所在的对也不计入 sprt
+
+    Args:
+        resume: 先把日志中这两名智能体已完成的局计入 sprt，只重下缺失或出错的局
+
+    Returns:
+        dict: sprt（检验结果）、games（已完成的局数，含续跑恢复的局）、
+              agent_a_wins / agent_b_wins / draws、errors
+    """
+    counts = {agent_a.name: 0, agent_b.name: 0, None: 0}
+    errors = 0
+    first_half: Dict[int, float] = {}
+
+    def add(result) -> bool:
+        """计入一局，返回 sprt 是否已得出结论"""
+        nonlocal errors
+        if 'error' in result:
+            errors += 1
+            score = None
+        else:
+            winner = result['winner_name']
+            counts[winner] += 1
+            score = 1.0 if winner == agent_a.name else 0.0 if winner == agent_b.name else 0.5
+        k = result['game'] // 2
+        if k not in first_half:
+            first_half[k] = score
+            return False
+        other = first_half.pop(k)
+        if score is None or other is None:
+            return False
+        sprt.add_pair(other, score)
+        if verbose and sprt.pairs % 10 == 0:
+            print(f"{sprt.pairs} 对: {sprt}")
+        return sprt.decision() is not None
+
+    done_games = set()
+    if log_path and resume:
+        logged = {}
+        for result in read_results(log_path):
+            if ('error' not in result and tuple(result['pairing']) == (agent_a.name, agent_b.name)
+                    and result['game'] < 2 * max_pairs):
+                logged.setdefault(result['game'], result)
+        for game in sorted(logged):
+            done_games.add(game)
+            add(logged[game])
+        if verbose and done_games:
+            print(f"从 {log_path} 恢复 {len(done_games)} 局: {sprt}")
+
+    def jobs():
+        if sprt.decision() is not None:
+            return
+        for k in range(max_pairs):
+            pair_seed = job_seed(seed, (0, 1), k)
+            for seat in (0, 1):
+                if 2 * k + seat not in done_games:
+                    yield MatchJob((0, 1), 2 * k + seat, seat, env_spec, agent_a, agent_b, pair_seed)
+
+    log = ResultLog(log_path) if log_path else None
+    results = run_jobs(jobs(), workers)
+    try:
+        for result in results:
+            if log is not None:
+                log.write(result)
+            if on_result is not None:
+                on_result(result)
+            if add(result):
+                break
+    finally:
+        results.close()
+        if log is not None:
+            log.close()
+
+    if verbose:
+        print(f"SPRT 结论: {sprt.decision()} ({sprt})")
+    return {'sprt': sprt.summary(), 'games': sum(counts.values()) + errors,
+            'agent_a_wins': counts[agent_a.name], 'agent_b_wins': counts[agent_b.name],
+            'draws': counts[None], 'errors': errors}
+
+
+def adaptive_tournament(env_spec: Spec, agent_specs: List[AgentSpec], target_stderr: float = 30.0,
+                        max_games: Optional[int] = None, batch_size: Optional[int] = None,
+                        workers: Optional[int] = None, seed: int = 0,
+                        on_result: Callable[[Dict[str, Any]], None] = None,
+                        verbose: bool = True, log_path: str = None, resume: bool = False) -> Dict[str, Any]:
+    """
+    自适应配对锦标赛：由 utils.adaptive_pairing.AdaptiveScheduler 按信息量挑选对阵，
+    所有等级分标准误差不超过 target_stderr（Elo）或达到 max_games 局时停止派发。
+    返回与 parallel_tournament 相同结构的结果（matches 只含下过的对阵），另含 games（计入的局数）、
+    errors（出错、未计入的局数）与 stderr
+
+    任务键与种子和循环赛相同（同一对阵的第 k 局），日志可与循环赛共用；
+    但选哪些对阵取决于结果返回的顺序，多进程时不保证可复现（workers=1 时可复现）
+
+    Args:
+        max_games: 最多派发的局数（含续跑恢复的局；None 为不限。出错的局不计入等级分，
+                   智能体持续出错时只能靠它停止）
+        batch_size: 每次拟合后挑选的局数（默认 max(4, workers)）；越小调度越及时，拟合次数越多
+        resume: 日志中已有的结果（仅限 agent_specs 中的名字）先计入，再继续调度
+    """
+    names = [spec.name for spec in agent_specs]
+    if len(set(names)) != len(names):
+        raise ValueError(f"智能体名字必须唯一: {names}")
+    workers = workers or os.cpu_count() or 1
+    batch_size = batch_size or max(4, workers)
+    scheduler = AdaptiveScheduler(names, target_stderr)
+    index = scheduler.table.index
+
+    counts: Dict[Any, List[int]] = {}  # 对阵 (i, j)，i < j -> [i 胜, j 胜, 局数]
+    by_pair: Dict[Any, List[Dict[str, Any]]] = {}
+    keep_games = log_path is None
+    errors = 0
+
+    def tally(result):
+        nonlocal errors
+        scheduler.add_result(result)  # 出错的局只结束在途计数，不计入等级分
+        if 'error' in result:
+            errors += 1
+            return
+        pair = tuple(sorted((index[result['pairing'][0]], index[result['pairing'][1]])))
+        count = counts.setdefault(pair, [0, 0, 0])
+        count[0] += result['winner_name'] == names[pair[0]]
+        count[1] += result['winner_name'] == names[pair[1]]
+        count[2] += 1
+        if keep_games:
+            by_pair.setdefault(pair, []).append(result)
+
+    if log_path and resume:
+        done_keys = set()
+        for result in read_results(log_path):
+            if 'error' in result:
+                continue  # 出错的局由调度器重新挑选
+            name_a, name_b, game = result_key(result)
+            if name_a not in index or name_b not in index:
+                continue
+            key = (frozenset((name_a, name_b)), game)  # 与日志中的先后顺序无关
+            if key not in done_keys:
+                done_keys.add(key)
+                tally(result)
+        if verbose and done_keys:
+            print(f"从 {log_path} 恢复 {len(done_keys)} 局")
+
+    def jobs():
+        dispatched = scheduler.games
+        while not scheduler.converged():
+            count = batch_size if max_games is None else min(batch_size, max_games - dispatched)
+            if count <= 0:
+                return
+            for i, j, game in scheduler.next_pairs(count):
+                dispatched += 1
+                yield MatchJob((i, j), game, game % 2, env_spec, agent_specs[i], agent_specs[j],
+                               job_seed(seed, (i, j), game))
+
+    log = ResultLog(log_path) if log_path else None
+    start = time.time()
+    try:
+        for done, result in enumerate(run_jobs(jobs(), workers, max_pending=batch_size), 1):
+            if log is not None:
+                log.write(result)
+            tally(result)
+            if on_result is not None:
+                on_result(result)
+            if verbose and done % 100 == 0:
+                print(f"已完成 {done} 局 ({done / (time.time() - start):.1f} 局/秒), "
+                      f"最大标准误差 {scheduler.stderr().max():.1f}")
+    finally:
+        if log is not None:
+            log.close()
+
+    matches = []
+    for pair in sorted(counts):
+        games = sorted(by_pair[pair], key=lambda g: (g['game'], g['seat'])) if keep_games else None
+        matches.append(summarize_pair(names[pair[0]], names[pair[1]], *counts[pair], games=games))
+    leaderboard = build_leaderboard(names, matches)
+    ratings = rating_leaderboard(scheduler.table)
+    stderr = scheduler.stderr()
+    if verbose:
+        print(f"\n共 {scheduler.games} 局，{len(matches)}/{len(names) * (len(names) - 1) // 2} 个对阵，"
+              f"最大标准误差 {stderr.max():.1f} Elo（目标 {target_stderr}）")
+        print_leaderboard(leaderboard)
+        print_rating_leaderboard(ratings)
+    return {'agents': names, 'matches': matches, 'leaderboard': leaderboard, 'ratings': ratings,
+            'games': scheduler.games, 'errors': errors, 'stderr': dict(zip(names, stderr.tolist()))}
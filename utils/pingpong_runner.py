@@ -0,0 +1,119 @@
+"""
+无界面乒乓球对战
+不经过 pygame 时钟，按 CPU 能跑的最快速度推进固定步长的物理，完整打到 WIN_SCORE。
+直接调用 PingPongGame.step（BaseEnv.step 每一步都要在 6561 个合法动作里查找，太慢），
+每个 tick 只取两名智能体各自一侧的按键，另一侧的键即使返回了也会被忽略。
+"""
+
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from games.pingpong.pingpong_env import PingPongEnv
+
+SIDE_KEYS = {
+    1: ('move_left_x', 'move_left_y', 'left_force', 'left_spin'),
+    2: ('move_right_x', 'move_right_y', 'right_force', 'right_spin'),
+}
+DEFAULT_MAX_TICKS = 60 * 60 * 10  # 游戏内 10 分钟仍未分出胜负时判为未完成
+
+
+def play_match(left_agent, right_agent, seed: Optional[int] = None,
+               max_ticks: Optional[int] = DEFAULT_MAX_TICKS, env: PingPongEnv = None) -> Dict[str, Any]:
+    """
+    打一场完整比赛
+
+    Args:
+        left_agent / right_agent: 分别控制左（玩家 1）/ 右（玩家 2）挡板
+        seed: 发球随机数种子
+        max_ticks: 超过该 tick 数仍未结束时停止（None 表示不限）
+        env: 可复用的 PingPongEnv，会被重置
+
+    Returns:
+        dict: winner（1 / 2，未完成为 None）、score、ticks、rallies（打完的分数）、
+              hits（击球次数）、elapsed（秒）
+    """
+    if env is None:
+        env = PingPongEnv(seed=seed)
+    else:
+        if seed is not None:
+            env.game.seed(seed)
+        env.reset()
+    game = env.game
+    state = game.physics
+    left_keys, right_keys = SIDE_KEYS[1], SIDE_KEYS[2]
+
+    hits = 0
+    ticks = 0
+    start = time.perf_counter()
+    while not game.is_terminal() and (max_ticks is None or ticks < max_ticks):
+        observation = env._get_observation()
+        left = left_agent.get_action(observation, env) or {}
+        right = right_agent.get_action(observation, env) or {}
+        action = {key: left[key] for key in left_keys if key in left}
+        action.update((key, right[key]) for key in right_keys if key in right)
+        direction = state.ball_vx > 0
+        points = state.score_left + state.score_right
+        game.step(action)
+        ticks += 1
+        if (state.ball_vx > 0) != direction and state.score_left + state.score_right == points:
+            hits += 1
+    elapsed = time.perf_counter() - start
+    return {
+        'winner': game.get_winner(),
+        'score': (state.score_left, state.score_right),
+        'ticks': ticks,
+        'rallies': state.score_left + state.score_right,
+        'hits': hits,
+        'elapsed': elapsed,
+    }
+
+
+def run_matches(left_agent, right_agent, num_matches: int = 10, seed: int = 0,
+                max_ticks: Optional[int] = DEFAULT_MAX_TICKS, verbose: bool = False) -> Dict[str, Any]:
+    """
+    批量对战，第 i 场使用种子 seed + i
+
+    Returns:
+        dict: matches（每场结果）与 summary（胜负、比分分布、每秒回合数等）
+    """
+    env = PingPongEnv(seed=seed)
+    matches: List[Dict[str, Any]] = []
+    for i in range(num_matches):
+        for agent in (left_agent, right_agent):
+            agent.reset()
+        result = play_match(left_agent, right_agent, seed + i, max_ticks, env)
+        matches.append(result)
+        if verbose:
+            print(f"第 {i + 1}/{num_matches} 场: {result['score'][0]}:{result['score'][1]} "
+                  f"({result['ticks']} ticks)")
+    return {'matches': matches, 'summary': summarize(matches)}
+
+
+def summarize(matches: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """汇总多场结果"""
+    elapsed = sum(m['elapsed'] for m in matches)
+    rallies = sum(m['rallies'] for m in matches)
+    ticks = sum(m['ticks'] for m in matches)
+    n = max(1, len(matches))
+    return {
+        'matches': len(matches),
+        'left_wins': sum(1 for m in matches if m['winner'] == 1),
+        'right_wins': sum(1 for m in matches if m['winner'] == 2),
+        'unfinished': sum(1 for m in matches if m['winner'] is None),
+        'score_distribution': dict(Counter(f"{m['score'][0]}:{m['score'][1]}" for m in matches)),
+        'avg_ticks': ticks / n,
+        'avg_hits_per_rally': sum(m['hits'] for m in matches) / max(1, rallies),
+        'rallies_per_second': rallies / elapsed if elapsed else 0.0,
+        'ticks_per_second': ticks / elapsed if elapsed else 0.0,
+        'elapsed': elapsed,
+    }
+
+
+def print_summary(summary: Dict[str, Any], left_name: str = "左", right_name: str = "右"):
+    print(f"{left_name} vs {right_name}: {summary['left_wins']} 胜 / {summary['right_wins']} 负 / "
+          f"{summary['unfinished']} 未完成（共 {summary['matches']} 场）")
+    distribution = sorted(summary['score_distribution'].items(), key=lambda item: -item[1])
+    print("  比分分布: " + ", ".join(f"{score} ×{count}" for score, count in distribution))
+    print(f"  平均 {summary['avg_ticks']:.0f} ticks/场，每分平均击球 {summary['avg_hits_per_rally']:.1f} 次")
+    print(f"  速度: {summary['rallies_per_second']:.1f} 分/秒，{summary['ticks_per_second']:.0f} ticks/秒")
@@ -0,0 +1,232 @@
+"""
+五子棋局面数据库
+以对称规范 Zobrist 键索引对局记录中出现过的每个局面，统计胜负与各着法频率。
+文件布局（小端）：
+    文件头    b'MPDB' + uint16 版本 + uint16 棋盘大小 + uint64 局面数 + uint64 着法数
+    keys      uint64[局面数]，升序，供二分查找
+    stats     每个局面的 (p1_wins, p2_wins, draws, move_start, move_count)
+    moves     每个局面的着法（规范坐标编码）及其次数与胜负
+查询时通过 np.memmap 只读取二分路径上的页面，不把数据库载入内存。
+"""
+
+import os
+import struct
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from games.gomoku import zobrist
+from utils.game_records import GameRecordReader
+
+MAGIC = b'MPDB'
+VERSION = 1
+HEADER = struct.Struct('<4sHHQQ')
+
+STATS_DTYPE = np.dtype([
+    ('p1_wins', '<u4'), ('p2_wins', '<u4'), ('draws', '<u4'),
+    ('move_start', '<u8'), ('move_count', '<u4'),
+])
+MOVES_DTYPE = np.dtype([
+    ('move', '<u2'), ('count', '<u4'), ('p1_wins', '<u4'), ('p2_wins', '<u4'),
+])
+
+
+class PositionDB:
+    """只读的局面数据库（内存映射）"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            magic, version, board_size, n_pos, n_moves = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"不是局面数据库文件: {path}")
+        if version != VERSION:
+            raise ValueError(f"不支持的数据库版本: {version}")
+        self.board_size = board_size
+        self.num_positions = n_pos
+        self.num_moves = n_moves
+
+        offset = HEADER.size
+        self.keys = self._map(np.dtype('<u8'), n_pos, offset)
+        offset += 8 * n_pos
+        self.stats = self._map(STATS_DTYPE, n_pos, offset)
+        offset += STATS_DTYPE.itemsize * n_pos
+        self.moves = self._map(MOVES_DTYPE, n_moves, offset)
+
+    def _map(self, dtype, count, offset):
+        if count == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(self.path, dtype=dtype, mode='r', offset=offset, shape=(count,))
+
+    def __len__(self) -> int:
+        return self.num_positions
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+    def find(self, key: int) -> int:
+        """二分查找规范键，返回索引，不存在时返回 -1"""
+        key = np.uint64(key)
+        i = int(np.searchsorted(self.keys, key))
+        if i < self.num_positions and self.keys[i] == key:
+            return i
+        return -1
+
+    def _canonical(self, position) -> Tuple[int, int]:
+        if hasattr(position, 'canonical_key'):
+            return position.canonical_key()
+        return zobrist.board_canonical_key(position)
+
+    def probe(self, position) -> Optional[Dict[str, Any]]:
+        """
+        查询局面统计
+
+        Args:
+            position: GomokuGame 或棋盘数组
+
+        Returns:
+            dict: games / p1_wins / p2_wins / draws 以及按次数降序的 moves，
+                  moves 中的坐标已映射回 position 的坐标系；未收录时返回 None
+        """
+        key, transform = self._canonical(position)
+        i = self.find(key)
+        if i < 0:
+            return None
+        stat = self.stats[i]
+        start, count = int(stat['move_start']), int(stat['move_count'])
+        moves = []
+        for row in self.moves[start:start + count]:
+            move = zobrist.inverse_transform_move(divmod(int(row['move']), self.board_size),
+                                                  transform, self.board_size)
+            moves.append({
+                'move': move,
+                'count': int(row['count']),
+                'p1_wins': int(row['p1_wins']),
+                'p2_wins': int(row['p2_wins']),
+            })
+        moves.sort(key=lambda m: m['count'], reverse=True)
+        p1, p2, draws = int(stat['p1_wins']), int(stat['p2_wins']), int(stat['draws'])
+        return {
+            'games': p1 + p2 + draws,
+            'p1_wins': p1,
+            'p2_wins': p2,
+            'draws': draws,
+            'moves': moves,
+        }
+
+    def win_rate(self, position, player: int) -> Optional[float]:
+        """局面下 player 的得分率（和棋记半分），未收录时返回 None"""
+        result = self.probe(position)
+        if result is None or result['games'] == 0:
+            return None
+        wins = result['p1_wins'] if player == 1 else result['p2_wins']
+        return (wins + 0.5 * result['draws']) / result['games']
+
+    # ------------------------------------------------------------------
+    # 构建
+    # ------------------------------------------------------------------
+    @staticmethod
+    def build(record_paths: Union[str, Iterable[str]], db_path: str,
+              max_plies: Optional[int] = None) -> 'PositionDB':
+        """
+        从二进制对局记录构建数据库
+
+        Args:
+            record_paths: 一个或多个 GameRecordWriter 写出的文件
+            db_path: 输出路径
+            max_plies: 只收录每局前若干手的局面（None 表示全部）
+        """
+        if isinstance(record_paths, str):
+            record_paths = [record_paths]
+
+        board_size = None
+        key_parts: List[np.ndarray] = []
+        move_parts: List[np.ndarray] = []
+        winner_parts: List[np.ndarray] = []
+        for path in record_paths:
+            with GameRecordReader(path) as reader:
+                for record in reader:
+                    if record.game_type != 'gomoku' or len(record) == 0:
+                        continue
+                    if board_size is None:
+                        board_size = record.board_size
+                    elif record.board_size != board_size:
+                        raise ValueError("所有对局的棋盘大小必须一致")
+                    keys, moves = replay_canonical(record, max_plies)
+                    key_parts.append(keys)
+                    move_parts.append(moves)
+                    winner_parts.append(np.full(len(keys), record.winner or 0, dtype=np.uint8))
+
+        if key_parts:
+            keys = np.concatenate(key_parts)
+            moves = np.concatenate(move_parts)
+            winners = np.concatenate(winner_parts)
+        else:
+            keys = np.zeros(0, dtype=np.uint64)
+            moves = np.zeros(0, dtype=np.uint16)
+            winners = np.zeros(0, dtype=np.uint8)
+        _write_db(db_path, board_size or 0, keys, moves, winners)
+        return PositionDB(db_path)
+
+
+def replay_canonical(record, max_plies: Optional[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    向量化重放一局：返回每个落子前局面的规范键，以及该着法在规范坐标系下的编码
+    """
+    n = record.board_size
+    table, perms, _ = zobrist.get_tables(n)
+    codes = np.asarray(record.move_codes, dtype=np.int64)
+    players = np.asarray(record.move_players, dtype=np.int64)
+    if max_plies is not None:
+        codes, players = codes[:max_plies], players[:max_plies]
+    # (8, plies)：第 i 列为第 i 手落子前 8 个对称变体的键
+    contrib = table[perms[:, codes], players]
+    after = np.bitwise_xor.accumulate(contrib, axis=1)
+    before = np.zeros_like(after)
+    before[:, 1:] = after[:, :-1]
+    keys = before.min(axis=0)
+    # 自对称局面（如空棋盘）有多个变换取到最小键，着法取其中编码最小的像，
+    # 使对称的着法合并为同一条统计
+    candidates = np.where(before == keys, perms[:, codes], np.iinfo(np.int64).max)
+    moves = candidates.min(axis=0).astype(np.uint16)
+    return keys, moves
+
+
+def _write_db(path: str, board_size: int, keys: np.ndarray, moves: np.ndarray,
+              winners: np.ndarray):
+    """聚合 (局面, 着法, 胜者) 三元组并写出数据库文件"""
+    order = np.lexsort((moves, keys))
+    keys, moves, winners = keys[order], moves[order], winners[order]
+
+    # 每个 (局面, 着法) 一行
+    if len(keys):
+        pair_start = np.flatnonzero(np.r_[True, (keys[1:] != keys[:-1]) | (moves[1:] != moves[:-1])])
+    else:
+        pair_start = np.zeros(0, dtype=np.int64)
+    pair_id = np.repeat(np.arange(len(pair_start)), np.diff(np.r_[pair_start, len(keys)]))
+    move_rows = np.zeros(len(pair_start), dtype=MOVES_DTYPE)
+    move_rows['move'] = moves[pair_start]
+    move_rows['count'] = np.bincount(pair_id, minlength=len(pair_start))
+    move_rows['p1_wins'] = np.bincount(pair_id, weights=winners == 1, minlength=len(pair_start))
+    move_rows['p2_wins'] = np.bincount(pair_id, weights=winners == 2, minlength=len(pair_start))
+
+    # 每个局面一行
+    pair_keys = keys[pair_start]
+    unique_keys, pos_start, pos_counts = np.unique(pair_keys, return_index=True, return_counts=True)
+    stats = np.zeros(len(unique_keys), dtype=STATS_DTYPE)
+    stats['move_start'] = pos_start
+    stats['move_count'] = pos_counts
+    pos_id = np.repeat(np.arange(len(unique_keys)), pos_counts)
+    stats['p1_wins'] = np.bincount(pos_id, weights=move_rows['p1_wins'], minlength=len(unique_keys))
+    stats['p2_wins'] = np.bincount(pos_id, weights=move_rows['p2_wins'], minlength=len(unique_keys))
+    games = np.bincount(pos_id, weights=move_rows['count'], minlength=len(unique_keys))
+    stats['draws'] = games - stats['p1_wins'] - stats['p2_wins']
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, board_size, len(unique_keys), len(move_rows)))
+        f.write(unique_keys.astype('<u8').tobytes())
+        f.write(stats.tobytes())
+        f.write(move_rows.tobytes())
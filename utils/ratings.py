@@ -0,0 +1,265 @@
+"""
+等级分
+对局结果先汇总成两两计数表（ResultTable），之后的计算只依赖 N×N 矩阵，与总局数无关：
+百万局日志只需增量读取一次，之后每次刷新排行榜都是毫秒级。
+
+- bradley_terry：Bradley-Terry 模型的极大似然估计，和棋按各半胜计；
+  置信区间来自 Fisher 信息矩阵的逆（相对全体平均值）。bradley_terry_fit 另给出完整协方差矩阵，
+  供 utils.adaptive_pairing 挑选信息量最大的对阵。
+- EloRating：按对局顺序逐局更新的经典 Elo，适合实时显示。
+
+用法：python -m utils.ratings results.jsonl
+"""
+
+import json
+import math
+import os
+from statistics import NormalDist
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+ELO_BASE = 1500.0
+ELO_PER_NAT = 400.0 / math.log(10)  # 自然对数强度差 -> Elo 差
+
+
+def record_score(record: Dict[str, Any]) -> float:
+    """结果日志中一局对 pairing[0] 的得分（胜 1、和 0.5、负 0）"""
+    name_a, name_b = record['pairing']
+    winner = record.get('winner_name')
+    if winner == name_a:
+        return 1.0
+    if winner == name_b:
+        return 0.0
+    return 0.5
+
+
+class ResultTable:
+    """两两对局计数：scores[i, j] 为 i 对 j 的累计得分，games[i, j] 为对局数"""
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.names: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.scores = np.zeros((0, 0))
+        self.games = np.zeros((0, 0))
+        self._log_offsets: Dict[str, int] = {}
+        for name in names:
+            self.agent_id(name)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def agent_id(self, name: str) -> int:
+        i = self.index.get(name)
+        if i is None:
+            i = self.index[name] = len(self.names)
+            self.names.append(name)
+            self.scores = np.pad(self.scores, ((0, 1), (0, 1)))
+            self.games = np.pad(self.games, ((0, 1), (0, 1)))
+        return i
+
+    def add(self, name_a: str, name_b: str, score: float, count: float = 1.0):
+        """记录 count 局，score 为 name_a 的总得分"""
+        i, j = self.agent_id(name_a), self.agent_id(name_b)
+        self.scores[i, j] += score
+        self.scores[j, i] += count - score
+        self.games[i, j] += count
+        self.games[j, i] += count
+
+    def add_record(self, record: Dict[str, Any]):
+        if 'error' in record:
+            return
+        name_a, name_b = record['pairing']
+        self.add(name_a, name_b, record_score(record))
+
+    def add_match(self, match: Dict[str, Any]):
+        """加入 evaluate_agents / tournament 格式的对阵汇总"""
+        summary = match['summary']
+        self.add(match['agent1_name'], match['agent2_name'],
+                 summary['agent1_wins'] + 0.5 * summary['draws'], summary['total_games'])
+
+    def update_from_log(self, path: str) -> int:
+        """从结果日志上次读到的位置继续读入新记录，返回新增局数"""
+        offset = self._log_offsets.get(path, 0)
+        if not os.path.exists(path) or os.path.getsize(path) < offset:
+            offset = 0  # 文件被替换或截断，重新读取
+        rows, cols, scores = [], [], []
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # 正在写入的半行，下次再读
+                offset += len(line)
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if 'error' in record:
+                    continue
+                name_a, name_b = record['pairing']
+                rows.append(self.agent_id(name_a))
+                cols.append(self.agent_id(name_b))
+                scores.append(record_score(record))
+        self._log_offsets[path] = offset
+        if rows:
+            # 批量累加，避免逐局更新 numpy 元素
+            rows, cols, scores = np.array(rows), np.array(cols), np.array(scores)
+            np.add.at(self.scores, (rows, cols), scores)
+            np.add.at(self.scores, (cols, rows), 1.0 - scores)
+            np.add.at(self.games, (rows, cols), 1.0)
+            np.add.at(self.games, (cols, rows), 1.0)
+        return len(rows)
+
+    @classmethod
+    def from_log(cls, path: str) -> 'ResultTable':
+        table = cls()
+        table.update_from_log(path)
+        return table
+
+    @classmethod
+    def from_matches(cls, names: Iterable[str], matches: Iterable[Dict[str, Any]]) -> 'ResultTable':
+        table = cls(names)
+        for match in matches:
+            table.add_match(match)
+        return table
+
+
+def bradley_terry(table: ResultTable, prior: float = 1.0, max_iter: int = 100,
+                  tol: float = 1e-9) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Bradley-Terry 极大似然等级分（对数强度上的牛顿迭代，N 个智能体每步 O(N^3)，通常十步以内收敛）
+
+    Args:
+        prior: 每名智能体与固定强度的虚拟对手的虚拟和棋局数，保证全胜 / 全负时估计有限
+               （0 表示不加先验，此时每个连通分量都必须有胜有负）
+
+    Returns:
+        (Elo 等级分, 标准误差)，按 table.names 顺序；等级分以平均值 1500 为基准，
+        标准误差也是相对于全体平均值的
+    """
+    theta, covariance = bradley_terry_fit(table, prior, max_iter, tol)
+    stderr = np.sqrt(np.maximum(np.diag(covariance), 0.0)) * ELO_PER_NAT
+    return ELO_BASE + theta * ELO_PER_NAT, stderr
+
+
+def bradley_terry_fit(table: ResultTable, prior: float = 1.0, max_iter: int = 100,
+                      tol: float = 1e-9) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    bradley_terry 的原始结果：(对数强度, 协方差矩阵)，自然对数单位，均相对全体平均值
+    （平均强度为 0）
+    """
+    n = len(table)
+    if n == 0:
+        return np.zeros(0), np.zeros((0, 0))
+    games = table.games
+    wins = table.scores.sum(axis=1) + prior / 2
+    theta = np.zeros(n)
+    for _ in range(max_iter):
+        info, expected = _fisher_information(theta, games, prior)
+        gradient = wins - expected
+        step = np.linalg.lstsq(info, gradient, rcond=None)[0]
+        step = np.clip(step, -2.0, 2.0)  # 远离最优点时限制步长
+        theta += step
+        if np.max(np.abs(step)) < tol:
+            break
+
+    info, _ = _fisher_information(theta, games, prior)
+    covariance = np.linalg.pinv(info)
+    # 换算到相对全体平均值：C' = P C P，P = I - 11^T / n
+    center = np.eye(n) - 1.0 / n
+    return theta - theta.mean(), center @ covariance @ center
+
+
+def _fisher_information(theta: np.ndarray, games: np.ndarray, prior: float):
+    """对数强度 theta 处的 Fisher 信息矩阵与每名智能体的期望得分"""
+    q = 1.0 / (1.0 + np.exp(theta[None, :] - theta[:, None]))  # q[i, j] = P(i 胜 j)
+    weight = games * q * (1 - q)
+    virtual = 1.0 / (1.0 + np.exp(-theta))
+    info = -weight
+    info[np.diag_indices_from(info)] = weight.sum(axis=1) - np.diag(weight) + prior * virtual * (1 - virtual)
+    expected = (games * q).sum(axis=1) + prior * virtual
+    return info, expected
+
+
+def rating_leaderboard(table: ResultTable, confidence: float = 0.95,
+                       prior: float = 1.0) -> List[Tuple[str, Dict[str, float]]]:
+    """
+    按 Bradley-Terry 等级分排序的排行榜
+
+    Returns:
+        list: [(名字, {'rating', 'low', 'high', 'stderr', 'games', 'score'}), ...]
+    """
+    ratings, stderr = bradley_terry(table, prior)
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    games = table.games.sum(axis=1)
+    scores = table.scores.sum(axis=1)
+    board = []
+    for i, name in enumerate(table.names):
+        board.append((name, {
+            'rating': float(ratings[i]),
+            'low': float(ratings[i] - z * stderr[i]),
+            'high': float(ratings[i] + z * stderr[i]),
+            'stderr': float(stderr[i]),
+            'games': int(games[i]),
+            'score': float(scores[i] / games[i]) if games[i] else 0.0,
+        }))
+    board.sort(key=lambda item: item[1]['rating'], reverse=True)
+    return board
+
+
+def print_rating_leaderboard(board: List[Tuple[str, Dict[str, float]]], confidence: float = 0.95):
+    print(f"\n=== 等级分排行榜（Bradley-Terry，{confidence:.0%} 置信区间）===")
+    for rank, (name, stats) in enumerate(board, 1):
+        print(f"{rank}. {name}: {stats['rating']:.0f} "
+              f"[{stats['low']:.0f}, {stats['high']:.0f}] "
+              f"得分率 {stats['score']:.2%} ({stats['games']}局)")
+
+
+class EloRating:
+    """逐局更新的 Elo 等级分（结果与对局顺序有关）"""
+
+    def __init__(self, k: float = 16.0, base: float = ELO_BASE):
+        self.k = k
+        self.base = base
+        self.ratings: Dict[str, float] = {}
+        self.games: Dict[str, int] = {}
+
+    def rating(self, name: str) -> float:
+        return self.ratings.get(name, self.base)
+
+    def expected(self, name_a: str, name_b: str) -> float:
+        """name_a 对 name_b 的期望得分"""
+        return 1.0 / (1.0 + 10 ** ((self.rating(name_b) - self.rating(name_a)) / 400.0))
+
+    def update(self, name_a: str, name_b: str, score: float):
+        """score 为 name_a 本局得分（1 / 0.5 / 0）"""
+        change = self.k * (score - self.expected(name_a, name_b))
+        self.ratings[name_a] = self.rating(name_a) + change
+        self.ratings[name_b] = self.rating(name_b) - change
+        for name in (name_a, name_b):
+            self.games[name] = self.games.get(name, 0) + 1
+
+    def update_record(self, record: Dict[str, Any]):
+        if 'error' not in record:
+            self.update(record['pairing'][0], record['pairing'][1], record_score(record))
+
+    def leaderboard(self) -> List[Tuple[str, float]]:
+        return sorted(self.ratings.items(), key=lambda item: item[1], reverse=True)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="由结果日志计算等级分")
+    parser.add_argument('log', help='JSONL 结果日志')
+    parser.add_argument('--confidence', type=float, default=0.95, help='置信水平')
+    args = parser.parse_args()
+
+    start = time.time()
+    result_table = ResultTable()
+    total = result_table.update_from_log(args.log)
+    loaded = time.time()
+    leaderboard = rating_leaderboard(result_table, args.confidence)
+    print_rating_leaderboard(leaderboard, args.confidence)
+    print(f"\n{total} 局，读取 {loaded - start:.2f}s，计算 {(time.time() - loaded) * 1000:.1f}ms")
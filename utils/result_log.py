@@ -0,0 +1,117 @@
+"""
+流式对局结果日志（JSONL）
+每局结束追加一行结果（不含走子，走子用 game_records 的二进制记录保存），按局数 / 时间间隔
+定期 flush，进程崩溃最多丢失最近一批未 flush 的结果。重新打开时会截掉写到一半的最后一行，
+续跑时按 result_key 跳过日志里已有的 (对阵, 局号)。
+
+单行结构：
+    {"pairing": [名字A, 名字B], "game": 局号, "seat": 0/1, "players": {"1": 先手名, "2": 后手名},
+     "winner": 1/2/null, "winner_name": 名字或 null, "moves": 步数, "game_time": 秒, ...}
+"""
+
+import json
+import os
+import time
+from typing import Any, Dict, Iterator, Tuple
+
+
+def _json_default(value):
+    """numpy 标量（如五子棋的胜者）转为 Python 内置类型"""
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"无法序列化的类型: {type(value).__name__}")
+
+
+def result_key(record: Dict[str, Any]) -> Tuple[str, str, int]:
+    """结果的任务键 (名字A, 名字B, 局号)"""
+    name_a, name_b = record['pairing']
+    return name_a, name_b, record['game']
+
+
+class ResultLog:
+    """追加写入的 JSONL 结果日志"""
+
+    def __init__(self, path: str, flush_every: int = 50, flush_interval: float = 5.0,
+                 fsync: bool = False):
+        """
+        Args:
+            flush_every: 每写入多少条 flush 一次
+            flush_interval: 距上次 flush 超过多少秒时 flush
+            fsync: flush 时是否同时 fsync（断电安全，较慢）
+        """
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _truncate_partial_line(path)
+        self._file = open(path, 'a', encoding='utf-8')
+        self._unflushed = 0
+        self._last_flush = time.time()
+        self.written = 0
+
+    def write(self, record: Dict[str, Any]):
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=_json_default) + '\n')
+        self.written += 1
+        self._unflushed += 1
+        if self._unflushed >= self.flush_every or time.time() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._unflushed = 0
+        self._last_flush = time.time()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _truncate_partial_line(path: str):
+    """去掉文件末尾没有换行的残缺记录（写入中断），避免续写时与新记录粘在一起"""
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb+') as f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b'\n':
+            return
+        # 从末尾向前找最后一个换行
+        pos = size
+        while pos > 0:
+            step = min(4096, pos)
+            pos -= step
+            f.seek(pos)
+            index = f.read(step).rfind(b'\n')
+            if index >= 0:
+                f.truncate(pos + index + 1)
+                return
+        f.truncate(0)
+
+
+def read_results(path: str) -> Iterator[Dict[str, Any]]:
+    """逐行读取结果；跳过末尾残缺或无法解析的行"""
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.endswith('\n'):
+                break
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
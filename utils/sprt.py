@@ -0,0 +1,105 @@
+"""
+序贯概率比检验（SPRT）
+两名智能体交换先后手各下一局为一对，按一对的总得分（0, 0.5, 1, 1.5, 2）计入五项分布
+（pentanomial）。同一对的两局使用相同开局 / 随机种子时，先后手与开局的影响在对内抵消，
+方差比逐局统计小，判定所需局数更少。
+
+对数似然比用广义 SPRT 的正态近似：
+    LLR = N (s1 - s0) (2 x̄ - s0 - s1) / (2 σ²)
+x̄、σ² 为每对平均得分的样本均值与方差，s0 / s1 为 elo0 / elo1 对应的期望得分（logistic Elo）。
+LLR 越过 ln((1-β)/α) 接受 H1（强 elo1 以上），低于 ln(β/(1-α)) 接受 H0（不超过 elo0）。
+统计时另加一个虚拟对（按两局独立、各 50% 胜率的二项分布摊到五项上）作为先验：
+对数少时方差不会被低估，所有对结果相同（方差为 0）时也能判定。
+"""
+
+import math
+from typing import Any, Dict, Optional, Tuple
+
+PAIR_SCORES = (0.0, 0.25, 0.5, 0.75, 1.0)  # 五项分布每一项对应的每局平均得分
+PRIOR = (1 / 16, 4 / 16, 6 / 16, 4 / 16, 1 / 16)  # 一个虚拟对
+
+
+def elo_to_score(elo: float) -> float:
+    return 1.0 / (1.0 + 10 ** (-elo / 400.0))
+
+
+def score_to_elo(score: float) -> float:
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400.0 * math.log10(1.0 / score - 1.0)
+
+
+class SPRT:
+    """基于对局对的 SPRT"""
+
+    def __init__(self, elo0: float = 0.0, elo1: float = 5.0, alpha: float = 0.05, beta: float = 0.05):
+        """
+        Args:
+            elo0 / elo1: H0 / H1 下的 Elo 差（被测方相对对手）
+            alpha: H0 为真时错误接受 H1 的概率
+            beta: H1 为真时错误接受 H0 的概率
+        """
+        if elo1 <= elo0:
+            raise ValueError("elo1 必须大于 elo0")
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.alpha = alpha
+        self.beta = beta
+        self.lower = math.log(beta / (1 - alpha))
+        self.upper = math.log((1 - beta) / alpha)
+        self.pentanomial = [0] * 5
+
+    @property
+    def pairs(self) -> int:
+        return sum(self.pentanomial)
+
+    def add_pair(self, score1: float, score2: float):
+        """加入一对对局，score 为被测方每局得分（胜 1、和 0.5、负 0）"""
+        self.pentanomial[int(round((score1 + score2) * 2))] += 1
+
+    def mean_variance(self) -> Tuple[float, float]:
+        """每对平均得分的均值与方差"""
+        if self.pairs == 0:
+            return 0.5, 0.0
+        counts = [c + p for c, p in zip(self.pentanomial, PRIOR)]
+        n = sum(counts)
+        mean = sum(c * x for c, x in zip(counts, PAIR_SCORES)) / n
+        variance = sum(c * (x - mean) ** 2 for c, x in zip(counts, PAIR_SCORES)) / n
+        return mean, variance
+
+    def llr(self) -> float:
+        mean, variance = self.mean_variance()
+        if self.pairs == 0:
+            return 0.0
+        s0, s1 = elo_to_score(self.elo0), elo_to_score(self.elo1)
+        return self.pairs * (s1 - s0) * (2 * mean - s0 - s1) / (2 * variance)
+
+    def decision(self) -> Optional[str]:
+        """'H1'（接受被测方更强）、'H0'（拒绝）或 None（继续）"""
+        llr = self.llr()
+        if llr >= self.upper:
+            return 'H1'
+        if llr <= self.lower:
+            return 'H0'
+        return None
+
+    def elo(self, confidence_z: float = 1.96) -> Tuple[float, float, float]:
+        """Elo 差估计与置信区间 (估计, 下界, 上界)"""
+        mean, variance = self.mean_variance()
+        margin = confidence_z * math.sqrt(variance / self.pairs) if self.pairs else 0.5
+        return score_to_elo(mean), score_to_elo(mean - margin), score_to_elo(mean + margin)
+
+    def summary(self) -> Dict[str, Any]:
+        elo, low, high = self.elo()
+        return {
+            'elo0': self.elo0, 'elo1': self.elo1, 'alpha': self.alpha, 'beta': self.beta,
+            'llr': self.llr(), 'lower': self.lower, 'upper': self.upper,
+            'decision': self.decision(), 'pairs': self.pairs,
+            'pentanomial': list(self.pentanomial),
+            'elo': elo, 'elo_low': low, 'elo_high': high,
+        }
+
+    def __str__(self):
+        elo, low, high = self.elo()
+        return (f"LLR {self.llr():.2f} [{self.lower:.2f}, {self.upper:.2f}] "
+                f"Elo {elo:+.1f} [{low:+.1f}, {high:+.1f}] "
+                f"{self.pairs} 对 五项分布 {self.pentanomial}")